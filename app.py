@@ -2,7 +2,6 @@ import os
 import platform
 import shutil
 import streamlit as st  # pyright: ignore[reportMissingImports]
-import logging
 import pandas as pd
 from src.utils.history import HistoryManager
 from src.ui.dashboard import render_dashboard
@@ -13,9 +12,16 @@ if platform.system() == "Windows":
 
 from src.ui.recorder import record_audio
 from src.backend.audio_processor import AudioProcessor
-from src.backend.hardware import HardwareInfo
-from src.backend.monitor import ResourceMonitor
-from src.utils.diagnostics import log_system_info, get_logger
+from src.backend.jobs import get_job_manager
+from src.backend.hardware import get_hardware_info
+from src.backend.monitor import ResourceMonitor, get_system_sampler, start_metrics_endpoint
+from src.utils.diagnostics import log_system_info, get_logger, purge_logs
+from src.utils.tracing import purge_traces
+from src.utils.result_cache import ResultCache
+from src.backend.llm_client import STAREvaluator
+from src.backend.question_bank import CUSTOM_QUESTION, get_question_bank, round_profile
+from src.backend.tts import TTSService, audio_format, get_tts_service
+from src.backend.ingest import AUDIO_DIR, KEEP_AUDIO, AudioBlob, AudioStore
 
 # Initialize Logging
 log_system_info()
@@ -43,6 +49,12 @@ def register_nvidia_dlls():
 register_nvidia_dlls()
 
 # --- HELPER: PRIVACY CLEANUP ---
+def count_files(directory):
+    """Number of files directly inside directory (subdirectories aren't counted)."""
+    if not os.path.exists(directory):
+        return 0
+    return sum(1 for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f)))
+
 def cleanup_data():
     """Deletes all temporary files (Privacy Feature) - Windows Safe Version"""
     deleted_files = 0
@@ -50,31 +62,26 @@ def cleanup_data():
     # 1. Clean Audio Files
     if os.path.exists("temp_data"):
         for f in os.listdir("temp_data"):
+            path = os.path.join("temp_data", f)
+            if not os.path.isfile(path):
+                continue  # Store subdirectories are emptied by their own purge below
             try:
-                os.remove(os.path.join("temp_data", f))
+                os.remove(path)
                 deleted_files += 1
             except Exception:
                 pass # Skip if file is actively being recorded
 
-    # 2. Clean Log Files (Critical Fix for WinError 32)
-    if os.path.exists("logs"):
-        # Step A: Get the logger and find the file handler
-        logger = logging.getLogger()
-        
-        # Step B: Close and remove all handlers to release the Windows file lock
-        handlers = logger.handlers[:]
-        for handler in handlers:
-            handler.close()
-            logger.removeHandler(handler)
-        
-        # Step C: Now it is safe to delete
-        for f in os.listdir("logs"):
-            try:
-                os.remove(os.path.join("logs", f))
-                deleted_files += 1
-            except Exception as e:
-                st.error(f"Could not delete {f}: {e}")
-            
+        # Cached analyses and coach evaluations contain transcripts too
+        deleted_files += ResultCache.purge()
+        deleted_files += STAREvaluator.purge_cache()
+        deleted_files += get_question_bank().purge()
+        deleted_files += TTSService.purge_cache()
+        deleted_files += AudioStore.purge()
+        deleted_files += purge_traces()
+
+    # 2. Clean Log Files: the log writer pauses and closes its files (no WinError 32), then resumes
+    deleted_files += purge_logs()
+
     return deleted_files
 
 # --- MAIN APP ---
@@ -92,10 +99,76 @@ def live_hardware_monitor(monitor, hw, selected_tier):
         st.progress(stats['cpu_percent'] / 100, text=f"CPU: {stats['cpu_percent']}%")
         st.progress(stats['ram_percent'] / 100, text=f"RAM: {stats['ram_used_gb']}/{stats['ram_total_gb']} GB")
 
+    # Last two minutes from the shared sampler's ring buffer (no extra sampling per session)
+    st.line_chart(get_system_sampler().history(("cpu_percent", "ram_percent"), seconds=120), height=80)
+    st.caption(f"App process: {stats['process_rss_mb']:.0f} MB RSS, {stats['process_threads']} threads")
+
+    queue = get_job_manager().stats()
+    if queue['queue_depth'] or queue['waiting'] or queue['running']:
+        st.caption(f"Analyses: {queue['running']} running, {queue['waiting']} waiting for memory, "
+                   f"{queue['queue_depth']} queued (avg wait {queue['avg_wait_s']}s)")
+
+# --- ANALYSIS JOB FRAGMENT (polls the background job like the hardware monitor) ---
+@st.fragment(run_every=1)
+def analysis_job_monitor():
+    manager = get_job_manager()
+    job_id = st.session_state.get('job_id')
+    job = manager.get(job_id) if job_id else None
+    if job is None:
+        st.session_state.pop('job_id', None)
+        return
+
+    if not job.finished:
+        if job.state == "queued":
+            st.progress(0.0, text=f"⏳ Waiting for a free {job.tier.split()[0]} worker ({job.wait_time:.0f}s)...")
+        elif job.state == "waiting":
+            st.progress(0.0, text=f"⏳ Waiting for free memory ({job.wait_time:.0f}s)...")
+        else:
+            st.progress(job.progress, text=f"🔍 {job.stage}")
+        if st.button("✖ Cancel Analysis", use_container_width=True):
+            manager.cancel(job_id)
+        return
+
+    # Job finished: hand the result to the main script and rerun the whole app once
+    context = st.session_state.pop('job_context', {})
+    del st.session_state['job_id']
+    context['tier'] = job.tier  # Admission control may have moved the job to a cheaper tier
+    if job.notice:
+        st.toast(job.notice, icon="🛡️")
+
+    if job.state == "cancelled":
+        st.toast("Analysis cancelled.", icon="✖️")
+    elif job.error:
+        st.session_state['job_error'] = job.error
+    elif context.get('kind') == "round":
+        # One history row per answer; failed answers stay visible in the round selector
+        for answer in job.result:
+            if answer['metrics']:
+                save_to_history(answer['metrics'], context)
+        st.session_state['round_results'] = (job.result, context.get('persona'))
+        st.session_state.pop('results', None)
+        st.session_state['round_answers'] = {}
+    else:
+        transcript, metrics, duration = job.result
+        save_to_history(metrics, context)
+        # Send full context to dashboard
+        st.session_state['results'] = (transcript, metrics, duration, context.get('full_context'), context.get('persona'))
+        st.session_state.pop('round_results', None)
+    st.rerun()
+
+def save_to_history(metrics, context):
+    HistoryManager.save_session(
+        metrics['wpm'], metrics['filler_count'], metrics['tone_label'], context.get('mode'),
+        pauses=metrics['pause_count'], blunders=metrics['blunder_count'],
+        pitch_avg=metrics['pitch_avg'], pitch_var=metrics['pitch_var'],
+        energy_avg=metrics['energy_avg'], duration=metrics['duration'], tier=context.get('tier')
+    )
+
 def main():
     try:
-        hw = HardwareInfo()
+        hw = get_hardware_info()  # Probed once per process, not on every rerun
         monitor = ResourceMonitor()
+        start_metrics_endpoint()  # Local /metrics for scraping; started once per process
         
         st.title("🎙️ AI Interview Coach")
         
@@ -117,7 +190,7 @@ def main():
         st.sidebar.divider()
         st.sidebar.header("🔒 Privacy & Data")
         
-        audio_files = len(os.listdir("temp_data")) if os.path.exists("temp_data") else 0
+        audio_files = count_files("temp_data") + count_files(AUDIO_DIR)
         log_files = len(os.listdir("logs")) if os.path.exists("logs") else 0
         
         st.sidebar.caption(f"Stored Data: {audio_files} recordings, {log_files} logs.")
@@ -150,15 +223,16 @@ def main():
                 job_title = col_role.text_input("Job Title", placeholder="e.g., Backend Developer")
                 seniority = col_sen.selectbox("Seniority Level", ["Entry-Level", "Mid-Level", "Senior / Lead", "Executive"])
                 
+                # Warm the question bank for every round while the user is still on step 1
+                bank = get_question_bank()
+                role = (industry, job_title, seniority)
+                if industry and job_title and st.session_state.get('prefetched_role') != role:
+                    bank.prefetch(*role)
+                    st.session_state['prefetched_role'] = role
+
                 if st.button("Generate Interview Rounds", disabled=not (industry and job_title)):
                     with st.spinner("🧠 AI is structuring the interview process..."):
-                        st.session_state['rounds'] = [
-                            "Recruiter/Phone Screening (15–30 min)",
-                            "First-Round/Hiring Manager (30–60 min)",
-                            "Technical/In-depth Interview (60–90 min)",
-                            "Panel/Group Interviews (60–90+ min)",
-                            "Final Interview (30–60+ min)"
-                        ]
+                        st.session_state['rounds'] = bank.get_rounds(industry, job_title, seniority)
                         st.session_state['setup_step'] = 2
                         st.rerun()
 
@@ -169,39 +243,13 @@ def main():
                     
                     if st.button("Generate Custom Questions", type="primary"):
                         with st.spinner(f"🧠 AI is writing questions for the {selected_round.split('(')[0]}..."):
-                            
-                            round_type = selected_round.split(" ")[0]
-                            
-                            # --- NEW: AUTOMATED MAPPING LOGIC ---
-                            if "Recruiter" in round_type or "First-Round" in round_type:
-                                meaning = "A standard, efficient first-round interview. Focus on high-level experience and culture fit."
-                                rec_mode = "Standard Interview"
-                                rec_persona = "🤝 Friendly HR Recruiter (Focuses on soft skills & culture fit)"
-                            elif "Technical" in round_type:
-                                meaning = "Common for technical assessments. Expect in-depth scrutiny and follow-ups."
-                                rec_mode = "Technical / Complex"
-                                rec_persona = "💼 Strict Technical Lead (Focuses purely on accuracy & efficiency)"
-                            elif "Panel" in round_type:
-                                meaning = "Panel interviews involve multiple stakeholders. High pressure, varied question types."
-                                rec_mode = "Technical / Complex"
-                                rec_persona = "🔥 Stress Interviewer (Highly critical, looks for flaws & hesitations)"
-                            else: # Final Interview
-                                meaning = "Final interviews evaluate ultimate culture fit, long-term alignment, and leadership."
-                                rec_persona = "🔥 Stress Interviewer (Highly critical, looks for flaws & hesitations)"
-                                rec_mode = "Presentation" if seniority == "Executive" else "Standard Interview"
-
-                            st.session_state['round_info'] = {
-                                "meaning": meaning, 
-                                "recommended_mode": rec_mode,
-                                "recommended_persona": rec_persona
-                            }
-                            
-                            # Mock custom questions
-                            st.session_state['custom_questions'] = [
-                                f"Tell me about your experience as a {seniority} {job_title}.",
-                                f"What is your approach to handling {industry} challenges in a {round_type.lower()} setting?",
-                                "-- Custom Question --"
-                            ]
+                            # Stage context, recommended mode and persona for this round
+                            st.session_state['round_info'] = round_profile(selected_round, seniority)
+                            st.session_state['custom_questions'] = (
+                                bank.get_questions(industry, job_title, seniority, selected_round) + [CUSTOM_QUESTION]
+                            )
+                            # Render every question's audio in the background so "Ask" plays instantly
+                            get_tts_service().prefetch(q for q in st.session_state['custom_questions'] if q != CUSTOM_QUESTION)
                             st.session_state['setup_step'] = 3
                             st.rerun()
 
@@ -238,78 +286,112 @@ def main():
                         selected_q = st.selectbox("Select Question", st.session_state['custom_questions'], label_visibility="collapsed")
                     
                     target_question = selected_q
-                    if selected_q == "-- Custom Question --":
+                    if selected_q == CUSTOM_QUESTION:
                         target_question = st.text_area("Type your custom question here:")
                     
                     with btn_col:
-                        if st.button("🗣️ Ask", use_container_width=True):
-                            try:
-                                import pyttsx3
-                                engine = pyttsx3.init()
-                                engine.say(target_question)
-                                engine.runAndWait()
-                            except Exception as e:
-                                st.toast(f"Audio playback error: {e}", icon="🔇")
+                        ask = st.button("🗣️ Ask", use_container_width=True)
+                    if ask and target_question:
+                        try:
+                            # Usually already rendered by the prefetch; otherwise it jumps the prefetch queue and only waits for the render in progress
+                            speech = get_tts_service().synthesize(target_question).result(timeout=30)
+                            st.audio(speech, format=audio_format(speech), autoplay=True)
+                        except Exception as e:
+                            st.toast(f"Audio playback error: {e}", icon="🔇")
                     
                     st.divider()
                     st.subheader("5. Provide Answer")
                     
                     input_method = st.radio("Input Method", ["🎙️ Record Live", "📁 Upload Audio"], horizontal=True)
                     
+                    # The answer stays in memory (AudioBlob); the pipeline accepts it wherever it takes a path
                     audio_path = None
                     if input_method == "🎙️ Record Live":
                         audio_path = record_audio()
-                        if audio_path: st.audio(audio_path)
                     else:
                         uploaded_file = st.file_uploader("Upload an audio file", type=["wav", "mp3", "m4a", "ogg"])
                         if uploaded_file:
-                            audio_path = os.path.join("temp_data", uploaded_file.name)
-                            with open(audio_path, "wb") as f:
-                                f.write(uploaded_file.getbuffer())
-                            st.audio(audio_path)
+                            audio_path = AudioBlob.from_upload(uploaded_file)
+                            if audio_path and KEEP_AUDIO:
+                                audio_path.persist()
+                    if audio_path:
+                        st.audio(audio_path.data, format=audio_path.mime)
 
                     if audio_path:
-                        if st.button(f"Analyze Answer ({selected_tier})", type="primary", use_container_width=True):
-                            with st.status("Analyzing your performance...", expanded=True) as status:
-                                st.write("🔍 Running Pre-Flight Silence Check...")
-                                transcript, metrics, duration, error = processor.process_interview(
-                                    audio_path, difficulty=selected_mode, tier=selected_tier
-                                )
-                                
-                                if error:
-                                    status.update(label="Analysis Failed", state="error", expanded=True)
-                                    st.error(f"⚠️ {error}")
-                                else:
-                                    # Save to history tracking
-                                    HistoryManager.save_session(metrics['wpm'], metrics['filler_count'], metrics['tone_label'], selected_mode)
-                                    status.update(label="Analysis Complete!", state="complete", expanded=False)
-                                    
-                                    # Send full context to dashboard
-                                    full_context = f"[{seniority} {job_title}] - {selected_q}"
-                                    st.session_state['results'] = (transcript, metrics, duration, full_context, selected_persona)
-                                    st.rerun()
+                        analysis_running = 'job_id' in st.session_state
+                        if st.button(f"Analyze Answer ({selected_tier})", type="primary", use_container_width=True, disabled=analysis_running):
+                            # Queue the job; the monitor fragment below polls it so this rerun returns immediately
+                            full_context = f"[{seniority} {job_title}] - {selected_q}"
+                            st.session_state['job_id'] = get_job_manager().submit_analysis(
+                                processor, audio_path, selected_mode, selected_tier,
+                                question=full_context, persona=selected_persona
+                            )
+                            st.session_state['job_context'] = {
+                                "full_context": full_context,
+                                "persona": selected_persona,
+                                "mode": selected_mode,
+                                "tier": selected_tier
+                            }
+                            st.rerun()
+
+                        # Mock-interview round: collect answers, then transcribe them together in one batch
+                        if st.button("➕ Save Answer to Round", use_container_width=True, disabled=analysis_running):
+                            st.session_state.setdefault('round_answers', {})[target_question] = audio_path
+                            st.toast(f"Saved answer to: {target_question}", icon="📥")
+
+                    round_answers = st.session_state.get('round_answers', {})
+                    if round_answers:
+                        st.caption(f"📥 Round: {len(round_answers)} answer(s) saved")
+                        if st.button(f"Analyze Full Round ({len(round_answers)} answers)", use_container_width=True,
+                                     disabled='job_id' in st.session_state):
+                            answers = [(f"[{seniority} {job_title}] - {q}", path) for q, path in round_answers.items()]
+                            st.session_state['job_id'] = get_job_manager().submit_round(
+                                processor, answers, selected_mode, selected_tier, persona=selected_persona
+                            )
+                            st.session_state['job_context'] = {
+                                "kind": "round",
+                                "persona": selected_persona,
+                                "mode": selected_mode,
+                                "tier": selected_tier
+                            }
+                            st.rerun()
+
+                    if 'job_id' in st.session_state:
+                        analysis_job_monitor()
+                    if 'job_error' in st.session_state:
+                        st.error(f"⚠️ {st.session_state.pop('job_error')}")
 
                 with col2:
                     if 'results' in st.session_state:
                         transcript, metrics, duration, saved_q, saved_persona = st.session_state['results']
                         from src.ui.dashboard import render_dashboard
                         render_dashboard(transcript, metrics, duration, selected_mode, selected_tier, saved_q, saved_persona)
+                    elif 'round_results' in st.session_state:
+                        round_results, saved_persona = st.session_state['round_results']
+                        labels = [r['question'] for r in round_results]
+                        picked = round_results[labels.index(st.selectbox("Round answers", labels))]
+                        if picked['error']:
+                            st.error(f"⚠️ {picked['error']}")
+                        else:
+                            from src.ui.dashboard import render_dashboard
+                            render_dashboard(picked['transcript'], picked['metrics'], picked['duration'],
+                                             selected_mode, selected_tier, picked['question'], saved_persona)
                     else:
                         st.info("Ready for analysis. Complete the setup and provide your answer.")
 
         # --- HISTORY TAB ---
         with tab_history:
             st.subheader("📈 Your Progression")
-            history_data = HistoryManager.load_history()
+            summary = HistoryManager.summarize()
             
-            if history_data:
-                df = pd.DataFrame(history_data)
-                
-                # Layout metrics
+            if summary['sessions']:
+                # Aggregates come straight from the store; only the chart window is loaded
                 h1, h2, h3 = st.columns(3)
-                h1.metric("Total Sessions", len(df))
-                h2.metric("Avg WPM", round(df['wpm'].mean()))
-                h3.metric("Total Fillers Tracked", df['fillers'].sum())
+                h1.metric("Total Sessions", summary['sessions'])
+                h2.metric("Avg WPM", round(summary['avg_wpm']))
+                h3.metric("Total Fillers Tracked", summary['total_fillers'])
+                
+                df = pd.DataFrame(HistoryManager.load_recent(limit=100))
                 
                 st.divider()
                 st.markdown("**Speaking Pace (WPM) Over Time**")
@@ -318,12 +400,18 @@ def main():
                 st.markdown("**Filler Word Count Over Time**")
                 st.bar_chart(df['fillers'], use_container_width=True)
                 
-                # Raw Data
+                # Raw Data (paginated, newest first)
                 with st.expander("View Raw Data"):
-                    st.dataframe(df)
+                    page_size = 50
+                    pages = max(1, -(-summary['sessions'] // page_size))
+                    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+                    st.dataframe(pd.DataFrame(HistoryManager.load_history(limit=page_size, offset=(page - 1) * page_size, newest_first=True)))
             else:
                 st.info("No session history yet. Complete an analysis to see your progression!")
 
+        # --- BACKGROUND WARM-UP (after first paint; no-op once the model is loaded) ---
+        AudioProcessor().warm_up(selected_tier)
+
     except Exception as e:
         st.error("🚨 An unexpected error occurred.")
         st.code(str(e))
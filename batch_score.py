@@ -0,0 +1,11 @@
+"""Command-line entry point for offline batch scoring (see src/backend/batch.py)."""
+import os
+import platform
+
+if platform.system() == "Windows":
+    os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+from src.backend.batch import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Block scorer vs the in-memory scorer on a long recording.
+Scores the same file with AcousticScorer.analyze_audio and with
+analyze_in_blocks, checks the metrics agree within tolerance and compares
+peak traced memory (numpy allocations are visible to tracemalloc). The block
+figure is for a file path; the app scores an already decoded buffer, so its
+peak also includes the samples (reported separately).
+
+Run from the repo root:  python -m benchmarks.bench_block_scorer [minutes]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from src.backend.block_scorer import analyze_in_blocks
+from src.backend.decoded_audio import decode_audio
+from src.backend.scorer import AcousticScorer
+from benchmarks.fixtures import speech_like, write_fixture
+
+TRANSCRIPT = "so I led the migration and we shipped it on time " * 200
+TOLERANCES = {"duration": 0.01, "energy_avg": 0.002, "pitch_avg": 2, "pitch_var": 2, "pause_count": 0, "wpm": 1}
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024**2
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    path = write_fixture(f"long_{minutes:g}min.wav", speech_like(duration=minutes * 60, sr=16000), sr=16000)
+    audio = decode_audio(path)  # What the app hands the scorer after transcription
+    buffer_mb = audio.samples.nbytes / 1024**2
+    gc.collect()
+
+    scorer = AcousticScorer()
+    failures = []
+    for method in ("piptrack", "yin"):
+        full, full_s, full_mb = measure(lambda: scorer.analyze_audio(path, TRANSCRIPT, pitch_method=method))
+        blocks, block_s, block_mb = measure(lambda: analyze_in_blocks(scorer, path, TRANSCRIPT, pitch_method=method))
+        _, _, decoded_mb = measure(lambda: analyze_in_blocks(scorer, audio, TRANSCRIPT, pitch_method=method))
+        print(f"{method}: in-memory {full_s:.1f}s / {full_mb:.0f} MB peak | blocks {block_s:.1f}s / {block_mb:.0f} MB peak"
+              f" | app (decoded buffer) {buffer_mb:.0f} MB samples + {decoded_mb:.0f} MB peak")
+
+        if full.get("error") or blocks.get("error"):
+            print(f"  Scoring failed: {full.get('error')} | {blocks.get('error')}")
+            failures.append(method)
+            continue
+        for key, tolerance in TOLERANCES.items():
+            ok = abs(full[key] - blocks[key]) <= tolerance
+            print(f"  [{'ok' if ok else 'FAIL'}] {key}: {full[key]} vs {blocks[key]} (tolerance {tolerance})")
+            if not ok:
+                failures.append(f"{method}.{key}")
+        if block_mb >= full_mb:
+            print("  [FAIL] block scorer did not lower peak memory")
+            failures.append(f"{method}.memory")
+
+    if failures:
+        print(f"{len(failures)} check(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("Block scorer matches the in-memory scorer.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Decode-once regression check and timing.
+Compares AcousticScorer metrics from a file path (native-rate load) with
+metrics from the shared 16 kHz DecodedAudio buffer (frames scaled to the
+rate, so both paths analyse the same window lengths), and times the old
+three-load path against the single decode.
+
+Run from the repo root:  python -m benchmarks.bench_decode_once
+"""
+import sys
+import time
+import librosa  # pyright: ignore[reportMissingImports]
+from src.backend.scorer import AcousticScorer
+from src.backend.decoded_audio import decode_audio
+from benchmarks.fixtures import speech_like, write_fixture
+
+TRANSCRIPT = "so um I think the main thing I did was like rebuild the pipeline " * 8
+
+# Metric -> allowed absolute difference between the two paths
+TOLERANCES = {"duration": 0.05, "pitch_avg": 10, "pitch_var": 10, "energy_avg": 0.01, "wpm": 2, "pause_count": 0, "filler_count": 0}
+
+
+def main():
+    path = write_fixture("decode_once_60s.wav", speech_like(duration=60.0), sr=44100, stereo=True)
+    scorer = AcousticScorer()
+
+    # Old path: silence check, Whisper and the scorer each decode the file
+    start = time.perf_counter()
+    librosa.load(path, sr=16000)
+    librosa.load(path, sr=16000)
+    legacy = scorer.analyze_audio(path, TRANSCRIPT)
+    legacy_time = time.perf_counter() - start
+
+    # New path: one decode shared by every stage
+    start = time.perf_counter()
+    audio = decode_audio(path)
+    shared = scorer.analyze_audio(audio, TRANSCRIPT)
+    shared_time = time.perf_counter() - start
+
+    print(f"legacy (3 decodes): {legacy_time:.2f}s | decode-once: {shared_time:.2f}s | speed-up x{legacy_time / shared_time:.2f}")
+
+    failures = []
+    for key, tol in TOLERANCES.items():
+        diff = abs(legacy[key] - shared[key])
+        status = "ok" if diff <= tol else "MISMATCH"
+        print(f"  {key:<12} legacy={legacy[key]!s:<8} shared={shared[key]!s:<8} [{status}]")
+        if diff > tol:
+            failures.append(key)
+
+    if failures:
+        print(f"Regression: {', '.join(failures)} outside tolerance.")
+        sys.exit(1)
+    print("All metrics within tolerance.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Feature bank vs the separate librosa calls.
+For answers of a few lengths, times the old per-answer path (trim for the
+silence check, then split, piptrack/yin and rms, each framing the signal
+on its own) against one FeatureBank, checks both produce the same
+intervals, pitch and RMS, and shows what extra features cost once the
+shared arrays exist.
+
+Run from the repo root:  python -m benchmarks.bench_feature_bank
+"""
+import sys
+import time
+import librosa  # pyright: ignore[reportMissingImports]
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.features import FeatureBank, frame_sizes
+from benchmarks.fixtures import speech_like
+
+SR = 16000
+DURATIONS = (30.0, 60.0, 120.0)
+REPEATS = 3
+EXTRAS = ("spectral_centroid", "jitter", "shimmer")
+
+
+def separate_calls(y, sr, method):
+    """The pre-bank path: every stage frames (and piptrack FFTs) the whole answer itself."""
+    frame, hop = frame_sizes(sr)
+    trimmed, _ = librosa.effects.trim(y, top_db=30, frame_length=frame, hop_length=hop)
+    intervals = librosa.effects.split(y, top_db=25, ref=np.max, frame_length=frame, hop_length=hop)
+    if method == "yin":
+        f0 = librosa.yin(y, fmin=50, fmax=300, sr=sr, frame_length=frame, hop_length=hop)
+        gate = librosa.feature.rms(y=y, frame_length=frame, hop_length=hop)[0]
+        n = min(len(f0), len(gate))
+        f0, gate = f0[:n], gate[:n]
+        pitch = f0[(gate > np.max(gate) * 10 ** (-25 / 20)) & (f0 > 50) & (f0 < 300)]
+    else:
+        pitches, magnitudes = librosa.piptrack(y=y, sr=sr, n_fft=frame, hop_length=hop)
+        f0 = np.take_along_axis(pitches, magnitudes.argmax(axis=0)[np.newaxis, :], axis=0)[0]
+        pitch = f0[(f0 > 50) & (f0 < 300)]
+    rms = librosa.feature.rms(y=y, frame_length=frame, hop_length=hop)[0]
+    return len(trimmed), intervals, pitch, rms
+
+
+def shared_bank(y, sr, method):
+    bank = FeatureBank(y, sr)
+    start, end = bank.trim_span(top_db=30)
+    return end - start, bank.split(top_db=25), bank.pitch(method), bank.rms
+
+
+def best_of(fn, *args):
+    best, result = float("inf"), None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    failures = []
+    print(f"{'answer':>8}{'pitch':>10}{'separate ms':>14}{'bank ms':>10}{'speed-up':>10}")
+    for duration in DURATIONS:
+        y = speech_like(duration=duration, sr=SR)
+        for method in ("piptrack", "yin"):
+            t_old, old = best_of(separate_calls, y, SR, method)
+            t_new, new = best_of(shared_bank, y, SR, method)
+            print(f"{duration:>7.0f}s{method:>10}{t_old * 1000:>14.1f}{t_new * 1000:>10.1f}{t_old / t_new:>9.2f}x")
+
+            checks = {
+                "trim": old[0] == new[0],
+                "split": np.array_equal(old[1], new[1]),
+                "pitch": len(old[2]) == len(new[2]) and np.allclose(old[2], new[2]),
+                "rms": np.allclose(old[3], new[3], rtol=1e-4, atol=1e-7)
+            }
+            for name, ok in checks.items():
+                if not ok:
+                    print(f"  MISMATCH: {name} differs from the separate librosa call")
+                    failures.append(f"{duration:.0f}s.{method}.{name}")
+
+    # Marginal cost of extra features once the shared arrays are cached
+    bank = FeatureBank(speech_like(duration=60.0, sr=SR), SR)
+    bank.split(), bank.pitch("piptrack")
+    for name in EXTRAS:
+        start = time.perf_counter()
+        value = bank.get(name)
+        summary = f"{float(np.mean(value)):.1f} Hz mean" if name == "spectral_centroid" else f"{value:.4f}"
+        print(f"  +{name:<18}{(time.perf_counter() - start) * 1000:>7.1f} ms  ({summary})")
+
+    if failures:
+        print(f"{len(failures)} mismatch(es): {', '.join(failures)}")
+        sys.exit(1)
+    print("Feature bank matches the separate calls.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Disk vs in-memory ingest.
+The old path writes the upload to temp_data, hashes the file for the result
+cache and decodes it from disk; the new path hashes and decodes the bytes
+the browser sent. Checks both give the same cache key and samples, and that
+persisting the same audio twice stores one file.
+
+Run from the repo root:  python -m benchmarks.bench_ingest
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.decoded_audio import decode_audio
+from src.backend.ingest import AudioBlob, AudioStore
+from src.utils.result_cache import ResultCache
+from benchmarks.fixtures import speech_like, write_fixture
+
+REPEATS = 5
+
+
+def disk_ingest(data, directory):
+    path = os.path.join(directory, "upload.wav")
+    with open(path, "wb") as f:
+        f.write(data)
+    return ResultCache.hash_audio(path), decode_audio(path)
+
+
+def memory_ingest(data):
+    blob = AudioBlob(data, "upload.wav")
+    return blob.digest, decode_audio(blob)
+
+
+def best_of(fn):
+    times, value = [], None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), value
+
+
+def main():
+    fixture = write_fixture("ingest_120s.wav", speech_like(duration=120.0), sr=44100, stereo=True)
+    with open(fixture, "rb") as f:
+        data = f.read()
+
+    scratch = tempfile.mkdtemp(prefix="ingest_")
+    failures = []
+    try:
+        disk_time, (disk_hash, disk_audio) = best_of(lambda: disk_ingest(data, scratch))
+        memory_time, (memory_hash, memory_audio) = best_of(lambda: memory_ingest(data))
+        print(f"{len(data) / 1024**2:.1f} MB upload | disk: {disk_time * 1000:.0f}ms | memory: {memory_time * 1000:.0f}ms "
+              f"| speed-up x{disk_time / memory_time:.2f} | {len(data) * REPEATS / 1024**2:.0f} MB of writes avoided")
+
+        if disk_hash != memory_hash:
+            failures.append("cache key differs between disk and memory ingest")
+        if len(disk_audio.samples) != len(memory_audio.samples):
+            failures.append(f"length {len(disk_audio.samples)} vs {len(memory_audio.samples)}")
+        else:
+            diff = float(np.max(np.abs(disk_audio.samples - memory_audio.samples)))
+            print(f"  max sample difference: {diff:.2e}")
+            if diff > 1e-5:
+                failures.append(f"samples differ by {diff:.2e}")
+
+        # Same bytes under two names: one file, named by content
+        store = AudioStore(store_dir=os.path.join(scratch, "store"))
+        first = store.save(AudioBlob(data, "answer.wav")).result()
+        second = store.save(AudioBlob(data, "renamed.wav")).result()
+        stored = os.listdir(store.store_dir)
+        print(f"  persisted: {stored}")
+        if first != second or len(stored) != 1:
+            failures.append("duplicate upload stored twice")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if failures:
+        print("FAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("In-memory ingest matches the disk path.")
+
+
+if __name__ == "__main__":
+    main()
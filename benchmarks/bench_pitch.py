@@ -0,0 +1,58 @@
+"""
+Pitch-stage micro-benchmark and correctness check.
+Compares the vectorized piptrack gather against the original per-frame
+list comprehension (values must match exactly) and times the YIN
+estimator used by the Eco tier.
+
+Run from the repo root:  python -m benchmarks.bench_pitch
+"""
+import sys
+import time
+import librosa  # pyright: ignore[reportMissingImports]
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.features import frame_sizes
+from src.backend.scorer import AcousticScorer
+from benchmarks.fixtures import speech_like
+
+SR = 16000
+REPEATS = 3
+
+
+def legacy_pitch(y, sr):
+    """The original per-frame implementation, kept verbatim for comparison (at the rate-scaled frame sizes)."""
+    n_fft, hop_length = frame_sizes(sr)
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr, n_fft=n_fft, hop_length=hop_length)
+    return [pitches[index, t] for t in range(pitches.shape[1]) if (index := magnitudes[:, t].argmax()) and 50 < pitches[index, t] < 300]
+
+
+def best_of(fn, *args):
+    best, result = float("inf"), None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    y = speech_like(duration=180.0, sr=SR)
+    scorer = AcousticScorer()
+
+    t_legacy, legacy = best_of(legacy_pitch, y, SR)
+    t_vector, vector = best_of(scorer.extract_pitch, y, SR, "piptrack")
+    t_yin, yin = best_of(scorer.extract_pitch, y, SR, "yin")
+
+    print(f"3-min clip, best of {REPEATS}:")
+    print(f"  legacy loop     {t_legacy:.3f}s  ({len(legacy)} voiced frames)")
+    print(f"  vectorized      {t_vector:.3f}s  ({len(vector)} voiced frames)  x{t_legacy / t_vector:.2f}")
+    print(f"  yin (Eco tier)  {t_yin:.3f}s  ({len(yin)} voiced frames)  x{t_legacy / t_yin:.2f}")
+    print(f"  mean F0: legacy={np.mean(legacy):.1f} vectorized={np.mean(vector):.1f} yin={np.mean(yin):.1f} Hz")
+
+    if not np.array_equal(np.asarray(legacy, dtype=vector.dtype), vector):
+        print("MISMATCH: vectorized piptrack differs from the legacy loop.")
+        sys.exit(1)
+    print("Vectorized piptrack matches the legacy loop exactly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Round transcription throughput: transcribes a mock-interview round of
+answers one at a time (the per-answer path) and then as one batch through
+AudioProcessor.transcribe_many, reporting audio-seconds per wall-second.
+
+Run from the repo root:  python -m benchmarks.bench_round [tier] [answers]
+"""
+import sys
+import time
+from src.backend.audio_processor import AudioProcessor, INITIAL_PROMPT
+from src.backend.profiles import get_profile
+from src.backend.decoded_audio import decode_audio
+from benchmarks.fixtures import speech_like, write_fixture
+
+
+def main():
+    tier = sys.argv[1] if len(sys.argv) > 1 else "Eco (Low Spec)"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # Answers of different lengths, like a real round
+    audios = [
+        decode_audio(write_fixture(f"round_{k}.wav", speech_like(duration=20.0 + 15 * k, seed=k), sr=16000))
+        for k in range(count)
+    ]
+    total_audio = sum(a.duration for a in audios)
+    processor = AudioProcessor()
+    model = processor.load_model(tier)  # Load outside the timings
+
+    # Sequential: one answer after another on the single-worker model
+    start = time.perf_counter()
+    sequential = []
+    for audio in audios:
+        segments, _ = model.transcribe(audio.samples, initial_prompt=INITIAL_PROMPT, **get_profile(tier).transcribe_kwargs())
+        sequential.append(" ".join(seg.text for seg in segments).strip())
+    sequential_time = time.perf_counter() - start
+
+    # Batched: the whole round at once
+    start = time.perf_counter()
+    batched, throughput = processor.transcribe_many(audios, tier=tier)
+    batched_time = time.perf_counter() - start
+
+    print(f"{count} answers, {total_audio:.0f}s of audio ({tier})")
+    print(f"  sequential: {sequential_time:.2f}s wall | {total_audio / sequential_time:.1f} audio-s/s")
+    print(f"  batched:    {batched_time:.2f}s wall | {throughput:.1f} audio-s/s | speed-up x{sequential_time / batched_time:.2f}")
+
+    mismatched = sum(1 for a, (b, _) in zip(sequential, batched) if len(a.split()) != len(b.split()))
+    if mismatched:
+        print(f"  note: {mismatched} answer(s) differ in word count between the two paths")
+
+
+if __name__ == "__main__":
+    main()
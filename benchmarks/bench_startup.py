@@ -0,0 +1,80 @@
+"""
+Startup and rerun budgets.
+Measures (in fresh interpreters) how long the app's modules take to
+import and checks that torch / librosa / faster_whisper stay unloaded
+until a stage needs them, then times the per-rerun setup work in main().
+
+Run from the repo root:  python -m benchmarks.bench_startup
+"""
+import json
+import subprocess
+import sys
+import time
+
+IMPORT_BUDGET_S = 2.0     # Cold import of everything app.py pulls in at module level
+RERUN_BUDGET_MS = 50.0    # Per-rerun construction work in main()
+HEAVY_MODULES = ["torch", "librosa", "faster_whisper"]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.backend.audio_processor, src.backend.jobs, src.backend.monitor, src.ui.dashboard, src.ui.recorder, src.utils.history
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_s": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+PROBE_TIMING = """
+import json, time
+from src.backend.hardware import HardwareInfo
+start = time.perf_counter(); HardwareInfo(use_disk_cache=False); cold = time.perf_counter() - start
+HardwareInfo()  # Make sure the disk cache exists
+start = time.perf_counter(); HardwareInfo(); warm = time.perf_counter() - start
+print(json.dumps({"probe_cold_s": cold, "probe_disk_cached_s": warm}))
+"""
+
+
+def run_probe(code):
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    failures = []
+
+    imports = run_probe(IMPORT_PROBE)
+    print(f"Cold import: {imports['import_s']:.2f}s (budget {IMPORT_BUDGET_S}s)")
+    if imports["import_s"] > IMPORT_BUDGET_S:
+        failures.append("import time")
+    if imports["loaded"]:
+        print(f"  Heavy modules imported eagerly: {', '.join(imports['loaded'])}")
+        failures.append("lazy imports")
+
+    probe = run_probe(PROBE_TIMING)
+    print(f"Hardware probe: cold {probe['probe_cold_s'] * 1000:.0f} ms | disk-cached {probe['probe_disk_cached_s'] * 1000:.0f} ms")
+
+    # Per-rerun work from main(), in-process (hardware info is cached after the first call)
+    from src.backend.audio_processor import AudioProcessor
+    from src.backend.hardware import get_hardware_info
+    from src.backend.monitor import ResourceMonitor
+
+    get_hardware_info()
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        hw = get_hardware_info()
+        hw.get_recommendation()
+        ResourceMonitor().get_system_usage()
+        AudioProcessor()
+    rerun_ms = (time.perf_counter() - start) / runs * 1000
+    print(f"Rerun setup: {rerun_ms:.1f} ms (budget {RERUN_BUDGET_MS} ms)")
+    if rerun_ms > RERUN_BUDGET_MS:
+        failures.append("rerun time")
+
+    if failures:
+        print(f"Over budget: {', '.join(failures)}")
+        sys.exit(1)
+    print("All startup budgets met.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Streaming replay: feeds a WAV through StreamingAnalyzer in real-time
+chunks (as a microphone would) and compares time-to-feedback after
+"stop" with the batch pipeline.
+
+Run from the repo root:  python -m benchmarks.bench_streaming [path.wav] [tier]
+"""
+import sys
+import time
+from src.backend.audio_processor import AudioProcessor
+from src.backend.streaming import replay_wav
+from benchmarks.fixtures import speech_like, write_fixture
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else write_fixture("stream_60s.wav", speech_like(duration=60.0), sr=16000)
+    tier = sys.argv[2] if len(sys.argv) > 2 else "Eco (Low Spec)"
+    processor = AudioProcessor()
+
+    # Batch: everything happens after "stop"
+    start = time.perf_counter()
+    batch_transcript, batch_metrics, _, batch_error = processor.process_interview(path, tier=tier)
+    batch_wait = time.perf_counter() - start
+
+    # Streaming: only the tail segment is left after "stop"
+    analyzer = processor.start_stream(tier=tier)
+    transcript, metrics, tail_wait, error = replay_wav(analyzer, path, chunk_seconds=0.5, realtime=True)
+
+    print(f"batch wait after stop:     {batch_wait:.2f}s  (error={batch_error})")
+    print(f"streaming wait after stop: {tail_wait:.2f}s  (error={error})")
+    if batch_metrics and metrics:
+        for key in ("wpm", "pause_count", "filler_count", "pitch_avg", "energy_avg"):
+            print(f"  {key:<12} batch={batch_metrics[key]!s:<8} streaming={metrics[key]!s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Tracing overhead and export.
+Measures the per-span cost with tracing on and off, then traces a full
+stub-Whisper analysis, prints per-span percentiles and writes the traces
+as Chrome-trace JSON (open in chrome://tracing or ui.perfetto.dev).
+
+Run from the repo root:  python -m benchmarks.bench_tracing
+"""
+import sys
+import time
+from src.utils import tracing
+from benchmarks.fixtures import speech_like, write_fixture
+from benchmarks.stub_whisper import StubWhisperModel
+
+ENABLED_BUDGET_US = 50.0   # Per span, including two RSS reads
+DISABLED_BUDGET_US = 2.0
+
+
+def per_span_us(n=20000):
+    start = time.perf_counter()
+    for _ in range(n):
+        with tracing.span("bench.noop"):
+            pass
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    tracing.ENABLED = False
+    disabled = per_span_us()
+    tracing.ENABLED = True
+    with tracing.start_trace("overhead"):
+        enabled = per_span_us(2000)
+    print(f"Span overhead: enabled {enabled:.1f} us (budget {ENABLED_BUDGET_US}) | disabled {disabled:.2f} us (budget {DISABLED_BUDGET_US})")
+
+    # A real pipeline run with the stub model in place of Whisper
+    from src.backend.audio_processor import AudioProcessor
+
+    processor = AudioProcessor()
+    stub = StubWhisperModel(seconds_per_audio_second=0.01)
+    processor.load_model = lambda tier="Balanced": stub
+    seed = int(time.time())  # Fresh audio each run so the result cache can't short-circuit the pipeline
+    for k in range(3):
+        path = write_fixture(f"trace_60s_{k}.wav", speech_like(duration=60.0, seed=seed + k), sr=16000)
+        _, metrics, _, error = processor.process_interview(path, tier="Eco (Low Spec)")
+        if error:
+            print(f"Analysis failed: {error}")
+            sys.exit(1)
+
+    print(f"{'span':<22}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, stats in sorted(tracing.recorder.percentiles().items()):
+        if name == "bench.noop":
+            continue
+        print(f"{name:<22}{stats['count']:>7}{stats['p50'] * 1000:>10.1f}{stats['p90'] * 1000:>10.1f}{stats['p99'] * 1000:>10.1f}")
+    print(f"Chrome trace written to {tracing.recorder.export_chrome()}")
+
+    if enabled > ENABLED_BUDGET_US or disabled > DISABLED_BUDGET_US:
+        print("Tracing overhead over budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
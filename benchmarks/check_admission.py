@@ -0,0 +1,73 @@
+"""
+Admission-control scenarios against a fake resource probe.
+Each case fixes free RAM/VRAM and the pool state, then checks the decision
+(admit / queue / downgrade / reject) the controller makes.
+
+Run from the repo root:  python -m benchmarks.check_admission
+"""
+import sys
+import threading
+import time
+from src.backend.admission import AdmissionController
+
+ECO, BALANCED, PRO = "Eco (Low Spec)", "Balanced (Mid Spec)", "Pro (High Spec)"
+MODELS = {ECO: "tiny.en", BALANCED: "small.en", PRO: "medium.en"}
+
+
+class FakeProbe:
+    def __init__(self, ram_free_gb, vram_free_gb=0.0):
+        self.ram_free_gb = ram_free_gb
+        self.vram_free_gb = vram_free_gb
+
+    def __call__(self):
+        return {"ram_free_gb": self.ram_free_gb, "vram_free_gb": self.vram_free_gb}
+
+
+def fake_resolver(device="cpu", loaded=()):
+    def resolve(tier):
+        return MODELS[tier], device, "int8", tier in loaded
+    return resolve
+
+
+def controller(ram, vram=0.0, device="cpu", loaded=()):
+    return AdmissionController(probe=FakeProbe(ram, vram), resolve_model=fake_resolver(device, loaded), reserve_gb=1.0)
+
+
+def main():
+    failures = []
+
+    def expect(name, decision, action, tier=None):
+        ok = decision.action == action and (tier is None or decision.tier == tier)
+        print(f"  [{'ok' if ok else 'FAIL'}] {name}: {decision} {decision.message}")
+        if not ok:
+            failures.append(name)
+
+    expect("plenty of RAM", controller(16).decide(PRO, 120), "admit", PRO)
+    expect("Pro too big, Balanced fits", controller(2.0).decide(PRO, 120), "downgrade", BALANCED)
+    expect("only Eco fits", controller(1.5).decide(PRO, 120), "downgrade", ECO)
+    expect("nothing fits", controller(1.1).decide(PRO, 120), "reject")
+    expect("pooled model needs no weights", controller(1.5, loaded=(PRO,)).decide(PRO, 120), "admit", PRO)
+    expect("long audio grows the estimate", controller(1.45).decide(ECO, 3600), "reject")
+    expect("GPU weights need VRAM", controller(8, vram=0.5, device="cuda").decide(PRO, 60), "downgrade", BALANCED)
+
+    # Memory committed to a running job makes the next one wait, then it is admitted on release
+    ctl = controller(2.2)
+    first = ctl.admit("job-1", BALANCED, 60)
+    expect("first job", first, "admit", BALANCED)
+    expect("second job while first runs", ctl.decide(BALANCED, 60), "downgrade", ECO)
+    ctl.admit("job-2", ECO, 60)
+    expect("third job, memory committed", ctl.decide(BALANCED, 60), "queue")
+
+    threading.Timer(0.2, ctl.release, args=("job-1",)).start()
+    start = time.perf_counter()
+    third = ctl.admit("job-3", BALANCED, 60, timeout=5)
+    expect(f"third job after release ({time.perf_counter() - start:.2f}s)", third, "admit", BALANCED)
+
+    if failures:
+        print(f"{len(failures)} admission case(s) failed.")
+        sys.exit(1)
+    print("All admission cases passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Logging pipeline checks.
+Times a log call through the queue against a synchronous FileHandler
+while the disk stalls on every write (slow disk, antivirus scan), then
+checks that JSON lines carry the job ID and timings, that files rotate at
+the size cap, and that purge deletes every file while the handler stays
+installed and later records still land.
+
+Run from the repo root:  python -m benchmarks.check_logging
+"""
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from src.utils.diagnostics import LogPipeline, job_context
+
+RECORDS = 2000
+STALL_S = 0.0005  # Simulated per-write disk stall
+
+
+def stalled(handler):
+    """Makes every write on this handler stall first."""
+    emit = handler.emit
+    def slow_emit(record):
+        time.sleep(STALL_S)
+        emit(record)
+    handler.emit = slow_emit
+    return handler
+
+
+class StalledPipeline(LogPipeline):
+    def _handlers(self):
+        return [stalled(handler) for handler in super()._handlers()]
+
+
+def per_call_us(logger):
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        logger.info(f"segment {i} transcribed", extra={"stage": "transcribe"})
+    return (time.perf_counter() - start) / RECORDS * 1e6
+
+
+def isolated_logger(name):
+    logger = logging.getLogger(f"check_logging.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def main():
+    failures = []
+
+    def expect(name, ok, detail=""):
+        print(f"  [{'ok' if ok else 'FAIL'}] {name} {detail}")
+        if not ok:
+            failures.append(name)
+
+    directory = tempfile.mkdtemp(prefix="logs_")
+    try:
+        # Baseline: the old synchronous FileHandler, writing in the calling thread
+        sync_logger = isolated_logger("sync")
+        sync_handler = stalled(logging.FileHandler(os.path.join(directory, "sync.log"), encoding="utf-8"))
+        sync_logger.addHandler(sync_handler)
+        sync_us = per_call_us(sync_logger)
+        sync_handler.close()
+        os.remove(os.path.join(directory, "sync.log"))
+
+        # Small size cap with enough backups to keep every record, so rotation is exercised
+        pipeline = StalledPipeline(directory=os.path.join(directory, "queued"), json_lines=True, max_mb=0.1, backups=50)
+        logger = isolated_logger("queued")
+        pipeline.install(logger)
+        with job_context("job-abc123"):
+            queued_us = per_call_us(logger)
+            logger.info("Success", extra={"stage": "complete", "timings": {"decode": 0.1, "total": 1.2}})
+        expect("log call does not block on I/O", queued_us < sync_us, f"({queued_us:.1f}us vs sync {sync_us:.1f}us per call)")
+        expect("flush drains the queue", pipeline.flush(timeout=60))
+
+        files = os.listdir(pipeline.directory)
+        json_files = [name for name in files if name.startswith("app_events.jsonl")]
+        lines = []
+        for name in json_files:
+            with open(os.path.join(pipeline.directory, name), encoding="utf-8") as f:
+                lines += [json.loads(line) for line in f]
+        with open(os.path.join(pipeline.directory, "app_events.jsonl"), encoding="utf-8") as f:
+            last = json.loads(f.readlines()[-1])  # The active file holds the newest records
+        expect("JSON lines carry job ID and timings", last.get("job_id") == "job-abc123" and last.get("timings", {}).get("total") == 1.2)
+        expect("every record written", len(lines) == RECORDS + 1, f"({len(lines)} lines)")
+        expect("files rotate at the size cap", len(json_files) > 1, f"({len(json_files)} JSON files)")
+
+        deleted = pipeline.purge()
+        logger.info("after purge")
+        pipeline.flush(timeout=10)
+        with open(os.path.join(pipeline.directory, "app_debug.log"), encoding="utf-8") as f:
+            remaining = f.read()
+        expect("purge removes every file", deleted == len(files), f"({deleted} removed)")
+        expect("handler survives purge", pipeline.handler in logger.handlers and "after purge" in remaining and "segment" not in remaining)
+        pipeline.pause()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if failures:
+        print(f"{len(failures)} logging check(s) failed.")
+        sys.exit(1)
+    print("All logging checks passed.")
+
+
+if __name__ == "__main__":
+    main()
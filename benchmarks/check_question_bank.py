@@ -0,0 +1,132 @@
+"""
+Question bank behaviour against a slow local stub generator.
+Checks key normalization, stage-name mapping, background prefetch of every
+round, that concurrent sessions asking for the same role share one
+generation, that warm lookups are instant, that explicit requests run ahead
+of prefetch, that slow generations time out to templates, that entries
+survive a restart and that a failing generator falls back to templates.
+
+Run from the repo root:  python -m benchmarks.check_question_bank
+"""
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from src.backend.question_bank import FRIENDLY_PERSONA, TECHNICAL_PERSONA, QuestionBank, TemplateGenerator, make_key, round_profile
+
+ROLE = ("Tech", "Backend Developer", "Senior / Lead")
+WARM_BUDGET_S = 0.005
+
+
+class StubGenerator(TemplateGenerator):
+    """Template output after a fixed delay, counting calls per key."""
+    name = "stub"
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, *key):
+        with self._lock:
+            self.calls[key] += 1
+        time.sleep(self.delay)
+
+    def rounds(self, industry, job_title, seniority):
+        self._count(industry, job_title, seniority)
+        return super().rounds(industry, job_title, seniority)
+
+    def questions(self, industry, job_title, seniority, round_name):
+        self._count(industry, job_title, seniority, round_name)
+        return super().questions(industry, job_title, seniority, round_name)
+
+
+class FailingGenerator(TemplateGenerator):
+    name = "failing"
+
+    def questions(self, *args):
+        raise ConnectionError("model server down")
+
+
+def main():
+    failures = []
+
+    def expect(name, ok, detail=""):
+        print(f"  [{'ok' if ok else 'FAIL'}] {name} {detail}")
+        if not ok:
+            failures.append(name)
+
+    store = tempfile.mkdtemp(prefix="question_bank_")
+    try:
+        expect("normalized keys", make_key(" tech ", "back-end  DEVELOPER", "Senior / Lead", "Final Interview (30 min)")
+               == make_key("Tech", "Back End Developer", "senior lead", "Final Interview (30–60+ min)"))
+
+        # Generated stage names are free-form: keywords anywhere, neutral default when nothing matches
+        expect("free-form stages map by keyword",
+               round_profile("Coding Challenge (60 min)", "Mid-Level")["recommended_persona"] == TECHNICAL_PERSONA
+               and round_profile("Onsite Technical Loop", "Mid-Level")["recommended_persona"] == TECHNICAL_PERSONA
+               and round_profile("Meet the Team", "Mid-Level")["recommended_persona"] == FRIENDLY_PERSONA)
+
+        # Eight sessions ask for the same role at once: one generation per key
+        stub = StubGenerator()
+        bank = QuestionBank(generator=stub, store_dir=store, workers=2)
+        rounds = bank.get_rounds(*ROLE)
+        threads = [threading.Thread(target=bank.get_questions, args=(*ROLE, rounds[0])) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expect("concurrent requests deduplicated", max(stub.calls.values()) == 1, f"(calls: {sum(stub.calls.values())})")
+
+        # Prefetch warms every round in the background
+        start = time.perf_counter()
+        bank.prefetch(*ROLE).join()
+        expect("prefetch covers every round", all(bank.is_ready(*ROLE, r) for r in rounds),
+               f"({time.perf_counter() - start:.2f}s for {len(rounds)} rounds)")
+
+        start = time.perf_counter()
+        bank.get_questions(*ROLE, rounds[-1])
+        warm = time.perf_counter() - start
+        expect("warm lookup is instant", warm < WARM_BUDGET_S, f"({warm * 1000:.2f} ms)")
+
+        # An explicit request jumps the prefetch queue instead of waiting behind every round
+        role = ("Healthcare", "Nurse", "Mid-Level")
+        busy = QuestionBank(generator=StubGenerator(delay=0.2), store_dir=store)
+        busy_rounds = busy.get_rounds(*role)
+        busy.prefetch(*role)
+        time.sleep(0.05)  # Prefetch is now generating round 1 with the rest queued
+        start = time.perf_counter()
+        busy.get_questions(*role, busy_rounds[-1])
+        waited = time.perf_counter() - start
+        expect("explicit request runs ahead of prefetch", waited < 0.2 * 2.5, f"({waited:.2f}s, queue of {len(busy_rounds)})")
+        expect("promoted prefetch generated once", busy.generator.calls[(*role, busy_rounds[-1])] == 1)
+
+        # A generation that outlasts the wait: templates instead of a TimeoutError
+        slow = QuestionBank(generator=StubGenerator(delay=1.0), store_dir=store)
+        start = time.perf_counter()
+        questions = slow.get_questions("Retail", "Cashier", "Entry-Level", rounds[0], timeout=0.1)
+        expect("timeout falls back to templates", bool(questions) and time.perf_counter() - start < 0.5)
+
+        # A new process (fresh bank, same directory) is served from disk
+        restarted = StubGenerator()
+        QuestionBank(generator=restarted, store_dir=store).get_questions("tech", "backend developer", "senior lead", rounds[2])
+        expect("persisted across restarts", not restarted.calls)
+
+        # Generator failure: template questions, nothing persisted
+        broken = QuestionBank(generator=FailingGenerator(), store_dir=store)
+        questions = broken.get_questions("Finance", "Analyst", "Entry-Level", rounds[0])
+        expect("falls back to templates", bool(questions) and not QuestionBank(store_dir=store, generator=stub).is_ready(
+            "Finance", "Analyst", "Entry-Level", rounds[0]))
+    finally:
+        shutil.rmtree(store, ignore_errors=True)
+
+    if failures:
+        print(f"{len(failures)} question bank check(s) failed.")
+        sys.exit(1)
+    print("All question bank checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+STAR evaluator behaviour against the offline Ollama stub.
+Checks that grading streams token by token, that the five-line reply is
+parsed (and garbage is reported as an error), that repeat evaluations are
+served from the memory and disk caches without a request, that a reply
+slower than the timeout fails without being cached, that a cancelled
+evaluation frees its slot, and that the concurrency cap holds.
+
+Run from the repo root:  python -m benchmarks.check_star_evaluator
+"""
+import shutil
+import sys
+import tempfile
+import threading
+import src.backend.llm_client as llm_client
+from src.backend.llm_client import STAREvaluator, parse_evaluation
+from benchmarks.stub_ollama import CANNED_REPLY, start_stub
+
+QUESTION = "Tell me about a time you improved a system."
+PERSONA = "🤝 Friendly HR Recruiter (Focuses on soft skills & culture fit)"
+
+
+def answer(n):
+    return f"In my last role I rebuilt the billing pipeline, attempt {n}, and cut latency in half."
+
+
+def main():
+    failures = []
+
+    def expect(name, ok, detail=""):
+        print(f"  [{'ok' if ok else 'FAIL'}] {name} {detail}")
+        if not ok:
+            failures.append(name)
+
+    llm_client.CACHE_DIR = tempfile.mkdtemp(prefix="llm_cache_")
+    server, url = start_stub(delay=0.01)
+    stub = server.RequestHandlerClass
+    try:
+        expect("parses the five-line reply", parse_evaluation(CANNED_REPLY)["situation"]["score"] == 4
+               and parse_evaluation(CANNED_REPLY)["result"]["score"] == 2)
+        expect("unparseable reply is an error", parse_evaluation("I'd rather not say.")["error"] is not None)
+
+        # Streaming: tokens arrive one by one, the parsed result is kept on the stream
+        evaluator = STAREvaluator(host=url, model="stub", timeout=10)
+        stream = evaluator.stream(answer(0), QUESTION, PERSONA)
+        tokens = list(stream)
+        result = stream.result
+        expect("streams token by token", len(tokens) > 10 and "".join(tokens).strip() == CANNED_REPLY.strip(),
+               f"({len(tokens)} tokens)")
+        expect("streamed reply parsed", result and not result["error"] and result["summary"].startswith("Solid structure"))
+
+        # Memory, then disk (fresh evaluator, same directory): no request either time
+        served = stub.requests_served
+        memory_hit = evaluator.cached(answer(0), QUESTION, PERSONA)
+        disk_hit = STAREvaluator(host=url, model="stub").cached(answer(0), QUESTION, PERSONA)
+        expect("memory cache hit", memory_hit == result)
+        expect("disk cache hit", disk_hit == result)
+        expect("cache hits make no request", stub.requests_served == served)
+
+        # A reply slower than the timeout: error, nothing cached
+        slow_server, slow_url = start_stub(delay=0.02)
+        impatient = STAREvaluator(host=slow_url, model="stub", timeout=0.1)
+        timed_out = impatient.evaluate(answer(1), QUESTION, PERSONA)
+        expect("slow reply times out", bool(timed_out.get("error")), f"({timed_out.get('error')})")
+        expect("timeouts are not cached", impatient.cached(answer(1), QUESTION, PERSONA) is None)
+        slow_server.shutdown()
+
+        # Cancelled mid-stream (the analysis failed): error, nothing cached, slot free again
+        single = STAREvaluator(host=url, model="stub", timeout=10, max_concurrency=1)
+        stop = threading.Event()
+        stop.set()
+        cancelled = single.evaluate(answer(2), QUESTION, PERSONA, cancel=stop)
+        expect("cancelled evaluation stops", "cancelled" in (cancelled.get("error") or ""))
+        expect("cancelled evaluation not cached", single.cached(answer(2), QUESTION, PERSONA) is None)
+        freed = single._slots.acquire(blocking=False)
+        expect("cancelled evaluation frees its slot", freed)
+        if freed:
+            single._slots.release()
+
+        # Concurrency cap: six sessions at once, never more than two requests at the stub
+        capped = STAREvaluator(host=url, model="stub", timeout=10, max_concurrency=2)
+        threads = [threading.Thread(target=capped.evaluate, args=(answer(10 + n), QUESTION, PERSONA)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expect("concurrency cap holds", stub.peak_in_flight <= 2, f"(peak {stub.peak_in_flight})")
+
+        # Every slot taken: the next caller is turned away after the timeout instead of queueing forever
+        full = STAREvaluator(host=url, model="stub", timeout=0.1, max_concurrency=1)
+        full._slots.acquire()
+        busy = full.evaluate(answer(20), QUESTION, PERSONA)
+        full._slots.release()
+        expect("busy evaluator refuses", "busy" in (busy.get("error") or ""))
+    finally:
+        server.shutdown()
+        shutil.rmtree(llm_client.CACHE_DIR, ignore_errors=True)
+
+    if failures:
+        print(f"{len(failures)} STAR evaluator check(s) failed.")
+        sys.exit(1)
+    print("All STAR evaluator checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Text analyzer regression check.
+The regexes the scorer used before the single-pass analyzer are the oracle:
+on Whisper-style sentences (punctuation, elongated fillers, stutters,
+repetitions, trailing-off ellipses) the English analyzer must give the same
+filler, stutter, repetition and blunder counts. Multi-word phrases must not
+match across punctuation, and the event offsets must point at the text.
+
+Run from the repo root:  python -m benchmarks.check_text_analytics
+"""
+import re
+import sys
+from src.backend.text_analytics import LEXICONS, TextAnalyzer
+
+# Legacy AcousticScorer patterns (before the analyzer), kept verbatim
+LEGACY = {
+    "filler": re.compile(r'\b(um+?|uh+?|ah+?|hmm+|like|you know|sort of|kind of|i mean|basically|actually)\b', re.IGNORECASE),
+    "stutter": re.compile(r'\b(\w+)-\1\b', re.IGNORECASE),
+    "repetition": re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE),
+    "blunder": re.compile(r'(\.\.\.|scratch that|sorry i mean)', re.IGNORECASE),
+}
+
+CORPUS = [
+    "Um, so I think, like, the main thing was, you know, the migration.",
+    "I-I was kind of worried... scratch that, I was sure.",
+    "We we shipped it. Basically it worked, actually.",
+    "Hmm, let me think. Ummm, the the answer is uh, forty.",
+    "It was kind, of course, the best option.",
+    "I liked that kind. Of course it changed.",
+    "hm hmm umm uhh ahh",
+    "Sorry i mean the second one, I mean really.",
+    "You know, you know what I mean?",
+    "Th-th-that was sort of... sort of hard.",
+    "It's like like a loop, sort. Of.",
+    "My umbrella, the ahead-of-time build, and the album are not fillers.",
+]
+
+
+def legacy_counts(text):
+    return {kind: len(pattern.findall(text)) for kind, pattern in LEGACY.items()}
+
+
+def main():
+    analyzer = TextAnalyzer("en", LEXICONS["en"])
+    failures = []
+    for text in CORPUS:
+        result = analyzer.analyze(text)
+        expected = legacy_counts(text)
+        ok = result["counts"] == expected
+        offsets_ok = all(text[e["start_char"]:e["end_char"]] == e["text"] for e in result["events"])
+        print(f"  [{'ok' if ok and offsets_ok else 'FAIL'}] {text!r}")
+        if not ok:
+            print(f"        legacy {expected}\n        analyzer {result['counts']}")
+            failures.append(text)
+        elif not offsets_ok:
+            print("        event offsets don't match the text")
+            failures.append(text)
+
+    if failures:
+        print(f"{len(failures)} sentence(s) differ from the legacy counts.")
+        sys.exit(1)
+    print("Analyzer matches the legacy counts on every sentence.")
+
+
+if __name__ == "__main__":
+    main()
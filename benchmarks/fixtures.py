@@ -0,0 +1,69 @@
+"""
+Deterministic synthetic audio fixtures.
+Everything is generated locally from a fixed seed, so no recordings or
+downloads are needed to run the benchmarks.
+"""
+import os
+import numpy as np  # pyright: ignore[reportMissingImports]
+import soundfile as sf  # pyright: ignore[reportMissingImports]
+
+FIXTURE_DIR = os.path.join("temp_data", "bench_fixtures")
+
+
+def speech_like(duration=30.0, sr=44100, pause_every=8.0, pause_len=2.0, seed=0):
+    """
+    Voice-band harmonic signal with a syllable-rate envelope and periodic
+    silent gaps, so pitch, energy and pause detection all have work to do.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+
+    # Gliding F0 between ~110 and ~190 Hz
+    f0 = 150 + 40 * np.sin(2 * np.pi * 0.3 * t) + rng.normal(0, 2, size=t.shape).cumsum() / sr
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum((0.5 / k) * np.sin(k * phase) for k in range(1, 6))
+
+    # ~4 syllables per second, plus a little breath noise
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2 / 4
+    y = y * envelope + rng.normal(0, 0.002, size=t.shape)
+
+    # Hard silences for pause detection
+    if pause_every:
+        for start in np.arange(pause_every, duration, pause_every + pause_len):
+            a, b = int(start * sr), int(min(start + pause_len, duration) * sr)
+            y[a:b] = rng.normal(0, 1e-5, size=b - a)
+
+    return (0.3 * y / np.max(np.abs(y))).astype(np.float32)
+
+
+def write_fixture(name, y, sr=44100, stereo=False):
+    """Writes a fixture WAV (stereo when asked, to exercise down-mixing) and returns its path."""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = os.path.join(FIXTURE_DIR, name)
+    data = np.stack([y, y], axis=1) if stereo else y
+    sf.write(path, data, sr)
+    return path
+
+
+def tone(freq=220.0, duration=10.0, sr=16000, amplitude=0.3):
+    """Steady sine: a known pitch for accuracy checks."""
+    t = np.arange(int(duration * sr)) / sr
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def silence(duration=10.0, sr=16000, seed=0):
+    """Near-digital silence that the dead-air check must reject."""
+    return np.random.default_rng(seed).normal(0, 1e-5, size=int(duration * sr)).astype(np.float32)
+
+
+def tone_with_gaps(freq=180.0, duration=30.0, sr=16000, burst=4.0, gap=2.0):
+    """Tone bursts separated by silent gaps; every gap is a pause (> 1.5 s)."""
+    y = tone(freq, duration, sr)
+    for start in np.arange(burst, duration, burst + gap):
+        y[int(start * sr):int(min(start + gap, duration) * sr)] = 0.0
+    return y
+
+
+def expected_gaps(duration, burst, gap):
+    """Number of complete gaps tone_with_gaps / speech_like put between sound."""
+    return sum(1 for start in np.arange(burst, duration, burst + gap) if start + gap < duration)
@@ -0,0 +1,204 @@
+"""
+Stage-by-stage benchmark and accuracy harness.
+Generates deterministic fixtures, times every pipeline stage separately
+(decode, silence check, transcribe, pitch, RMS, split, text analytics,
+full scoring), records peak RSS, checks scoring against known answers and
+compares timings with a stored baseline. Timings are machine-specific, so no
+baseline is committed: the first run on a machine records one and later runs
+compare against it.
+
+Run from the repo root:
+    python -m benchmarks.harness                   # stub Whisper, compare with baseline (first run records it)
+    python -m benchmarks.harness --whisper real    # real model for the chosen --tier
+    python -m benchmarks.harness --save-baseline   # record this machine's baseline
+    python -m benchmarks.harness --quick           # skip the 10-minute fixture
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np  # pyright: ignore[reportMissingImports]
+import psutil
+from src.backend.audio_processor import AudioProcessor, INITIAL_PROMPT
+from src.backend.decoded_audio import DecodedAudio, decode_audio
+from src.backend.features import FeatureBank
+from src.backend.profiles import get_profile
+from src.backend.scorer import AcousticScorer
+from benchmarks.fixtures import expected_gaps, silence, speech_like, tone, tone_with_gaps, write_fixture
+from benchmarks.stub_whisper import StubWhisperModel
+
+RESULTS_DIR = os.path.join("temp_data", "bench_results")
+BASELINE_FILE = os.path.join("benchmarks", "baseline.json")
+
+# A stage regresses when it is this much slower than baseline AND slower by more than the noise floor
+SLOWDOWN_THRESHOLD = 0.25
+NOISE_FLOOR_S = 0.005
+RSS_THRESHOLD = 0.20
+
+
+def build_fixtures(quick=False):
+    """name -> path. Speech-like clips are written at 44.1 kHz stereo to exercise resampling and down-mixing."""
+    fixtures = {
+        "tone_220hz_10s": write_fixture("h_tone_220.wav", tone(220.0, 10.0), sr=16000),
+        "silence_10s": write_fixture("h_silence.wav", silence(10.0), sr=16000),
+        "gaps_30s": write_fixture("h_gaps_30.wav", tone_with_gaps(180.0, 30.0, burst=4.0, gap=2.0), sr=16000),
+        "speech_60s": write_fixture("h_speech_60.wav", speech_like(duration=60.0), sr=44100, stereo=True),
+    }
+    if not quick:
+        fixtures["speech_600s"] = write_fixture("h_speech_600.wav", speech_like(duration=600.0, sr=16000), sr=16000)
+    return fixtures
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024**2) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB elsewhere
+    except ImportError:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024**2)
+
+
+def timed(fn, repeats):
+    """Median wall time of fn() over `repeats` runs, plus the last return value."""
+    times, value = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), value
+
+
+def transcribe_all(model, samples, options):
+    segments, _ = model.transcribe(samples, initial_prompt=INITIAL_PROMPT, **options)
+    return " ".join(seg.text for seg in segments).strip()
+
+
+def run_stages(name, path, model, options, scorer, repeats):
+    stages = {}
+    stages["decode"], audio = timed(lambda: decode_audio(path), repeats)
+    y, sr = audio.samples, audio.sample_rate
+    # Fresh DecodedAudio per run so the feature bank cache doesn't hide the real cost
+    stages["silence_check"], (is_silent, _) = timed(lambda: AudioProcessor.check_for_silence(DecodedAudio(y, sr)), repeats)
+    if is_silent:
+        return {f"{name}.{stage}": s for stage, s in stages.items()}, audio, None
+
+    stages["transcribe"], transcript = timed(lambda: transcribe_all(model, y, options), 1)
+    stages["pitch_piptrack"], _ = timed(lambda: scorer.extract_pitch(y, sr, method="piptrack"), repeats)
+    stages["pitch_yin"], _ = timed(lambda: scorer.extract_pitch(y, sr, method="yin"), repeats)
+    stages["rms"], _ = timed(lambda: FeatureBank(y, sr).rms, repeats)
+    stages["split"], _ = timed(lambda: FeatureBank(y, sr).split(top_db=25), repeats)
+    stages["text"], _ = timed(lambda: scorer.analyze_text(transcript, duration=audio.duration), repeats)
+    stages["score_total"], metrics = timed(lambda: scorer.analyze_audio(DecodedAudio(y, sr), transcript), repeats)
+    return {f"{name}.{stage}": s for stage, s in stages.items()}, audio, metrics
+
+
+def check(accuracy, key, value, expected, ok):
+    accuracy[key] = {"value": value, "expected": expected, "ok": bool(ok)}
+
+
+def run(args):
+    fixtures = build_fixtures(quick=args.quick)
+    scorer = AcousticScorer()
+    if args.whisper == "stub":
+        model = StubWhisperModel()
+    else:
+        model = AudioProcessor().load_model(args.tier)
+    options = get_profile(args.tier).transcribe_kwargs()
+
+    stages, accuracy = {}, {}
+    for name, path in fixtures.items():
+        repeats = 1 if name.endswith("600s") else args.repeats
+        timings, audio, metrics = run_stages(name, path, model, options, scorer, repeats)
+        stages.update(timings)
+        print(f"{name:<16} " + "  ".join(f"{k.split('.', 1)[1]}={v * 1000:.0f}ms" for k, v in timings.items()))
+
+        # Known answers for the synthetic clips
+        if name == "silence_10s":
+            check(accuracy, "silence_rejected", metrics is None, True, metrics is None)
+        elif name == "tone_220hz_10s" and metrics:
+            for method in ("piptrack", "yin"):
+                pitch = float(np.median(scorer.extract_pitch(audio.samples, audio.sample_rate, method=method)))
+                check(accuracy, f"tone_pitch_{method}", round(pitch, 1), 220.0, abs(pitch - 220.0) <= 11.0)
+        elif name == "gaps_30s" and metrics:
+            expected = expected_gaps(30.0, 4.0, 2.0)
+            check(accuracy, "gaps_pause_count", metrics["pause_count"], expected, metrics["pause_count"] == expected)
+        elif name.startswith("speech_") and metrics:
+            duration = float(name.split("_")[1][:-1])
+            expected = expected_gaps(duration, 8.0, 2.0)
+            check(accuracy, f"{name}_pause_count", metrics["pause_count"], expected, metrics["pause_count"] == expected)
+            check(accuracy, f"{name}_duration", metrics["duration"], duration, abs(metrics["duration"] - duration) < 0.1)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "whisper": args.whisper,
+            "tier": args.tier,
+            "quick": args.quick
+        },
+        "stages": stages,
+        "accuracy": accuracy,
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def compare(results, baseline):
+    """Returns a list of human-readable regressions against the baseline."""
+    regressions = []
+    for key, seconds in results["stages"].items():
+        before = baseline.get("stages", {}).get(key)
+        if before and seconds > before * (1 + SLOWDOWN_THRESHOLD) and seconds - before > NOISE_FLOOR_S:
+            regressions.append(f"{key}: {before * 1000:.0f}ms -> {seconds * 1000:.0f}ms (+{(seconds / before - 1):.0%})")
+    before_rss = baseline.get("peak_rss_mb")
+    if before_rss and results["peak_rss_mb"] > before_rss * (1 + RSS_THRESHOLD):
+        regressions.append(f"peak RSS: {before_rss:.0f}MB -> {results['peak_rss_mb']:.0f}MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each pipeline stage on synthetic fixtures and check for regressions.")
+    parser.add_argument("--whisper", choices=["stub", "real"], default="stub", help="Stub needs no model download")
+    parser.add_argument("--tier", default="Eco (Low Spec)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per stage (median is kept)")
+    parser.add_argument("--quick", action="store_true", help="Skip the 10-minute fixture")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"harness_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Peak RSS {results['peak_rss_mb']} MB | results written to {out_path}")
+
+    failures = [f"{key}: got {r['value']}, expected {r['expected']}" for key, r in results["accuracy"].items() if not r["ok"]]
+
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("whisper") != args.whisper:
+            print("Baseline was recorded with a different Whisper backend; transcribe timings are not comparable.")
+        failures += compare(results, baseline)
+    else:
+        if not args.save_baseline:
+            print(f"No baseline at {args.baseline}; this run is recorded as the baseline (nothing to compare yet).")
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if failures:
+        print("FAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("All accuracy checks passed; no regressions.")
+
+
+if __name__ == "__main__":
+    main()
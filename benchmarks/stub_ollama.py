@@ -0,0 +1,104 @@
+"""
+Offline stand-in for the Ollama HTTP API.
+Serves /api/generate (streaming NDJSON and non-streaming) with a canned
+STAR reply, so the LLM client can be exercised with no model or network.
+
+Run from the repo root:  python -m benchmarks.stub_ollama [--port 11435] [--delay 0.02]
+then start the app with OLLAMA_HOST=http://127.0.0.1:11435
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_REPLY = (
+    "SITUATION: 4 | Clear context about the legacy billing system.\n"
+    "TASK: 3 | Your personal responsibility could be stated more directly.\n"
+    "ACTION: 4 | Concrete steps, well sequenced.\n"
+    "RESULT: 2 | Quantify the outcome, e.g. latency or cost saved.\n"
+    "SUMMARY: Solid structure overall. Close with a measurable result to make it memorable.\n"
+)
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse can be observed
+    delay = 0.0
+    reply = CANNED_REPLY
+    requests_served = 0
+    in_flight = 0
+    peak_in_flight = 0  # Most generate requests served at once (concurrency-cap checks)
+    _counter_lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        type(self).requests_served += 1
+
+        if self.path != "/api/generate":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        cls = type(self)
+        with cls._counter_lock:
+            cls.in_flight += 1
+            cls.peak_in_flight = max(cls.peak_in_flight, cls.in_flight)
+        try:
+            self._generate(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # Client gave up mid-stream (e.g. its timeout)
+        finally:
+            with cls._counter_lock:
+                cls.in_flight -= 1
+
+    def _generate(self, body):
+        model = body.get("model", "stub")
+        if body.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in self.reply.split(" "):
+                self._chunk({"model": model, "response": token + " ", "done": False})
+                time.sleep(self.delay)
+            self._chunk({"model": model, "response": "", "done": True, "done_reason": "stop"})
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            payload = json.dumps({"model": model, "response": self.reply, "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    def _chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_stub(port=0, delay=0.0, reply=CANNED_REPLY):
+    """Starts the stub in a daemon thread; returns (server, base_url). port=0 picks a free port.
+    Request counters live on server.RequestHandlerClass."""
+    handler = type("Handler", (StubOllamaHandler,), {"delay": delay, "reply": reply, "_counter_lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--delay", type=float, default=0.02, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+    server, url = start_stub(args.port, args.delay)
+    print(f"Stub Ollama listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,41 @@
+"""
+Offline stand-in for faster_whisper.WhisperModel.
+transcribe() yields lazy segments like the real model, with scripted text
+whose word rate tracks the audio length, so the pipeline and the scorer
+can be timed without downloading weights.
+"""
+import time
+from collections import namedtuple
+
+Segment = namedtuple("Segment", "start end text")
+Info = namedtuple("Info", "duration language")
+
+SCRIPT = ("so um I think the main thing I did was like rebuild the the pipeline and uh "
+          "you know we cut the latency in half basically ").split()
+
+
+class StubWhisperModel:
+    def __init__(self, words_per_second=2.5, seconds_per_audio_second=0.0, segment_seconds=10.0, sample_rate=16000):
+        self.words_per_second = words_per_second
+        self.cost = seconds_per_audio_second  # Simulated decode cost (0 = instant)
+        self.segment_seconds = segment_seconds
+        self.sample_rate = sample_rate
+        self.calls = 0
+
+    def transcribe(self, audio, **options):
+        self.calls += 1
+        duration = len(audio) / self.sample_rate
+
+        def segments():
+            start, k = 0.0, 0
+            while start < duration:
+                end = min(start + self.segment_seconds, duration)
+                if self.cost:
+                    time.sleep((end - start) * self.cost)
+                n = max(1, int((end - start) * self.words_per_second))
+                words = [SCRIPT[(k + i) % len(SCRIPT)] for i in range(n)]
+                k += n
+                yield Segment(start, end, " " + " ".join(words))
+                start = end
+
+        return segments(), Info(duration, "en")
@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from src.backend.ingest import AudioBlob
+from src.backend.model_pool import estimate_model_ram_gb, get_model_pool
+from src.backend.monitor import get_system_sampler
+from src.backend.profiles import DEFAULT_PROFILES
+from src.utils.diagnostics import get_logger
+from src.utils.metrics import registry
+
+logger = get_logger()
+
+ADMISSIONS = registry.counter("coach_admission_decisions_total", "Admission decisions for analysis jobs.", ("decision", "tier"))
+
+# Memory kept free for the OS and the Streamlit server itself.
+RESERVE_GB = float(os.environ.get("COACH_ADMISSION_RESERVE_GB", "1.0"))
+QUEUE_TIMEOUT_S = 300  # How long a job may wait for memory before it is rejected
+
+# Working set beyond the weights: decoder activations plus per-second buffers
+# (16 kHz float32 samples, STFT/pitch matrices and Whisper features ~= 0.5 MB per audio second).
+INFERENCE_OVERHEAD_GB = 0.3
+PER_AUDIO_SECOND_GB = 0.5 / 1024
+
+
+def audio_duration(path):
+    """Cheap duration probe from the file header; falls back to a size-based guess (16-bit mono 16 kHz)."""
+    if isinstance(path, AudioBlob):
+        duration = path.duration()
+        return duration if duration is not None else path.size / 32000
+    try:
+        import soundfile as sf  # pyright: ignore[reportMissingImports]
+        return sf.info(path).duration
+    except Exception:
+        try:
+            return os.path.getsize(path) / 32000
+        except OSError:
+            return 0.0
+
+
+def estimate_job_gb(model_size, compute_type, duration_s, model_loaded=False):
+    """RAM one analysis needs: weights (unless already pooled) + working set that grows with audio length."""
+    weights = 0.0 if model_loaded else estimate_model_ram_gb(model_size, compute_type)
+    return weights + INFERENCE_OVERHEAD_GB + duration_s * PER_AUDIO_SECOND_GB
+
+
+def sampler_probe():
+    """Default resource probe: free RAM / VRAM from the shared system sampler."""
+    stats = get_system_sampler().latest()
+    return {
+        "ram_free_gb": stats["ram_available_gb"],
+        "vram_free_gb": max(0.0, stats["vram_total_gb"] - stats["vram_used_gb"])
+    }
+
+
+class Decision:
+    """Outcome of an admission check: admit, queue, downgrade or reject."""
+    def __init__(self, action, tier, estimate_gb, message=""):
+        self.action = action
+        self.tier = tier
+        self.estimate_gb = estimate_gb
+        self.message = message
+
+    def __repr__(self):
+        return f"Decision({self.action}, {self.tier}, ~{self.estimate_gb:.2f} GB)"
+
+
+class AdmissionController:
+    """
+    Decides, before a job starts, whether there is memory for it.
+    Memory committed to admitted-but-unfinished jobs counts as used, so a burst
+    of submissions can't all pass the same free-RAM reading. The probe is
+    injectable (any callable returning ram_free_gb / vram_free_gb) for testing.
+    """
+    def __init__(self, probe=None, resolve_model=None, reserve_gb=RESERVE_GB, tiers=None):
+        self.probe = probe or sampler_probe
+        self.resolve_model = resolve_model or self._default_resolve
+        self.reserve_gb = reserve_gb
+        self.tiers = list(tiers or DEFAULT_PROFILES)  # Cheapest first
+        self._committed = {}
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def _default_resolve(tier):
+        from src.backend.audio_processor import AudioProcessor
+        model_size, device, compute_type = AudioProcessor().resolve_model(tier)
+        return model_size, device, compute_type, get_model_pool().holds(model_size, device, compute_type)
+
+    def _estimate(self, tier, duration_s):
+        """(RAM GB, VRAM GB) the tier's model needs for this much audio."""
+        model_size, device, compute_type, loaded = self.resolve_model(tier)
+        if device == "cpu":
+            return estimate_job_gb(model_size, compute_type, duration_s, model_loaded=loaded), 0.0
+        # On GPU the weights live in VRAM; RAM only holds the working set
+        weights = 0.0 if loaded else estimate_model_ram_gb(model_size, compute_type)
+        return estimate_job_gb(model_size, compute_type, duration_s, model_loaded=True), weights
+
+    def decide(self, tier, duration_s):
+        """Pure decision for one job against the current probe reading (nothing is reserved)."""
+        resources = self.probe()
+        with self._cond:
+            committed = sum(self._committed.values())
+        free_now = resources["ram_free_gb"] - self.reserve_gb - committed
+        free_later = resources["ram_free_gb"] - self.reserve_gb  # Once running jobs release their share
+        vram_free = resources.get("vram_free_gb", 0.0)
+
+        ram, vram = self._estimate(tier, duration_s)
+        if ram <= free_now and vram <= vram_free:
+            return Decision("admit", tier, ram)
+
+        # Cheaper tiers that fit right now
+        for lower in reversed(self.tiers[:self.tiers.index(tier)] if tier in self.tiers else []):
+            lower_ram, lower_vram = self._estimate(lower, duration_s)
+            if lower_ram <= free_now and lower_vram <= vram_free:
+                return Decision("downgrade", lower, lower_ram,
+                                f"Low memory: running on {lower.split()[0]} instead of {tier.split()[0]}.")
+
+        if committed and ram <= free_later and vram <= vram_free:
+            return Decision("queue", tier, ram, "Waiting for memory held by other analyses.")
+
+        return Decision("reject", tier, ram,
+                        f"Not enough free memory for this analysis (needs ~{ram + vram:.1f} GB, "
+                        f"{max(0.0, free_now):.1f} GB available). Close other applications or record a shorter answer.")
+
+    def admit(self, job_id, tier, duration_s, on_wait=None, timeout=QUEUE_TIMEOUT_S):
+        """
+        Blocks while the decision is 'queue' (re-checking whenever a job releases
+        memory), then reserves the estimate. Returns the final Decision; the caller
+        must release(job_id) when the job ends.
+        """
+        deadline = time.time() + timeout
+        previous = None
+        while True:
+            decision = self.decide(tier, duration_s)
+            if decision.action != previous:  # A queued job re-checks often; count/log each change once
+                ADMISSIONS.inc(decision=decision.action, tier=tier)
+                logger.info(f"Admission {job_id}: {decision} for {duration_s:.0f}s of audio. {decision.message}")
+                previous = decision.action
+
+            if decision.action in ("admit", "downgrade"):
+                with self._cond:
+                    self._committed[job_id] = decision.estimate_gb
+                return decision
+            if decision.action == "reject":
+                return decision
+            if time.time() >= deadline:
+                ADMISSIONS.inc(decision="reject", tier=tier)
+                logger.warning(f"Admission {job_id}: rejected after waiting {timeout}s for memory")
+                return Decision("reject", tier, decision.estimate_gb,
+                                "The server is busy and short on memory. Please try again in a few minutes.")
+            if on_wait:
+                on_wait(decision)
+            with self._cond:
+                self._cond.wait(timeout=5)
+
+    def release(self, job_id):
+        with self._cond:
+            if self._committed.pop(job_id, None) is not None:
+                self._cond.notify_all()
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller():
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController()
+    return _controller
@@ -1,38 +1,77 @@
 import streamlit as st  # pyright: ignore[reportMissingImports]
-from faster_whisper import WhisperModel  # pyright: ignore[reportMissingImports]
-from src.backend.scorer import AcousticScorer
-from src.backend.hardware import HardwareInfo
+from src.backend.scorer import AcousticScorer, SCORER_VERSION
+from src.backend.model_pool import get_model_pool, max_parallel_workers
+from src.backend.decoded_audio import check_for_silence, decode_audio
+from src.backend.ingest import AudioBlob
+from src.backend.block_scorer import LONG_RECORDING_S, analyze_in_blocks
+from src.backend.streaming import StreamingAnalyzer
+from src.backend.hardware import get_hardware_info
+from src.backend.profiles import get_profile
 from src.utils.diagnostics import get_logger
+from src.utils.result_cache import ResultCache
+from src.utils.tracing import span, start_trace, traced, traced_iter
+from src.utils.metrics import ANALYSES, AUDIO_DURATION, CACHE_HITS, STAGE_LATENCY
+from src.backend.llm_client import get_star_evaluator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
 import os
+import threading
 import time
 
 logger = get_logger()
 
+# Shared by all sessions for work that overlaps with acoustic scoring (LLM grading)
+_post_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="post-asr")
+
+_warmed_tiers = set()
+_warm_lock = threading.Lock()
+
+# Primes Whisper to keep fillers and stutters instead of cleaning them up
+INITIAL_PROMPT = "Umm, I-I think... well, actually... so your... it will delete."
+
+def _segment_dict(seg):
+    """Plain-dict copy of a Whisper segment, with word timestamps when they were requested."""
+    words = [{"word": w.word, "start": w.start, "end": w.end} for w in (getattr(seg, "words", None) or [])]
+    return {"start": seg.start, "end": seg.end, "text": seg.text, "words": words}
+
+
+def _words(segment_list):
+    return [word for seg in segment_list for word in seg.get("words", [])]
+
+
+class AnalysisCancelled(Exception):
+    """Raised from a progress hook to abort an in-flight analysis."""
+
+
 class AudioProcessor:
     def __init__(self):
         self.scorer = AcousticScorer()
-        self.hw = HardwareInfo()
+        self.hw = get_hardware_info()
+        self.active_model = None  # (model_size, device, compute_type) actually serving the last request
+
+    def resolve_model(self, tier="Balanced"):
+        """Returns the (model_size, device, compute_type) a tier's decoding profile asks for on this machine."""
+        profile = get_profile(tier)
+        device = self.hw.get_optimal_device()
+        compute_type = self.hw.get_compute_type(device)
+        if device == "cpu" and profile.compute_type:
+            compute_type = profile.compute_type
+        return profile.model_size, device, compute_type
 
+    @traced("load_model")
     def load_model(self, tier="Balanced"):
         """
         Loads model with AUTOMATIC FALLBACK.
         If 'Pro' fails, it retries with 'Eco'.
+        Models come from the shared pool, so repeat analyses skip the load entirely.
         """
-        device = self.hw.get_optimal_device()
-        compute_type = self.hw.get_compute_type(device)
-        
-        # Map Tiers to Model Sizes
-        tier_map = {
-            "Eco (Low Spec)": "tiny.en",
-            "Balanced (Mid Spec)": "small.en",
-            "Pro (High Spec)": "medium.en"
-        }
-        
-        target_model = tier_map.get(tier, "small.en")
+        target_model, device, compute_type = self.resolve_model(tier)
         
         try:
             logger.info(f"Attempting to load {target_model} on {device} ({compute_type})...")
-            return WhisperModel(target_model, device=device, compute_type=compute_type)
+            model = get_model_pool().get(target_model, device, compute_type, **get_profile(tier).model_kwargs())
+            self.active_model = (target_model, device, compute_type)
+            return model
             
         except RuntimeError as e:
             error_msg = str(e).lower()
@@ -41,74 +80,345 @@ class AudioProcessor:
                 logger.warning(f"CRASH DETECTED: {target_model} failed. Falling back to Eco Mode.")
                 st.toast(f"⚠️ 'Pro' mode failed (Out of VRAM). Switching to Eco Mode...", icon="🛡️")
                 
-                # FALLBACK: Force CPU and Tiny Model
-                return WhisperModel("tiny.en", device="cpu", compute_type="int8")
+                # FALLBACK: Force CPU and Tiny Model (kept warm in the same pool)
+                model = get_model_pool().get("tiny.en", "cpu", "int8")
+                self.active_model = ("tiny.en", "cpu", "int8")
+                return model
             else:
                 raise e # Re-raise unknown errors
 
-    def process_interview(self, audio_path, difficulty="Standard Interview", tier="Balanced"):
-        if not os.path.exists(audio_path):
+    def process_interview(self, audio_path, difficulty="Standard Interview", tier="Balanced", progress=None,
+                          question=None, persona=None):
+        """
+        Full pipeline: cache lookup, decode, silence check, transcription, then
+        acoustic scoring and STAR grading in parallel (when a question is given).
+        `progress(stage, fraction)` is called between stages and may raise
+        AnalysisCancelled to stop the job. Stage spans end up in metrics["trace"].
+        """
+        self.active_model = None
+        try:
+            with start_trace("process_interview") as trace:
+                with span("analysis", tier=tier):
+                    transcript, metrics, duration, error = self._run_pipeline(
+                        audio_path, difficulty, tier, progress, question, persona
+                    )
+        except AnalysisCancelled:
+            ANALYSES.inc(tier=tier, outcome="cancelled", fallback=self._fell_back(tier))
+            raise
+
+        ANALYSES.inc(tier=tier, outcome="error" if error else "ok", fallback=self._fell_back(tier))
+        if metrics is not None:
+            for stage, seconds in metrics.get("timings", {}).items():
+                STAGE_LATENCY.observe(seconds, stage=stage)
+            AUDIO_DURATION.observe(metrics.get("duration", 0))
+            if trace is not None:
+                metrics["trace"] = trace.waterfall()
+        return transcript, metrics, duration, error
+
+    def _fell_back(self, tier):
+        """'true' when the OOM fallback served a different model than the tier asked for."""
+        return str(self.active_model is not None and self.active_model != self.resolve_model(tier)).lower()
+
+    def _run_pipeline(self, audio_path, difficulty, tier, progress, question, persona):
+        report = progress or (lambda stage, fraction: None)
+        timings = {}
+
+        # In-memory uploads (AudioBlob) skip the disk entirely
+        if not isinstance(audio_path, AudioBlob) and not os.path.exists(audio_path):
             return None, None, 0, "Error: Audio file not found."
 
+        # Identical audio + settings: serve the previous result without any decoding
+        start_time = time.time()
+        requested_model = self.resolve_model(tier)
+        cache_key = None
+        try:
+            with span("cache_lookup"):
+                cache_key = ResultCache.make_key(
+                    ResultCache.hash_audio(audio_path), requested_model[0], requested_model[2], difficulty, SCORER_VERSION,
+                    options=get_profile(tier).signature()
+                )
+                cached = ResultCache.get(cache_key)
+            if cached:
+                metrics = cached["metrics"]
+                if question and cached["transcript"]:
+                    # The grade depends on the question, so it is never part of the audio cache
+                    report("Grading answer", 0.9)
+                    metrics["star"], timings["llm"] = self._grade_answer(cached["transcript"], question, persona)
+                total_time = time.time() - start_time
+                timings["total"] = total_time
+                metrics["timings"] = timings
+                CACHE_HITS.inc(tier=tier)
+                logger.info(f"Result cache HIT: served in {total_time:.3f}s", extra={"stage": "cache_hit", "timings": timings})
+                return cached["transcript"], metrics, total_time, None
+        except OSError as e:
+            logger.warning(f"Result cache unavailable: {e}")
+
+        # Decode once; the silence check, Whisper and the scorer all share this buffer
+        report("Decoding audio", 0.05)
+        stage_start = time.time()
+        try:
+            audio = decode_audio(audio_path)
+        except Exception as e:
+            return None, None, 0, f"Error reading audio file: {e}"
+        timings["decode"] = time.time() - stage_start
+
         # --- NEW: Instant Dead Air Check ---
-        is_silent, silence_error = self.check_for_silence(audio_path)
+        report("Running silence check", 0.1)
+        stage_start = time.time()
+        is_silent, silence_error = self.check_for_silence(audio)
         if is_silent:
             return None, None, 0, silence_error
+        timings["silence_check"] = time.time() - stage_start
             
         start_time = time.time()
         
         try:
             # Load model (with self-healing)
+            report("Loading model", 0.15)
             model = self.load_model(tier)
+            timings["load_model"] = time.time() - start_time
             
             # Transcribe
+            stage_start = time.time()
             segments, info = model.transcribe(
-                audio_path, 
-                beam_size=5,
-                initial_prompt="Umm, I-I think... well, actually... so your... it will delete."
+                audio.samples, 
+                initial_prompt=INITIAL_PROMPT,
+                **get_profile(tier).transcribe_kwargs()
             )
             
-            full_text = " ".join([seg.text for seg in segments]).strip()
+            # Segments decode lazily, so progress (and cancellation) is per segment
+            segment_list = []
+            with span("transcribe"):
+                for k, seg in enumerate(traced_iter(segments, "transcribe.segment"), start=1):
+                    segment_list.append(_segment_dict(seg))
+                    covered = seg.end / info.duration if info.duration else 0
+                    report(f"Transcribing segment {k} ({covered:.0%} of audio)", 0.2 + 0.7 * covered)
+            full_text = " ".join([seg["text"] for seg in segment_list]).strip()
+            timings["transcribe"] = time.time() - stage_start
+
+            # Post-transcription: STAR grading (LLM) runs while the signal analysis runs here
+            report("Scoring delivery & grading answer", 0.92)
+            grading, stop_grading = None, threading.Event()
+            if question and full_text:
+                # copy_context() carries the current trace into the worker thread
+                grading = _post_executor.submit(contextvars.copy_context().run, self._grade_answer,
+                                                full_text, question, persona, stop_grading)
 
-            # Analyze
-            metrics = self.scorer.analyze_audio(audio_path, full_text, difficulty=difficulty)
+            stage_start = time.time()
+            metrics = self.score_delivery(audio, full_text, difficulty, tier, words=_words(segment_list), language=info.language)
+            timings["acoustic"] = time.time() - stage_start
             
             if metrics.get("error"):
                 logger.error(f"Analysis Error: {metrics['error']}")
+                if grading is not None:
+                    # No report to attach the grade to: don't start it, or stop it and free its LLM slot
+                    stop_grading.set()
+                    grading.cancel()
                 return full_text, None, 0, metrics["error"]
 
+            # Don't cache fallback results under the requested model's key
+            if cache_key and self.active_model == requested_model:
+                ResultCache.put(cache_key, full_text, segment_list, metrics)
+
+            if grading is not None:
+                metrics["star"], timings["llm"] = grading.result()
+
             total_time = time.time() - start_time
-            logger.info(f"Success: Processed in {total_time:.2f}s")
+            timings["total"] = total_time
+            metrics["timings"] = timings
+            logger.info(f"Success: Processed in {total_time:.2f}s (" + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items()) + ")",
+                        extra={"stage": "complete", "timings": timings, "tier": tier})
             
             return full_text, metrics, total_time, None
 
+        except AnalysisCancelled:
+            raise
         except Exception as e:
             logger.error(f"Critical Pipeline Error: {str(e)}")
             return None, None, 0, f"Processing Failed: {str(e)}"
 
-    def check_for_silence(self, audio_path):
+    def _grade_answer(self, transcript, question, persona, cancel=None):
+        """STAR grading via the local LLM; never raises, returns (result, seconds). Setting cancel abandons it."""
+        stage_start = time.time()
+        try:
+            with span("llm.star_grade"):
+                result = get_star_evaluator().evaluate(transcript, question, persona, cancel=cancel)
+        except Exception as e:
+            logger.error(f"LLM Error: {e}")
+            result = {"error": f"AI coach unavailable: {e}"}
+        return result, time.time() - stage_start
+
+    def transcribe_many(self, audios, tier="Balanced", report=None):
+        """
+        Transcribes several DecodedAudio buffers as one batch.
+        Uses faster-whisper's BatchedInferencePipeline when installed; otherwise
+        runs longest-first on a multi-worker model so every core stays busy.
+        Returns ([(text, segments)] in input order, audio-seconds per wall-second).
+        """
+        report = report or (lambda stage, fraction: None)
+        options = get_profile(tier).transcribe_kwargs()
+        model_size, device, compute_type = self.resolve_model(tier)
+        workers = max(1, min(len(audios), max_parallel_workers(model_size, compute_type)))
+        try:
+            model = get_model_pool().get(
+                model_size, device, compute_type, num_workers=workers, cpu_threads=max(1, (os.cpu_count() or 2) // workers)
+            )
+            self.active_model = (model_size, device, compute_type)
+        except RuntimeError:
+            model, workers = self.load_model(tier), 1  # Reuse the single-model OOM fallback
+
+        def run(samples, transcriber, **options):
+            segments, _ = transcriber.transcribe(samples, initial_prompt=INITIAL_PROMPT, **options)
+            segment_list = [_segment_dict(seg) for seg in segments]
+            return " ".join(seg["text"] for seg in segment_list).strip(), segment_list
+
+        # Longest first: the slowest answers start immediately and short ones fill the gaps
+        order = sorted(range(len(audios)), key=lambda i: audios[i].duration, reverse=True)
+        results = [None] * len(audios)
+        start = time.time()
+
+        try:
+            from faster_whisper import BatchedInferencePipeline  # pyright: ignore[reportMissingImports]
+        except ImportError:
+            BatchedInferencePipeline = None
+
+        if BatchedInferencePipeline is not None:
+            pipeline = BatchedInferencePipeline(model=model)
+            for done, i in enumerate(order, start=1):
+                results[i] = run(audios[i].samples, pipeline, batch_size=8, **options)
+                report(f"Transcribed answer {done}/{len(audios)}", 0.1 + 0.7 * done / len(audios))
+        else:
+            # faster-whisper < 1.1: concurrent requests on a multi-worker model
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="round-asr") as pool:
+                futures = {pool.submit(run, audios[i].samples, model, **options): i for i in order}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    report(f"Transcribed answer {done}/{len(audios)}", 0.1 + 0.7 * done / len(audios))
+
+        wall = time.time() - start
+        throughput = sum(a.duration for a in audios) / wall if wall > 0 else 0.0
+        logger.info(f"Batch transcription: {len(audios)} answers, {workers} worker(s), {throughput:.1f} audio-s/s")
+        return results, throughput
+
+    def process_round(self, answers, difficulty="Standard Interview", tier="Balanced", progress=None, persona=None):
+        """
+        Analyzes every answer of a mock-interview round together.
+        answers: [(question, audio_path or AudioBlob)]. Transcription is batched across answers,
+        then results fan back out to per-question scoring and STAR grading.
+        Returns a list of dicts (question, transcript, metrics, duration, error) in input order.
+        """
+        report = progress or (lambda stage, fraction: None)
+        results = [{"question": q, "transcript": None, "metrics": None, "duration": 0, "error": None} for q, _ in answers]
+        start_time = time.time()
+
+        # 1. Decode + silence check per answer
+        report("Decoding answers", 0.02)
+        decoded = {}
+        for i, (_, path) in enumerate(answers):
+            try:
+                audio = decode_audio(path)
+            except Exception as e:
+                results[i]["error"] = f"Error reading audio file: {e}"
+                continue
+            is_silent, silence_error = self.check_for_silence(audio)
+            if is_silent:
+                results[i]["error"] = silence_error
+            else:
+                decoded[i] = audio
+
+        if not decoded:
+            ANALYSES.inc(len(results), tier=tier, outcome="error", fallback="false")
+            return results
+
+        # 2. One batched transcription pass for the whole round
+        indices = list(decoded)
+        transcripts, throughput = self.transcribe_many([decoded[i] for i in indices], tier=tier, report=report)
+
+        # 3. Fan out: STAR grading per answer on the shared pool while acoustic scoring runs here
+        report("Scoring answers", 0.85)
+        grading, stop_grading = {}, {}
+        for i, (text, _) in zip(indices, transcripts):
+            if text:
+                stop_grading[i] = threading.Event()
+                grading[i] = _post_executor.submit(contextvars.copy_context().run, self._grade_answer,
+                                                   text, results[i]["question"], persona, stop_grading[i])
+
+        for i, (text, segments) in zip(indices, transcripts):
+            metrics = self.score_delivery(decoded[i], text, difficulty, tier, words=_words(segments))
+            decoded[i].release_features()  # Spectra aren't needed once the answer is scored
+            results[i]["transcript"] = text
+            if metrics.get("error"):
+                results[i]["error"] = metrics["error"]
+                if i in grading:
+                    stop_grading[i].set()
+                    grading[i].cancel()
+                continue
+            if i in grading:
+                metrics["star"], _ = grading[i].result()
+            metrics["round_throughput"] = round(throughput, 2)
+            results[i]["metrics"] = metrics
+
+        total_time = time.time() - start_time
+        for result in results:
+            result["duration"] = total_time
+            ANALYSES.inc(tier=tier, outcome="error" if result["error"] else "ok", fallback=self._fell_back(tier))
+        logger.info(f"Round processed: {len(answers)} answers in {total_time:.2f}s",
+                    extra={"stage": "round_complete", "duration_s": round(total_time, 3), "tier": tier})
+        return results
+
+    def warm_up(self, tier):
+        """
+        Prefetches a tier's model (and librosa) on a background thread, once per process,
+        so the first Analyze click doesn't pay the load.
+        """
+        with _warm_lock:
+            if tier in _warmed_tiers:
+                return
+            _warmed_tiers.add(tier)
+
+        def _warm():
+            try:
+                start = time.time()
+                self.load_model(tier)
+                import librosa  # pyright: ignore[reportMissingImports]
+                logger.info(f"Warm-up for {tier} finished in {time.time() - start:.2f}s")
+            except Exception as e:
+                logger.warning(f"Warm-up for {tier} failed: {e}")
+                with _warm_lock:
+                    _warmed_tiers.discard(tier)
+
+        threading.Thread(target=_warm, name="model-warmup", daemon=True).start()
+
+    def start_stream(self, difficulty="Standard Interview", tier="Balanced"):
+        """
+        Opens a streaming session that analyzes audio while the candidate is still speaking.
+        Feed chunks with .feed() and call .finalize() on stop.
+        """
+        model = self.load_model(tier)
+        pitch_method = self.scorer.PITCH_METHODS.get(tier, "piptrack")
+        options = get_profile(tier).transcribe_kwargs()
+        options["word_timestamps"] = False  # The live view only needs text
+        return StreamingAnalyzer(model, self.scorer, difficulty=difficulty, pitch_method=pitch_method,
+                                 transcribe_options=options)
+
+    def score_delivery(self, audio, transcript, difficulty, tier, words=None, language="en"):
+        """
+        Acoustic scoring; long recordings go through the block scorer, which bounds the
+        feature arrays (the decoded samples are already held for Whisper).
+        """
+        pitch_method = self.scorer.PITCH_METHODS.get(tier, "piptrack")
+        options = {"difficulty": difficulty, "pitch_method": pitch_method, "words": words, "language": language}
+        if audio.duration >= LONG_RECORDING_S:
+            logger.info(f"Scoring {audio.duration:.0f}s recording in blocks")
+            return analyze_in_blocks(self.scorer, audio, transcript, **options)
+        return self.scorer.analyze_audio(audio, transcript, **options)
+
+    @staticmethod
+    @traced("silence_check")
+    def check_for_silence(audio):
         """
         Fast pre-check to ensure the audio actually contains speech.
         Prevents wasting GPU/CPU resources on empty recordings.
+        Accepts a DecodedAudio buffer or a file path (see decoded_audio.check_for_silence).
         """
-        import librosa
-        import numpy as np
-        
-        try:
-            # Load audio quickly
-            y, sr = librosa.load(audio_path, sr=16000)
-            
-            # Trim leading/trailing silence (top_db=30 is standard threshold)
-            trimmed_audio, _ = librosa.effects.trim(y, top_db=30)
-            
-            # Calculate duration of actual non-silent audio
-            active_duration = len(trimmed_audio) / sr
-            
-            # If there is less than 1.5 seconds of actual sound, reject it
-            if active_duration < 1.5:
-                return True, "Voice recording error: System was not able to hear you clearly. Please check your microphone."
-                
-            return False, None
-            
-        except Exception as e:
-            return True, f"Error reading audio file: {e}"
\ No newline at end of file
+        return check_for_silence(audio)
\ No newline at end of file
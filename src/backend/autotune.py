@@ -0,0 +1,132 @@
+"""
+Decoding-profile auto-tuner.
+Times candidate profiles for a tier on this machine against a reference
+clip and keeps the fastest one whose word error rate stays under target.
+
+    python tune_profiles.py reference.wav --text reference.txt --tier "Balanced (Mid Spec)" --wer 0.1 --save
+
+Without --text, the slowest, most thorough candidate's transcript is used
+as the reference (so WER measures drift from full-quality decoding).
+"""
+import argparse
+import itertools
+import os
+import re
+import time
+from src.backend.decoded_audio import decode_audio
+from src.backend.hardware import get_hardware_info
+from src.backend.model_pool import get_model_pool
+from src.backend.profiles import DEFAULT_PROFILES, DecodingProfile, INTERVIEW_VAD, get_profile, save_profile
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+DEFAULT_WER_TARGET = 0.10
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def candidate_profiles(tier):
+    """Variations of a tier's profile across the knobs that trade accuracy for speed."""
+    base = get_profile(tier)
+    cores = os.cpu_count() or 4
+    computes = sorted({"int8", "int8_float32", get_hardware_info().get_compute_type("cpu")})  # float32 on Apple Silicon
+    candidates = []
+    for beam, compute, vad, threads, conditioned in itertools.product(
+        (1, 3, 5), computes, (True, False), sorted({cores // 2 or 1, cores}), (False, True)
+    ):
+        candidates.append(DecodingProfile.from_dict(tier, {
+            "compute_type": compute, "beam_size": beam, "best_of": beam, "vad_filter": vad,
+            "vad_parameters": INTERVIEW_VAD, "cpu_threads": threads, "num_workers": 1,
+            "condition_on_previous_text": conditioned
+        }, base=base))
+    return candidates
+
+
+def _transcribe(profile, samples, device="cpu"):
+    from src.backend.audio_processor import INITIAL_PROMPT
+
+    model = get_model_pool().get(profile.model_size, device, profile.compute_type, **profile.model_kwargs())
+    warmup, _ = model.transcribe(samples[:16000], **profile.transcribe_kwargs())
+    list(warmup)  # Segments decode lazily: consume them so the kernels really warm up outside the timing
+    start = time.perf_counter()
+    segments, _ = model.transcribe(samples, initial_prompt=INITIAL_PROMPT, **profile.transcribe_kwargs())
+    text = " ".join(seg.text for seg in segments).strip()
+    return text, time.perf_counter() - start
+
+
+def autotune(audio_path, tier, reference_text=None, wer_target=DEFAULT_WER_TARGET, candidates=None):
+    """
+    Benchmarks candidates on the clip. Returns (best_profile or None, results),
+    where results is a list of dicts (profile, seconds, rtf, wer) sorted by speed.
+    """
+    audio = decode_audio(audio_path)
+    candidates = candidates or candidate_profiles(tier)
+
+    if reference_text is None:
+        thorough = max(candidates, key=lambda p: (p.beam_size, p.compute_type == "int8_float32", not p.vad_filter,
+                                                   p.condition_on_previous_text, p.cpu_threads))
+        reference_text, _ = _transcribe(thorough, audio.samples)
+        logger.info(f"Auto-tune: using {thorough!r} output as the reference transcript")
+
+    results = []
+    for k, profile in enumerate(candidates, start=1):
+        try:
+            text, seconds = _transcribe(profile, audio.samples)
+        except Exception as e:
+            logger.warning(f"Auto-tune candidate {k} failed: {e}")
+            continue
+        wer = word_error_rate(reference_text, text)
+        results.append({"profile": profile, "seconds": seconds, "rtf": seconds / audio.duration, "wer": wer})
+        print(f"[{k}/{len(candidates)}] {seconds:6.2f}s  RTF {seconds / audio.duration:.3f}  WER {wer:.3f}  "
+              f"beam={profile.beam_size} {profile.compute_type} vad={profile.vad_filter} "
+              f"threads={profile.cpu_threads} cond={profile.condition_on_previous_text}")
+
+    results.sort(key=lambda r: r["seconds"])
+    best = next((r["profile"] for r in results if r["wer"] <= wer_target), None)
+    logger.info(f"Auto-tune for {tier}: {len(results)} candidates, best={best!r}")
+    return best, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pick the fastest decoding profile that meets a WER target on this machine.")
+    parser.add_argument("audio", help="Reference clip (any format librosa can read)")
+    parser.add_argument("--text", help="File holding the clip's reference transcript")
+    parser.add_argument("--tier", default="Balanced (Mid Spec)", choices=list(DEFAULT_PROFILES))
+    parser.add_argument("--wer", type=float, default=DEFAULT_WER_TARGET, help="Maximum word error rate allowed")
+    parser.add_argument("--save", action="store_true", help="Write the winner to the profile override file")
+    args = parser.parse_args(argv)
+
+    reference = None
+    if args.text:
+        with open(args.text, "r", encoding="utf-8") as f:
+            reference = f.read()
+
+    best, _ = autotune(args.audio, args.tier, reference_text=reference, wer_target=args.wer)
+    if best is None:
+        print(f"No candidate met WER <= {args.wer}; keeping the current profile.")
+        return
+    print(f"Fastest profile under WER {args.wer}: {best!r}")
+    if args.save:
+        save_profile(best)
+        print("Saved to the profile override file.")
+
+
+if __name__ == "__main__":
+    main()
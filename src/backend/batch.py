@@ -0,0 +1,267 @@
+"""
+Headless batch scoring for archived recordings.
+
+Decoding and acoustic feature extraction run in a process pool across all
+cores; transcription runs on a bounded number of Whisper workers sized to
+free RAM. The two stages overlap as a pipeline, and every finished file is
+appended to the output immediately so an interrupted run resumes where it
+stopped.
+
+Usage:  python batch_score.py <dir-or-manifest> -o results.jsonl [--tier ...]
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.model_pool import max_parallel_workers
+from src.backend.profiles import DEFAULT_PROFILES, get_profile
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".ogg", ".flac")
+CSV_FIELDS = ["path", "status", "error", "duration", "wpm", "pause_count", "filler_count", "blunder_count",
+              "pitch_avg", "pitch_var", "energy_avg", "tone_label", "transcript"]
+MAX_DECODE_ATTEMPTS = 2  # A crashed worker breaks every decode pending in its pool; each file gets one retry
+
+
+# --- 1. Inputs & Resume ---
+def collect_inputs(source, default_difficulty):
+    """Returns [(path, difficulty)] from a directory tree or a manifest (.txt paths or .csv with a 'path' column)."""
+    if os.path.isdir(source):
+        items = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    items.append((os.path.join(root, name), default_difficulty))
+        return sorted(items)
+
+    base = os.path.dirname(os.path.abspath(source))
+    def resolve(p): return p if os.path.isabs(p) else os.path.join(base, p)
+
+    if source.lower().endswith(".csv"):
+        with open(source, newline="") as f:
+            return [(resolve(row["path"]), row.get("difficulty") or default_difficulty) for row in csv.DictReader(f)]
+
+    with open(source) as f:
+        return [(resolve(line.strip()), default_difficulty) for line in f if line.strip() and not line.startswith("#")]
+
+
+def load_done(output_path):
+    """Paths already scored successfully, so a restarted run skips them (failed files are retried)."""
+    if not os.path.exists(output_path):
+        return set()
+    done = set()
+    with open(output_path, newline="") as f:
+        if output_path.lower().endswith(".csv"):
+            done = {row["path"] for row in csv.DictReader(f) if not row.get("error")}
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if not record.get("error"):
+                        done.add(record["path"])
+                except (ValueError, KeyError, AttributeError):
+                    continue  # Partial line from a crash
+    return done
+
+
+class ResultWriter:
+    """Appends one record per file and flushes, so nothing is lost on interrupt."""
+    def __init__(self, output_path):
+        self.is_csv = output_path.lower().endswith(".csv")
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self.f = open(output_path, "a", newline="")
+        if self.is_csv:
+            self.writer = csv.DictWriter(self.f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if is_new:
+                self.writer.writeheader()
+
+    def write(self, record):
+        if self.is_csv:
+            self.writer.writerow(record)
+        else:
+            self.f.write(json.dumps(record) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+# --- 2. Stage A: decode + acoustic features (process pool) ---
+def _init_worker():
+    """Imports the signal stack once per spawned worker (not audio_processor, which pulls in the UI)."""
+    import librosa  # pyright: ignore[reportMissingImports]
+    import src.backend.decoded_audio
+    import src.backend.features
+
+
+def extract_features(path, pitch_method):
+    """Runs in a worker process: decode once, silence check, transcript-independent signal features."""
+    from src.backend.decoded_audio import check_for_silence, decode_audio
+
+    try:
+        audio = decode_audio(path)
+        is_silent, silence_error = check_for_silence(audio)
+        if is_silent:
+            return {"path": path, "error": silence_error}
+
+        bank = audio.features  # Shares the RMS already computed by the silence check
+        intervals = bank.split(top_db=25) / audio.sample_rate
+        if float(np.sum(intervals[:, 1] - intervals[:, 0])) < 0.5:
+            return {"path": path, "error": "Audio too short."}
+
+        return {
+            "path": path,
+            "error": None,
+            "samples": audio.samples,
+            "duration": audio.duration,
+            "intervals": intervals,
+            "pitch_values": bank.pitch(pitch_method),
+            "energy_avg": float(np.mean(bank.rms))
+        }
+    except Exception as e:
+        return {"path": path, "error": f"Error reading audio file: {e}"}
+
+
+# --- 3. Stage B: transcription (bounded Whisper workers) ---
+def run_batch(source, output_path, tier="Balanced (Mid Spec)", difficulty="Standard Interview",
+              processes=None, whisper_workers=None):
+    from src.backend.audio_processor import INITIAL_PROMPT, AudioProcessor
+    from src.backend.model_pool import get_model_pool
+
+    processor = AudioProcessor()
+    items = collect_inputs(source, difficulty)
+    done = load_done(output_path)
+    todo = [(p, d) for p, d in items if p not in done]
+    logger.info(f"Batch: {len(items)} inputs, {len(done)} already scored, {len(todo)} to go")
+    print(f"{len(items)} inputs | {len(items) - len(todo)} already done | {len(todo)} to score")
+    if not todo:
+        return
+
+    model_size, device, compute_type = processor.resolve_model(tier)
+    options = get_profile(tier).transcribe_kwargs()
+    workers = whisper_workers or max_parallel_workers(model_size, compute_type)
+    procs = processes or max(1, (os.cpu_count() or 2) - workers)
+    cpu_threads = max(1, (os.cpu_count() or 2) // (2 * workers))
+    model = get_model_pool().get(model_size, device, compute_type, num_workers=workers, cpu_threads=cpu_threads)
+    pitch_method = processor.scorer.PITCH_METHODS.get(tier, "piptrack")
+    print(f"Model {model_size} ({device}/{compute_type}) | {workers} Whisper worker(s) | {procs} decode process(es)")
+
+    def transcribe(features):
+        segments, _ = model.transcribe(features["samples"], initial_prompt=INITIAL_PROMPT, **options)
+        return " ".join(seg.text for seg in segments).strip()
+
+    writer = ResultWriter(output_path)
+    difficulties = dict(todo)
+    queue = iter(todo)
+    max_in_flight = 2 * (procs + workers)  # Bounds decoded buffers held in memory
+    stats = {"ok": 0, "error": 0, "audio_s": 0.0}
+    start = time.perf_counter()
+
+    # Spawn, not fork: by now this process holds the Whisper model and live threads, which fork would copy mid-state
+    spawn = multiprocessing.get_context("spawn")
+    def new_decode_pool():
+        return ProcessPoolExecutor(max_workers=procs, initializer=_init_worker, mp_context=spawn)
+
+    decode_pool = new_decode_pool()
+    attempts = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper") as asr_pool:
+            decoding, transcribing = {}, {}  # decode future -> (path, pool it ran on); transcribe future -> features
+
+            def submit_decode(path):
+                attempts[path] = attempts.get(path, 0) + 1
+                decoding[decode_pool.submit(extract_features, path, pitch_method)] = (path, decode_pool)
+
+            def refill():
+                while len(decoding) + len(transcribing) < max_in_flight:
+                    nxt = next(queue, None)
+                    if nxt is None:
+                        return
+                    submit_decode(nxt[0])
+
+            def finish(record):
+                stats["ok" if record["status"] == "ok" else "error"] += 1
+                writer.write(record)
+                total = stats["ok"] + stats["error"]
+                if total % 10 == 0 or total == len(todo):
+                    print(f"  [{total}/{len(todo)}] ok={stats['ok']} errors={stats['error']}")
+
+            refill()
+            while decoding or transcribing:
+                finished, _ = wait(set(decoding) | set(transcribing), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    if fut in decoding:
+                        path, pool = decoding.pop(fut)
+                        try:
+                            features = fut.result()
+                        except BrokenProcessPool:
+                            # A worker died (native crash, OOM kill): replace the pool once, retry the file once
+                            if pool is decode_pool:
+                                logger.warning("Batch decode worker crashed; starting a new pool")
+                                decode_pool.shutdown(wait=False, cancel_futures=True)
+                                decode_pool = new_decode_pool()
+                            if attempts[path] < MAX_DECODE_ATTEMPTS:
+                                submit_decode(path)
+                            else:
+                                logger.error(f"Batch decode crashed the worker twice on {path}")
+                                finish({"path": path, "status": "error", "error": "Decoding crashed the worker process."})
+                            continue
+                        if features["error"]:
+                            finish({"path": features["path"], "status": "error", "error": features["error"]})
+                        else:
+                            transcribing[asr_pool.submit(transcribe, features)] = features
+                    else:
+                        features = transcribing.pop(fut)
+                        path = features["path"]
+                        try:
+                            transcript = fut.result()
+                            metrics = processor.scorer.score_features(
+                                transcript, features["duration"], features["intervals"],
+                                features["pitch_values"], features["energy_avg"], difficulty=difficulties[path]
+                            )
+                            stats["audio_s"] += features["duration"]
+                            record = {"path": path, "status": "ok", "error": None, "transcript": transcript}
+                            record.update({k: v for k, v in metrics.items() if k not in ("error", "feedback")})
+                            record["feedback"] = metrics["feedback"]
+                            finish(record)
+                        except Exception as e:
+                            logger.error(f"Batch transcription failed for {path}: {e}")
+                            finish({"path": path, "status": "error", "error": f"Processing Failed: {e}"})
+                refill()
+    finally:
+        decode_pool.shutdown()
+
+    writer.close()
+    wall = time.perf_counter() - start
+    total = stats["ok"] + stats["error"]
+    summary = (f"Scored {total} files in {wall:.1f}s | {total / wall:.2f} files/s | "
+               f"{stats['audio_s'] / wall:.1f} audio-s per wall-s | {stats['error']} errors")
+    logger.info(f"Batch complete: {summary}")
+    print(summary)
+
+
+def main(argv=None):
+    from src.backend.scorer import AcousticScorer
+
+    parser = argparse.ArgumentParser(description="Score a directory or manifest of recordings offline.")
+    parser.add_argument("source", help="Directory of recordings, or a .txt/.csv manifest")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Output .jsonl or .csv (appended; enables resume)")
+    parser.add_argument("--tier", default="Balanced (Mid Spec)", choices=list(DEFAULT_PROFILES))
+    parser.add_argument("--difficulty", default="Standard Interview", choices=list(AcousticScorer().THRESHOLDS))
+    parser.add_argument("--processes", type=int, default=None, help="Decode/scoring processes (default: remaining cores)")
+    parser.add_argument("--whisper-workers", type=int, default=None, help="Concurrent transcriptions (default: sized to free RAM)")
+    args = parser.parse_args(argv)
+
+    run_batch(args.source, args.output, tier=args.tier, difficulty=args.difficulty,
+              processes=args.processes, whisper_workers=args.whisper_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Bounded-memory scoring for long recordings.
+Audio is read in fixed-size blocks (soundfile block reads for files, slices for
+an already-decoded buffer) and framed exactly like the feature bank's centred
+framing of the whole signal (2048/512 scaled to the sample rate), so RMS, pitch
+and pause intervals come out the same as the in-memory path while the frames,
+spectra and pitch arrays stay O(block).
+
+Only a file path is O(block) end to end. The app passes the DecodedAudio that
+Whisper already needed in full, so its samples (~3.8 MB per minute at 16 kHz)
+stay O(recording); what the block scorer bounds there is the feature arrays,
+which are many times larger than the samples.
+"""
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.decoded_audio import DecodedAudio
+from src.backend.features import frame_sizes
+from src.utils.tracing import span
+
+SPLIT_TOP_DB = 25    # Same threshold as AcousticScorer.analyze_audio
+DEFAULT_BLOCK_SECONDS = 30.0
+LONG_RECORDING_S = 600  # Recordings at least this long are scored in blocks
+
+
+class RunningStats:
+    """Welford / Chan accumulator: count, mean and population std without keeping values."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+def _read_mono(source, block_samples):
+    """Yields (mono float32 chunk, sample_rate) from a path or a DecodedAudio."""
+    if isinstance(source, DecodedAudio):
+        for start in range(0, len(source.samples), block_samples):
+            yield source.samples[start:start + block_samples], source.sample_rate
+        return
+
+    import soundfile as sf  # pyright: ignore[reportMissingImports]
+    with sf.SoundFile(source) as f:
+        for block in f.blocks(blocksize=block_samples, dtype="float32", always_2d=True):
+            yield block.mean(axis=1), f.samplerate
+
+
+def _sample_rate(source):
+    if isinstance(source, DecodedAudio):
+        return source.sample_rate
+    import soundfile as sf  # pyright: ignore[reportMissingImports]
+    return sf.info(source).samplerate
+
+
+def framed_blocks(source, block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Yields (buffer, first_frame, sample_rate) where buffer holds whole frames that
+    line up with centred framing of the full signal: zero padding is added at both
+    ends and the tail that doesn't complete a frame is carried into the next block.
+    """
+    sr = _sample_rate(source)
+    frame_length, hop_length = frame_sizes(sr)
+    block_samples = max(hop_length, int(block_seconds * sr) // hop_length * hop_length)
+    pad = frame_length // 2
+    carry = np.zeros(pad, dtype=np.float32)
+    first_frame = 0
+
+    def whole_frames(buf):
+        return 1 + (len(buf) - frame_length) // hop_length if len(buf) >= frame_length else 0
+
+    for chunk, _ in _read_mono(source, block_samples):
+        buf = np.concatenate([carry, chunk])
+        n = whole_frames(buf)
+        if n:
+            yield buf[:(n - 1) * hop_length + frame_length], first_frame, sr
+            first_frame += n
+        carry = buf[n * hop_length:]
+
+    buf = np.concatenate([carry, np.zeros(pad, dtype=np.float32)])
+    n = whole_frames(buf)
+    if n:
+        yield buf[:(n - 1) * hop_length + frame_length], first_frame, sr
+
+
+def _frame_rms(buf, sr):
+    frame_length, hop_length = frame_sizes(sr)
+    frames = np.lib.stride_tricks.sliding_window_view(buf, frame_length)[::hop_length]
+    return np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+
+
+def _pitch_block(buf, sr, method, voiced_floor):
+    """Voiced 50-300 Hz F0 values for one framed block (same rules as AcousticScorer.extract_pitch)."""
+    import librosa  # pyright: ignore[reportMissingImports]
+
+    frame_length, hop_length = frame_sizes(sr)
+    if method == "yin":
+        f0 = librosa.yin(buf, fmin=50, fmax=300, sr=sr, frame_length=frame_length, hop_length=hop_length, center=False)
+        rms = _frame_rms(buf, sr)
+        n = min(len(f0), len(rms))
+        f0, rms = f0[:n], rms[:n]
+        return f0[(rms > voiced_floor) & (f0 > 50) & (f0 < 300)]
+
+    pitches, magnitudes = librosa.piptrack(y=buf, sr=sr, n_fft=frame_length, hop_length=hop_length, center=False)
+    best = magnitudes.argmax(axis=0)[np.newaxis, :]
+    f0 = np.take_along_axis(pitches, best, axis=0)[0]
+    return f0[(f0 > 50) & (f0 < 300)]
+
+
+def extract_block_features(source, pitch_method="piptrack", block_seconds=DEFAULT_BLOCK_SECONDS):
+    """
+    Two bounded passes over the audio.
+    Pass 1: total length, RMS mean and the loudest frame (the split/voicing reference).
+    Pass 2: pause intervals (silence state carried across blocks) and pitch statistics.
+    Returns (total_duration, speech_intervals_sec, pitch RunningStats, energy_avg).
+    """
+    rms_sum, rms_frames, rms_max, sr = 0.0, 0, 0.0, None
+    with span("score.blocks.pass1"):
+        for buf, _, sr in framed_blocks(source, block_seconds):
+            rms = _frame_rms(buf, sr)
+            rms_sum += float(rms.sum())
+            rms_frames += len(rms)
+            rms_max = max(rms_max, float(rms.max()))
+
+    if sr is None or rms_frames == 0:
+        return 0.0, [], RunningStats(), 0.0
+
+    total_samples = len(source.samples) if isinstance(source, DecodedAudio) else _file_frames(source)
+    total_duration = total_samples / sr
+
+    threshold = rms_max * 10 ** (-SPLIT_TOP_DB / 20)
+    pitch = RunningStats()
+    intervals = []
+    speech_start = None
+    last_frame = 0
+    with span("score.blocks.pass2", method=pitch_method):
+        for buf, first_frame, sr in framed_blocks(source, block_seconds):
+            loud = _frame_rms(buf, sr) > threshold
+            # Edges of non-silent runs, carrying the open run across block boundaries
+            for k in np.flatnonzero(np.diff(np.concatenate([[speech_start is not None], loud]).astype(np.int8))):
+                frame = first_frame + k
+                if speech_start is None:
+                    speech_start = frame
+                else:
+                    intervals.append((speech_start, frame))
+                    speech_start = None
+            last_frame = first_frame + len(loud)
+            pitch.update(_pitch_block(buf, sr, pitch_method, threshold))
+
+    if speech_start is not None:
+        intervals.append((speech_start, last_frame))
+
+    # Frames -> samples -> seconds, clipped to the signal like librosa.effects.split
+    hop_length = frame_sizes(sr)[1]
+    seconds = [(min(a * hop_length, total_samples) / sr, min(b * hop_length, total_samples) / sr) for a, b in intervals]
+    return total_duration, seconds, pitch, rms_sum / rms_frames
+
+
+def _file_frames(path):
+    import soundfile as sf  # pyright: ignore[reportMissingImports]
+    return sf.info(path).frames
+
+
+def analyze_in_blocks(scorer, source, transcript, difficulty="Standard Interview", pitch_method="piptrack",
+                      block_seconds=DEFAULT_BLOCK_SECONDS, words=None, language="en"):
+    """Block-streaming counterpart of AcousticScorer.analyze_audio (file path or DecodedAudio)."""
+    metrics = scorer._empty_metrics()
+    try:
+        total_duration, intervals, pitch, energy_avg = extract_block_features(source, pitch_method, block_seconds)
+        metrics["duration"] = round(total_duration, 2)
+        if sum(end - start for start, end in intervals) < 0.5:
+            metrics["error"] = "Audio too short."
+            return metrics
+        with span("score.features"):
+            return scorer.score_features(transcript, total_duration, intervals, None, energy_avg,
+                                         difficulty=difficulty, pitch_stats=pitch, words=words, language=language)
+    except Exception as e:
+        metrics["error"] = f"Analysis Failed: {str(e)}"
+        return metrics
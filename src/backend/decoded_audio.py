@@ -0,0 +1,88 @@
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.utils.tracing import traced
+
+# faster-whisper works natively at 16 kHz mono, so every stage shares that format.
+TARGET_SR = 16000
+
+# Loudest frame below -60 dBFS means nothing was picked up (the trim threshold alone is relative to the clip's own peak)
+SILENCE_FLOOR_RMS = 10 ** (-60 / 20)
+SILENCE_ERROR = "Voice recording error: System was not able to hear you clearly. Please check your microphone."
+
+
+class DecodedAudio:
+    """
+    A recording decoded once into a 16 kHz mono float32 buffer.
+    Passed through the silence check, transcription and scoring so the
+    file is never read or resampled more than once per analysis.
+    """
+    def __init__(self, samples, sample_rate=TARGET_SR, source=None, native_sr=None):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.source = source
+        self.native_sr = native_sr
+        self._features = None
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def features(self):
+        """FeatureBank shared by every stage that looks at this recording (framed and FFT'd at most once)."""
+        if self._features is None:
+            from src.backend.features import FeatureBank
+            self._features = FeatureBank(self.samples, self.sample_rate)
+        return self._features
+
+    def release_features(self):
+        if self._features is not None:
+            self._features.release()
+
+    def __repr__(self):
+        return f"DecodedAudio(source={self.source!r}, duration={self.duration:.2f}s, sr={self.sample_rate})"
+
+
+@traced("decode")
+def decode_audio(audio_path, sr=TARGET_SR):
+    """Reads and resamples a file (or an in-memory AudioBlob) exactly once. Raises on unreadable audio."""
+    from src.backend.ingest import AudioBlob
+    if isinstance(audio_path, AudioBlob):
+        return audio_path.decode(sr)
+
+    import librosa  # pyright: ignore[reportMissingImports]
+
+    try:
+        native_sr = librosa.get_samplerate(audio_path)
+    except Exception:
+        native_sr = None  # Compressed formats routed through audioread don't expose it cheaply
+
+    y, sr = librosa.load(audio_path, sr=sr, mono=True)
+    return DecodedAudio(y, sample_rate=sr, source=audio_path, native_sr=native_sr)
+
+
+def check_for_silence(audio):
+    """
+    Returns (is_silent, error). Rejects recordings without 1.5 s of sound.
+    Kept free of the app's UI imports so batch decode workers can run it.
+    """
+    try:
+        # Reuse the decoded buffer when the pipeline already has one
+        if not isinstance(audio, DecodedAudio):
+            audio = decode_audio(audio)
+
+        # A muted or unplugged mic: even the loudest frame is background hiss
+        rms = audio.features.rms
+        if not rms.size or float(rms.max()) < SILENCE_FLOOR_RMS:
+            return True, SILENCE_ERROR
+
+        # Trim leading/trailing silence (top_db=30 is standard threshold); the RMS is kept for scoring
+        start, end = audio.features.trim_span(top_db=30)
+
+        # If there is less than 1.5 seconds of actual sound, reject it
+        if (end - start) / audio.sample_rate < 1.5:
+            return True, SILENCE_ERROR
+
+        return False, None
+
+    except Exception as e:
+        return True, f"Error reading audio file: {e}"
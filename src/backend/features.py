@@ -0,0 +1,189 @@
+"""
+Per-recording feature bank.
+The signal is framed once (librosa's centred 2048/512 framing, scaled to the
+sample rate) and given at most one STFT. RMS, the dB levels behind silence splitting/trimming, pitch
+and any registered extra feature are derived from those shared arrays and
+memoized, so each new metric only pays for its own arithmetic.
+"""
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+FRAME_LENGTH = 2048  # librosa defaults for rms / stft / piptrack / yin / split...
+HOP_LENGTH = 512
+REFERENCE_SR = 44100  # ...at the native rate the metric thresholds were tuned on
+AMIN = 1e-5          # Floor used by librosa.amplitude_to_db
+VOICE_BAND = (50, 300)
+
+# name -> fn(bank); see @feature below
+FEATURES = {}
+
+
+def frame_sizes(sr):
+    """
+    (frame_length, hop_length) in samples at sr, covering the same time as
+    2048/512 at REFERENCE_SR (~46/12 ms). Fixed sample counts would make the
+    16 kHz shared buffer use 2.8x longer windows and finer FFT bins, shifting
+    pitch and energy away from the native-rate values.
+    """
+    scale = sr / REFERENCE_SR
+    return max(1, round(FRAME_LENGTH * scale)), max(1, round(HOP_LENGTH * scale))
+
+
+def feature(name):
+    """Registers a derived feature, computed on first use and cached per recording."""
+    def register(fn):
+        FEATURES[name] = fn
+        return fn
+    return register
+
+
+class FeatureBank:
+    """
+    Lazily computed features of one recording. Built by DecodedAudio.features
+    (so the silence check, scorer and batch workers share it) or directly from
+    a sample buffer.
+    """
+    def __init__(self, y, sr, frame_length=None, hop_length=None):
+        self.y = y
+        self.sr = sr
+        default_frame, default_hop = frame_sizes(sr)
+        self.frame_length = frame_length or default_frame
+        self.hop_length = hop_length or default_hop
+        self._cache = {}
+
+    def get(self, name):
+        if name not in self._cache:
+            self._cache[name] = FEATURES[name](self)
+        return self._cache[name]
+
+    def release(self):
+        """Drops the cached arrays (the spectra are the big ones)."""
+        self._cache.clear()
+
+    @property
+    def rms(self):
+        return self.get("rms")
+
+    @property
+    def magnitude(self):
+        return self.get("magnitude")
+
+    def frames(self):
+        """(n_frames, frame_length) strided view over the zero-padded signal (the padded copy is not cached)."""
+        pad = self.frame_length // 2
+        padded = np.pad(self.y, pad, mode="constant")
+        return np.lib.stride_tricks.sliding_window_view(padded, self.frame_length)[::self.hop_length]
+
+    def non_silent(self, top_db):
+        return self.get("db") > -top_db
+
+    def split(self, top_db=25):
+        """Non-silent [start, end) sample intervals, identical to librosa.effects.split(y, top_db, ref=np.max)."""
+        loud = self.non_silent(top_db).astype(np.int8)
+        edges = [np.flatnonzero(np.diff(loud)) + 1]
+        if loud.size and loud[0]:
+            edges.insert(0, [0])
+        if loud.size and loud[-1]:
+            edges.append([len(loud)])
+        edges = np.minimum(np.concatenate(edges).astype(int) * self.hop_length, len(self.y))
+        return edges.reshape((-1, 2))
+
+    def trim_span(self, top_db=30):
+        """(start, end) samples that librosa.effects.trim(y, top_db) would keep."""
+        loud = np.flatnonzero(self.non_silent(top_db))
+        if not loud.size:
+            return 0, 0
+        return int(loud[0]) * self.hop_length, min(len(self.y), (int(loud[-1]) + 1) * self.hop_length)
+
+    def pitch(self, method="piptrack"):
+        """Voiced F0 values (Hz) inside the 50-300 Hz band."""
+        return self.get("pitch_yin" if method == "yin" else "pitch_piptrack")
+
+
+# --- 1. Shared Representations ---
+@feature("rms")
+def _rms(bank):
+    frames = bank.frames()
+    # Row-wise dot products read the strided view directly instead of squaring a full copy
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / bank.frame_length)
+
+
+@feature("db")
+def _db(bank):
+    """RMS in dB relative to the loudest frame (what split/trim threshold on)."""
+    rms = bank.rms
+    ref = max(AMIN, float(rms.max())) if rms.size else AMIN
+    return 20 * np.log10(np.maximum(AMIN, rms)) - 20 * np.log10(ref)
+
+
+@feature("magnitude")
+def _magnitude(bank):
+    import librosa  # pyright: ignore[reportMissingImports]
+    return np.abs(librosa.stft(bank.y, n_fft=bank.frame_length, hop_length=bank.hop_length, center=True, pad_mode="constant"))
+
+
+# --- 2. Pitch ---
+@feature("f0")
+def _f0(bank):
+    """Strongest piptrack peak per frame (0 where piptrack finds none)."""
+    import librosa  # pyright: ignore[reportMissingImports]
+    pitches, magnitudes = librosa.piptrack(S=bank.magnitude, sr=bank.sr, n_fft=bank.frame_length, hop_length=bank.hop_length)
+    best = magnitudes.argmax(axis=0)[np.newaxis, :]
+    return np.take_along_axis(pitches, best, axis=0)[0]
+
+
+@feature("pitch_piptrack")
+def _pitch_piptrack(bank):
+    f0 = bank.get("f0")
+    return f0[(f0 > VOICE_BAND[0]) & (f0 < VOICE_BAND[1])]
+
+
+@feature("pitch_yin")
+def _pitch_yin(bank):
+    """YIN over the voice band; quiet frames are masked with the shared RMS (same 25 dB floor as the splitter)."""
+    import librosa  # pyright: ignore[reportMissingImports]
+    f0 = librosa.yin(bank.y, fmin=VOICE_BAND[0], fmax=VOICE_BAND[1], sr=bank.sr,
+                     frame_length=bank.frame_length, hop_length=bank.hop_length)
+    rms = bank.rms
+    n = min(len(f0), len(rms))
+    if n == 0:
+        return f0[:0]
+    f0, rms = f0[:n], rms[:n]
+    voiced = rms > np.max(rms) * 10 ** (-25 / 20)
+    return f0[voiced & (f0 > VOICE_BAND[0]) & (f0 < VOICE_BAND[1])]
+
+
+# --- 3. Extra Voice Features (not scored yet; each reuses the arrays above) ---
+@feature("spectral_centroid")
+def _spectral_centroid(bank):
+    import librosa  # pyright: ignore[reportMissingImports]
+    return librosa.feature.spectral_centroid(S=bank.magnitude, sr=bank.sr, n_fft=bank.frame_length, hop_length=bank.hop_length)[0]
+
+
+def _voiced_pairs(bank):
+    """Mask of consecutive frame pairs that are both voiced (piptrack F0 in the voice band)."""
+    f0 = bank.get("f0")
+    voiced = (f0 > VOICE_BAND[0]) & (f0 < VOICE_BAND[1])
+    return voiced[1:] & voiced[:-1]
+
+
+@feature("jitter")
+def _jitter(bank):
+    """Frame-level jitter: mean change of the period between consecutive voiced frames, relative to the mean period."""
+    f0 = bank.get("f0")
+    pairs = _voiced_pairs(bank)
+    if not pairs.any():
+        return 0.0
+    period = 1.0 / np.where(f0 > 0, f0, np.inf)
+    return float(np.mean(np.abs(np.diff(period))[pairs]) / np.mean(period[1:][pairs]))
+
+
+@feature("shimmer")
+def _shimmer(bank):
+    """Frame-level shimmer: mean change of RMS amplitude between consecutive voiced frames, relative to the mean."""
+    rms = bank.rms
+    pairs = _voiced_pairs(bank)
+    n = min(len(rms) - 1, len(pairs))
+    pairs = pairs[:n]
+    if n <= 0 or not pairs.any():
+        return 0.0
+    return float(np.mean(np.abs(np.diff(rms[:n + 1]))[pairs]) / np.mean(rms[1:n + 1][pairs]))
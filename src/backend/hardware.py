@@ -1,15 +1,73 @@
+import json
+import os
 import platform
-import torch
-import cpuinfo
+import shutil
+import sys
+import threading
 import psutil
 
+# Probe results are reused across restarts while the machine fingerprint is unchanged.
+# Stored with the other machine settings, outside temp_data, so the privacy purge leaves it alone.
+PROBE_CACHE_FILE = os.path.join("config", "hardware_probe.json")
+
+
+def _fingerprint():
+    """Cheap identity of this machine; any change forces a fresh probe."""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "total_ram": psutil.virtual_memory().total,
+        "python": sys.version.split()[0],
+        "nvidia_smi": bool(shutil.which("nvidia-smi"))
+    }
+
+
+def _probe():
+    """The slow part: cpuinfo spawns a subprocess and torch takes seconds to import."""
+    import cpuinfo
+    import torch
+
+    probe = {"cpu_info": cpuinfo.get_cpu_info()['brand_raw'], "has_nvidia": torch.cuda.is_available(), "vram_gb": 0.0}
+    if probe["has_nvidia"]:
+        try:
+            probe["vram_gb"] = torch.cuda.get_device_properties(0).total_memory / (1024**3)
+        except: pass
+    return probe
+
+
+def _load_probe(use_disk_cache=True):
+    fingerprint = _fingerprint()
+    if use_disk_cache and os.path.exists(PROBE_CACHE_FILE):
+        try:
+            with open(PROBE_CACHE_FILE, "r") as f:
+                saved = json.load(f)
+            if saved.get("fingerprint") == fingerprint:
+                return saved["probe"]
+        except Exception:
+            pass
+
+    probe = _probe()
+    if use_disk_cache:
+        try:
+            os.makedirs(os.path.dirname(PROBE_CACHE_FILE), exist_ok=True)
+            with open(PROBE_CACHE_FILE, "w") as f:
+                json.dump({"fingerprint": fingerprint, "probe": probe}, f)
+        except OSError:
+            pass
+    return probe
+
+
 class HardwareInfo:
-    def __init__(self):
+    def __init__(self, use_disk_cache=True):
+        probe = _load_probe(use_disk_cache)
         self.os_name = platform.system()
-        self.cpu_info = cpuinfo.get_cpu_info()['brand_raw']
-        self.has_nvidia = torch.cuda.is_available()
+        self.cpu_info = probe["cpu_info"]
+        self.has_nvidia = probe["has_nvidia"]
+        self.vram_gb = probe["vram_gb"]
         self.is_apple_silicon = platform.processor() == 'arm' and self.os_name == 'Darwin'
-        
+
         # Get Total RAM for recommendations
         self.total_ram_gb = psutil.virtual_memory().total / (1024**3)
 
@@ -18,17 +76,13 @@ class HardwareInfo:
         Returns the recommended Tier based on specs.
         """
         # 1. High-End: NVIDIA GPU with >4GB VRAM
-        if self.has_nvidia:
-            try:
-                vram = torch.cuda.get_device_properties(0).total_memory / (1024**3)
-                if vram >= 4:
-                    return "Pro (High Spec)", "🟢 NVIDIA GPU detected. Pro (High Spec) ready."
-            except: pass
+        if self.has_nvidia and self.vram_gb >= 4:
+            return "Pro (High Spec)", "🟢 NVIDIA GPU detected. Pro (High Spec) ready."
 
         # 2. Mid-Range: Apple Silicon OR >12GB RAM
         if self.is_apple_silicon:
             return "Balanced (Mid Spec)", "🟢 Apple Silicon detected. Optimized for Neural Engine. Balanced recommended but do give Pro Mode a try if your computer can handle it."
-        
+
         if self.total_ram_gb >= 12:
             return "Balanced (Mid Spec)", "🟡 Good RAM amount (12GB+). Balanced Mode recommended."
 
@@ -42,4 +96,17 @@ class HardwareInfo:
     def get_compute_type(self, device):
         if device == "cuda": return "float16"
         if self.is_apple_silicon: return "float32"
-        return "int8"
\ No newline at end of file
+        return "int8"
+
+
+_hardware = None
+_hardware_lock = threading.Lock()
+
+def get_hardware_info():
+    """Probes the hardware once per process; every rerun and session shares the result."""
+    global _hardware
+    if _hardware is None:
+        with _hardware_lock:
+            if _hardware is None:
+                _hardware = HardwareInfo()
+    return _hardware
@@ -0,0 +1,227 @@
+"""
+In-memory ingest for uploads and live recordings.
+The browser payload is kept as one immutable bytes object and decoded
+straight from memory (soundfile for WAV/FLAC/OGG/MP3, PyAV for m4a and
+anything libsndfile can't read), so an answer never round-trips through
+disk. Writing the audio out is optional and happens on a background writer,
+under a content-hash filename: re-uploads of the same audio share one file
+and different uploads with the same name never collide.
+"""
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.backend.decoded_audio import TARGET_SR, DecodedAudio, decode_audio
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+AUDIO_DIR = os.path.join("temp_data", "audio")
+KEEP_AUDIO = os.environ.get("COACH_KEEP_AUDIO", "0") == "1"  # Persist every answer (off: memory only)
+
+MIME_TYPES = {
+    ".wav": "audio/wav", ".mp3": "audio/mpeg", ".m4a": "audio/mp4", ".mp4": "audio/mp4",
+    ".ogg": "audio/ogg", ".flac": "audio/flac", ".webm": "audio/webm"
+}
+# Containers libsndfile never reads; skip straight to PyAV
+AV_ONLY_EXTENSIONS = {".m4a", ".mp4", ".aac", ".webm"}
+
+
+# --- 1. Decoders ---
+def _read_soundfile(data):
+    """(float32 samples, native rate); samples are (frames,) or (frames, channels)."""
+    import soundfile as sf  # pyright: ignore[reportMissingImports]
+    with sf.SoundFile(io.BytesIO(data)) as f:  # BytesIO over bytes shares the buffer, no copy
+        return f.read(dtype="float32"), f.samplerate
+
+
+def _read_av(data):
+    """PyAV (already installed with faster-whisper) for m4a/aac and other compressed containers."""
+    import av  # pyright: ignore[reportMissingImports]
+    import numpy as np  # pyright: ignore[reportMissingImports]
+
+    with av.open(io.BytesIO(data), mode="r") as container:
+        stream = container.streams.audio[0]
+        # Planar float at the native rate and layout; down-mixing and resampling stay with librosa
+        resampler = av.AudioResampler(format="fltp", layout=stream.layout.name, rate=stream.rate)
+        chunks = []
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray())
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray())
+        rate = stream.rate
+    if not chunks:
+        raise ValueError("No audio frames in the upload.")
+    return np.concatenate(chunks, axis=1).T, rate  # (frames, channels) like soundfile
+
+
+def _to_decoded(samples, native_sr, sr, source):
+    """Same mono mix and resampler as librosa.load, so results match the path-based decode."""
+    import librosa  # pyright: ignore[reportMissingImports]
+    y = samples.mean(axis=1) if samples.ndim > 1 else samples
+    if native_sr != sr:
+        y = librosa.resample(y, orig_sr=native_sr, target_sr=sr)
+    return DecodedAudio(y, sample_rate=sr, source=source, native_sr=native_sr)
+
+
+# --- 2. Blob ---
+class AudioBlob:
+    """
+    One recording held in memory. `digest` is the SHA-256 of its bytes (the
+    same value ResultCache.hash_audio gives the file), computed once.
+    Pass it anywhere the pipeline accepts an audio path.
+    """
+    def __init__(self, data, name="recording.wav"):
+        # Uploads already hand over bytes; other buffers are frozen with a single copy
+        self.data = data if isinstance(data, bytes) else bytes(data)
+        self.name = name or "recording.wav"
+        self.suffix = os.path.splitext(self.name)[1].lower() or ".wav"
+        self.path = None  # Set once persisted
+        self._digest = None
+
+    @classmethod
+    def from_upload(cls, uploaded_file, default_name="recording.wav"):
+        """From a Streamlit UploadedFile (file_uploader or audio_input). None when the payload is empty."""
+        data = uploaded_file.getvalue()  # The widget's own bytes object; no copy
+        if not data:
+            return None
+        return cls(data, getattr(uploaded_file, "name", None) or default_name)
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def mime(self):
+        return MIME_TYPES.get(self.suffix, "audio/wav")
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+    def open(self):
+        """Fresh read-only file object over the bytes (each caller gets its own cursor)."""
+        return io.BytesIO(self.data)
+
+    def duration(self):
+        """Cheap header probe; None when neither soundfile nor PyAV can tell."""
+        try:
+            import soundfile as sf  # pyright: ignore[reportMissingImports]
+            return sf.info(self.open()).duration
+        except Exception:
+            pass
+        try:
+            import av  # pyright: ignore[reportMissingImports]
+            with av.open(self.open(), mode="r") as container:
+                if container.duration:
+                    return container.duration / av.time_base
+        except Exception:
+            pass
+        return None
+
+    def decode(self, sr=TARGET_SR):
+        """DecodedAudio straight from memory. Falls back to persisting and decoding the file."""
+        source = f"memory:{self.name}"
+        if self.suffix not in AV_ONLY_EXTENSIONS:
+            try:
+                samples, native_sr = _read_soundfile(self.data)
+                return _to_decoded(samples, native_sr, sr, source)
+            except Exception as e:
+                logger.debug(f"soundfile could not read {self.name}: {e}")
+        try:
+            samples, native_sr = _read_av(self.data)
+            return _to_decoded(samples, native_sr, sr, source)
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.debug(f"PyAV could not read {self.name}: {e}")
+
+        # Last resort: librosa's audioread backend only takes real files
+        logger.info(f"Decoding {self.name} from disk (no in-memory decoder for {self.suffix})")
+        return decode_audio(self.persist().result(), sr=sr)
+
+    def persist(self):
+        """Future for the on-disk copy (written in the background, once per content hash)."""
+        return get_audio_store().save(self)
+
+    def __repr__(self):
+        return f"AudioBlob(name={self.name!r}, size={self.size}, suffix={self.suffix!r})"
+
+
+# --- 3. Optional persistence ---
+class AudioStore:
+    """
+    Content-addressed audio files written by one background thread.
+    The same bytes always map to the same file, so duplicates are never
+    stored twice and concurrent saves of one blob share a single write.
+    """
+    def __init__(self, store_dir=AUDIO_DIR):
+        self.store_dir = store_dir
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-store")
+
+    def path_for(self, blob):
+        return os.path.join(self.store_dir, blob.digest[:32] + blob.suffix)
+
+    def save(self, blob):
+        path = self.path_for(blob)
+        if os.path.exists(path):
+            blob.path = path
+            future = Future()
+            future.set_result(path)
+            return future
+        with self._lock:
+            future = self._inflight.get(path)
+            if future is None:
+                future = self._executor.submit(self._write, path, blob.data)
+                self._inflight[path] = future
+                future.add_done_callback(lambda _: self._forget(path))
+        future.add_done_callback(lambda f: setattr(blob, "path", path) if not f.exception() else None)
+        return future
+
+    def _forget(self, path):
+        with self._lock:
+            self._inflight.pop(path, None)
+
+    def _write(self, path, data):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = path + ".part"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # Readers never see a half-written file
+        except OSError as e:
+            logger.error(f"Could not persist audio {os.path.basename(path)}: {e}")
+            raise
+        return path
+
+    @staticmethod
+    def purge(store_dir=AUDIO_DIR):
+        """Deletes persisted answers (Privacy Feature). Returns the number of files removed."""
+        deleted = 0
+        if os.path.exists(store_dir):
+            for name in os.listdir(store_dir):
+                try:
+                    os.remove(os.path.join(store_dir, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_audio_store():
+    """Process-wide store, so sessions uploading the same audio share one file and one writer."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AudioStore()
+    return _store
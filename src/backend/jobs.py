@@ -0,0 +1,223 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from src.backend.admission import audio_duration, get_admission_controller
+from src.backend.audio_processor import AnalysisCancelled
+from src.utils.diagnostics import get_logger, job_context
+
+logger = get_logger()
+
+# Concurrent analyses allowed per tier; bigger models get fewer slots.
+TIER_CONCURRENCY = {
+    "Eco (Low Spec)": 4,
+    "Balanced (Mid Spec)": 2,
+    "Pro (High Spec)": 1
+}
+
+MAX_FINISHED_JOBS = 200  # Finished jobs kept around for polling before being pruned
+
+
+class Job:
+    """State of one queued analysis, safe to read from any Streamlit session."""
+    def __init__(self, tier):
+        self.id = uuid.uuid4().hex[:12]
+        self.tier = tier
+        self.state = "queued"  # queued -> waiting (admission) -> running -> done | failed | cancelled
+        self.stage = "Queued"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.notice = None  # User-facing note, e.g. an admission downgrade
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed", "cancelled")
+
+    @property
+    def wait_time(self):
+        return (self.started_at or time.time()) - self.submitted_at
+
+    def cancel(self):
+        self._cancel.set()
+
+    def finish(self, state, stage, error=None):
+        """Terminal transition. State is written last, so anyone who sees `finished` also sees finished_at and the error."""
+        self.finished_at = time.time()
+        if error is not None:
+            self.error = error
+        self.stage = stage
+        self.state = state
+
+    def report(self, stage, progress):
+        """Progress hook handed to the pipeline; also the cancellation checkpoint."""
+        if self._cancel.is_set():
+            raise AnalysisCancelled(f"Job {self.id} cancelled during '{stage}'.")
+        self.stage = stage
+        self.progress = max(0.0, min(1.0, progress))
+
+
+class JobManager:
+    """
+    Runs analyses off the Streamlit script thread.
+    Each tier has its own worker pool so a long Pro transcription can't
+    starve Eco users, and every job reports stage progress for polling.
+    """
+    def __init__(self, tier_concurrency=None):
+        self.tier_concurrency = tier_concurrency or TIER_CONCURRENCY
+        self._executors = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wait_times = []
+
+    def _executor(self, tier):
+        if tier not in self._executors:
+            workers = self.tier_concurrency.get(tier, 1)
+            self._executors[tier] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"job-{tier.split()[0].lower()}")
+        return self._executors[tier]
+
+    def submit_analysis(self, processor, audio_path, difficulty, tier, **pipeline_kwargs):
+        """Queues process_interview (extra kwargs such as question/persona pass through) and returns the job ID immediately."""
+        def work(job):
+            transcript, metrics, duration, error = processor.process_interview(
+                audio_path, difficulty=difficulty, tier=job.tier, progress=job.report, **pipeline_kwargs
+            )
+            return (transcript, metrics, duration), error
+        return self._submit(tier, work, lambda: audio_duration(audio_path))
+
+    def submit_round(self, processor, answers, difficulty, tier, **pipeline_kwargs):
+        """Queues process_round for a whole mock-interview round; the result is the list of per-answer dicts."""
+        def work(job):
+            results = processor.process_round(answers, difficulty=difficulty, tier=job.tier, progress=job.report, **pipeline_kwargs)
+            failed = [r for r in results if r["error"]]
+            return results, (failed[0]["error"] if len(failed) == len(results) else None)
+        # Answers are transcribed one pass at a time, so the longest one sizes the working set
+        return self._submit(tier, work, lambda: max((audio_duration(path) for _, path in answers), default=0.0))
+
+    def _submit(self, tier, work, audio_seconds):
+        job = Job(tier)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            executor = self._executor(tier)
+        executor.submit(self._run, job, self._admit, work, audio_seconds)
+        logger.info(f"Job {job.id} queued ({tier}); queue depth {self.stats()['queue_depth']}")
+        return job.id
+
+    def _run(self, job, step, *args):
+        with job_context(job.id):  # Every log line from this job (and its helper threads) carries its ID
+            step(job, *args)
+
+    def _admit(self, job, work, audio_seconds):
+        """First stop on the requested tier's pool: the memory check, which may wait, downgrade or refuse."""
+        if job._cancel.is_set():
+            with self._lock:
+                job.finish("cancelled", "Cancelled")
+            return
+
+        job.state = "waiting"
+        admission = get_admission_controller()
+        outcome = None
+        try:
+            decision = admission.admit(job.id, job.tier, audio_seconds(),
+                                       on_wait=lambda d: job.report("Waiting for free memory", 0.0))
+            if decision.action == "reject":
+                outcome = ("failed", "Failed", decision.message)
+        except AnalysisCancelled as e:
+            logger.info(str(e))
+            outcome = ("cancelled", "Cancelled", None)
+        except Exception as e:
+            logger.error(f"Job {job.id} crashed: {e}")
+            outcome = ("failed", "Failed", f"Processing Failed: {e}")
+        if outcome is not None:
+            admission.release(job.id)
+            with self._lock:
+                job.finish(*outcome)
+            return
+
+        if decision.action == "downgrade" and decision.tier != job.tier:
+            # Runs on the cheaper tier's pool (and its concurrency limit) with the memory already reserved
+            job.notice = decision.message
+            job.tier = decision.tier
+            job.state, job.stage = "queued", "Queued"
+            with self._lock:
+                executor = self._executor(job.tier)
+            executor.submit(self._run, job, self._work, work)
+            return
+        self._work(job, work)
+
+    def _work(self, job, work):
+        """Runs an admitted job; the memory admission reserved is released when it ends."""
+        job.started_at = time.time()
+        with self._lock:
+            self._wait_times.append(job.wait_time)
+            self._wait_times = self._wait_times[-500:]
+
+        outcome = ("failed", "Failed", "Processing Failed: the job ended unexpectedly.")
+        try:
+            if job._cancel.is_set():
+                raise AnalysisCancelled(f"Job {job.id} cancelled before it started.")
+            job.state = "running"
+            job.result, error = work(job)
+            job.progress = 1.0
+            outcome = ("failed", "Failed", error) if error else ("done", "Complete", None)
+        except AnalysisCancelled as e:
+            logger.info(str(e))
+            outcome = ("cancelled", "Cancelled", None)
+        except Exception as e:
+            logger.error(f"Job {job.id} crashed: {e}")
+            outcome = ("failed", "Failed", f"Processing Failed: {e}")
+        finally:
+            get_admission_controller().release(job.id)
+            # Under the manager lock, so _prune never sees a finished job without finished_at
+            with self._lock:
+                job.finish(*outcome)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job and not job.finished:
+            job.cancel()
+            logger.info(f"Job {job_id} cancellation requested")
+            return True
+        return False
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at or 0.0)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    def stats(self):
+        """Queue depth, waiting (for memory) and running counts and wait-time figures for monitoring."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            waits = list(self._wait_times)
+        queued = [j for j in jobs if j.state == "queued"]
+        return {
+            "queue_depth": len(queued),
+            "waiting": sum(1 for j in jobs if j.state == "waiting"),
+            "running": sum(1 for j in jobs if j.state == "running"),
+            "avg_wait_s": round(sum(waits) / len(waits), 2) if waits else 0.0,
+            "max_wait_s": round(max(waits), 2) if waits else 0.0,
+            "oldest_queued_s": round(max((j.wait_time for j in queued), default=0.0), 2)
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_job_manager():
+    """Process-wide job manager shared by every Streamlit session."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
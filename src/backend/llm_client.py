@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from src.utils.diagnostics import get_logger
+from src.utils.tracing import span
+
+logger = get_logger()
+
+DEFAULT_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+DEFAULT_MODEL = os.environ.get("COACH_LLM_MODEL", "llama3")
+CACHE_DIR = os.path.join("temp_data", "llm_cache")
+MEMORY_CACHE_SIZE = 128
+
+STAR_KEYS = ["situation", "task", "action", "result"]
+
+PROMPT_TEMPLATE = """You are an interview coach playing this interviewer: {persona}
+Grade the candidate's spoken answer with the STAR framework.
+
+Question: {question}
+
+Answer transcript:
+\"\"\"{transcript}\"\"\"
+
+Reply with exactly these five lines and nothing else.
+Scores are 0 (missing) to 5 (excellent); feedback is one short sentence.
+SITUATION: <score> | <feedback>
+TASK: <score> | <feedback>
+ACTION: <score> | <feedback>
+RESULT: <score> | <feedback>
+SUMMARY: <two sentences of overall coaching in the interviewer's voice>
+"""
+
+LINE_PATTERN = re.compile(r'^\s*\**(situation|task|action|result)\**\s*:\s*(\d)(?:\s*/\s*5)?\s*\|\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+SUMMARY_PATTERN = re.compile(r'^\s*\**summary\**\s*:\s*(.+)$', re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+
+def parse_evaluation(text):
+    """Turns the model's five-line reply into a result dict (same error convention as scorer metrics)."""
+    result = {key: None for key in STAR_KEYS}
+    result.update({"summary": "", "error": None})
+
+    for name, score, feedback in LINE_PATTERN.findall(text):
+        result[name.lower()] = {"score": min(int(score), 5), "feedback": feedback}
+
+    summary = SUMMARY_PATTERN.search(text)
+    if summary:
+        result["summary"] = summary.group(1).strip()
+
+    if not any(result[key] for key in STAR_KEYS):
+        result["error"] = "The coach's reply could not be parsed."
+    return result
+
+
+class STARStream:
+    """
+    Iterating yields tokens as the model produces them (feed it to st.write_stream).
+    Once exhausted, .result holds the parsed evaluation, which is also cached.
+    """
+    def __init__(self, evaluator, key, prompt):
+        self.evaluator = evaluator
+        self.key = key
+        self.prompt = prompt
+        self.text = ""
+        self.result = None
+
+    def __iter__(self):
+        ev = self.evaluator
+        if not ev._slots.acquire(timeout=ev.timeout):
+            self.result = {"error": "The AI coach is busy with other evaluations. Try again shortly."}
+            return
+
+        with span("llm.generate", model=ev.model):
+            start = time.time()
+            try:
+                stream = ev.client.generate(
+                    model=ev.model, prompt=self.prompt, stream=True,
+                    options={"temperature": 0.2}, keep_alive=ev.keep_alive
+                )
+                for chunk in stream:
+                    token = chunk["response"]
+                    self.text += token
+                    yield token
+                    if time.time() - start > ev.timeout:
+                        raise TimeoutError(f"No complete answer within {ev.timeout}s")
+
+                self.result = parse_evaluation(self.text)
+                if not self.result["error"]:
+                    ev._store(self.key, self.result)
+                logger.info(f"STAR evaluation finished in {time.time() - start:.2f}s ({len(self.text)} chars)")
+            except Exception as e:
+                logger.error(f"LLM Error: {e}")
+                self.result = {"error": f"AI coach unavailable: {e}"}
+            finally:
+                ev._slots.release()
+
+
+class STAREvaluator:
+    """
+    Client for STAR grading on the local Ollama server.
+    One HTTP client (and its connection pool) is shared process-wide;
+    results are cached by (transcript hash, question, persona, model).
+    """
+    def __init__(self, host=None, model=None, timeout=60, max_concurrency=2, keep_alive="10m"):
+        import ollama  # pyright: ignore[reportMissingImports]
+
+        self.host = host or DEFAULT_HOST
+        self.model = model or DEFAULT_MODEL
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        # ollama.Client wraps a persistent httpx client, so keep-alive connections are reused
+        self.client = ollama.Client(host=self.host, timeout=timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cache_key(self, transcript, question, persona):
+        transcript_hash = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+        raw = "|".join([transcript_hash, question or "", persona or "", self.model])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def build_prompt(self, transcript, question, persona):
+        return PROMPT_TEMPLATE.format(transcript=transcript, question=question, persona=persona)
+
+    # --- Cache ---
+    def _disk_path(self, key):
+        return os.path.join(CACHE_DIR, f"{key}.json")
+
+    def cached(self, transcript, question, persona):
+        """Returns a previous evaluation without touching the network, or None."""
+        key = self.cache_key(transcript, question, persona)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        try:
+            with open(self._disk_path(key), "r") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+
+    def _store(self, key, result):
+        self._remember(key, result)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(self._disk_path(key), "w") as f:
+                json.dump(result, f)
+        except OSError as e:
+            logger.warning(f"Could not persist STAR evaluation: {e}")
+
+    # --- Evaluation ---
+    def stream(self, transcript, question, persona):
+        """Starts a streamed evaluation. Check cached() first to skip the model entirely."""
+        key = self.cache_key(transcript, question, persona)
+        return STARStream(self, key, self.build_prompt(transcript, question, persona))
+
+    def evaluate(self, transcript, question, persona, cancel=None):
+        """
+        Blocking evaluation (cached); returns the result dict.
+        cancel is an optional threading.Event: once set, the request is dropped at the next token and its slot freed.
+        """
+        result = self.cached(transcript, question, persona)
+        if result is not None:
+            return result
+        stream = self.stream(transcript, question, persona)
+        tokens = iter(stream)
+        for _ in tokens:
+            if cancel is not None and cancel.is_set():
+                tokens.close()  # Runs the stream's cleanup: slot released, HTTP response closed
+                return {"error": "Evaluation cancelled."}
+        return stream.result
+
+    def complete(self, prompt, temperature=0.7):
+        """Plain non-streamed completion on the shared client (uses the same concurrency slots as grading)."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("The local LLM is busy with other requests.")
+        try:
+            with span("llm.generate", model=self.model):
+                reply = self.client.generate(
+                    model=self.model, prompt=prompt, stream=False,
+                    options={"temperature": temperature}, keep_alive=self.keep_alive
+                )
+            return reply["response"]
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def purge_cache():
+        """Deletes persisted evaluations (Privacy Feature). Returns the number of files removed."""
+        deleted = 0
+        if _evaluator is not None:
+            with _evaluator._lock:
+                _evaluator._memory.clear()
+        if os.path.exists(CACHE_DIR):
+            for name in os.listdir(CACHE_DIR):
+                try:
+                    os.remove(os.path.join(CACHE_DIR, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
+
+
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+def get_star_evaluator():
+    """Process-wide evaluator so every session shares one connection pool and cache."""
+    global _evaluator
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = STAREvaluator()
+    return _evaluator
@@ -0,0 +1,193 @@
+import os
+import threading
+from collections import OrderedDict
+from src.backend.hardware import get_hardware_info
+from src.backend.monitor import get_system_sampler
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+# Approximate resident size (GB) of each checkpoint when loaded in float32.
+MODEL_RAM_GB = {
+    "tiny.en": 0.15,
+    "base.en": 0.3,
+    "small.en": 1.0,
+    "medium.en": 3.0,
+    "large-v3": 6.0
+}
+
+# Quantized weights shrink the footprint roughly by this factor.
+COMPUTE_SCALE = {
+    "int8": 0.35,
+    "int8_float16": 0.4,
+    "int8_float32": 0.45,
+    "float16": 0.55,
+    "float32": 1.0
+}
+
+# Share of total system RAM the pool may fill before evicting (override with COACH_MODEL_RAM_BUDGET_GB).
+DEFAULT_BUDGET_FRACTION = 0.5
+
+
+def estimate_model_ram_gb(model_size, compute_type):
+    """Rough RAM cost of a loaded model, used for budget accounting."""
+    base = MODEL_RAM_GB.get(model_size, MODEL_RAM_GB["small.en"])
+    return base * COMPUTE_SCALE.get(compute_type, 1.0)
+
+
+def max_parallel_workers(model_size, compute_type):
+    """How many concurrent Whisper workers half of free RAM allows, capped at half the cores."""
+    free_gb = get_system_sampler().available_ram_gb()
+    per_worker = max(estimate_model_ram_gb(model_size, compute_type), 0.25)
+    return int(max(1, min((os.cpu_count() or 2) // 2, free_gb * 0.5 // per_worker)))
+
+
+class ModelPool:
+    """
+    Process-wide registry of loaded Whisper models.
+    Keyed by (model_size, device, compute_type) and evicted LRU-first
+    once the estimated footprint exceeds the RAM budget.
+    """
+    def __init__(self, budget_gb=None):
+        if budget_gb is None:
+            env_budget = os.environ.get("COACH_MODEL_RAM_BUDGET_GB")
+            if env_budget:
+                budget_gb = float(env_budget)
+            else:
+                budget_gb = get_hardware_info().total_ram_gb * DEFAULT_BUDGET_FRACTION
+        self.budget_gb = budget_gb
+
+        self._models = OrderedDict()  # key -> (model, est_gb)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def used_gb(self):
+        return sum(est for _, est in self._models.values())
+
+    def _lookup(self, key):
+        """Returns a cached model and bumps it to most-recently-used (caller holds the lock)."""
+        entry = self._models.get(key)
+        if entry is None:
+            return None
+        self._models.move_to_end(key)
+        self.hits += 1
+        logger.info(f"Model pool HIT {key} (hits={self.hits}, misses={self.misses}, evictions={self.evictions})")
+        return entry[0]
+
+    def get(self, model_size, device, compute_type, **model_kwargs):
+        """
+        Returns a warm model, loading it once on first use.
+        Extra WhisperModel options (cpu_threads, num_workers) become part of the key.
+        """
+        key = (model_size, device, compute_type)
+        if model_kwargs:
+            key += tuple(sorted(model_kwargs.items()))
+
+        with self._lock:
+            model = self._lookup(key)
+            if model is not None:
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given key; the others wait and then hit the cache.
+        with key_lock:
+            with self._lock:
+                model = self._lookup(key)
+                if model is not None:
+                    return model
+                self.misses += 1
+
+            logger.info(f"Model pool MISS {key}. Loading from disk...")
+            self._make_room(key, device, estimate_model_ram_gb(model_size, compute_type))
+            from faster_whisper import WhisperModel  # pyright: ignore[reportMissingImports]
+            model = WhisperModel(model_size, device=device, compute_type=compute_type, **model_kwargs)
+
+            with self._lock:
+                self._insert(key, model, estimate_model_ram_gb(model_size, compute_type))
+            return model
+
+    def _make_room(self, key, device, est_gb):
+        """
+        Checks the sampler's memory-pressure signal before a load: evicts idle models
+        until the new one fits, and refuses the load (as an out-of-memory RuntimeError,
+        which triggers the Eco fallback) when it cannot fit at all.
+        """
+        sampler = get_system_sampler()
+        pressure = sampler.memory_pressure()
+        # On GPU the RAM estimate doesn't apply; only critical VRAM/RAM pressure forces evictions
+        needed = est_gb if device == "cpu" else 0.0
+        if pressure == "critical":
+            needed = max(needed * 2, 0.5)  # Leave the OS some room as well
+        freed = 0.0
+
+        with self._lock:
+            while self._models and sampler.available_ram_gb() + freed < needed:
+                old_key, (_, old_gb) = self._models.popitem(last=False)
+                freed += old_gb
+                self.evictions += 1
+                logger.info(f"Model pool EVICT {old_key} under {pressure} memory pressure (evictions={self.evictions})")
+
+        if sampler.available_ram_gb() + freed < needed:
+            raise RuntimeError(
+                f"Out of memory guard: {key} needs ~{needed:.1f} GB but only "
+                f"{sampler.available_ram_gb():.1f} GB is free ({pressure} pressure)."
+            )
+
+    def _insert(self, key, model, est_gb):
+        # Evict least-recently-used models until the new one fits the budget
+        while self._models and self.used_gb + est_gb > self.budget_gb:
+            old_key, _ = self._models.popitem(last=False)
+            self.evictions += 1
+            logger.info(f"Model pool EVICT {old_key} (evictions={self.evictions})")
+
+        if est_gb > self.budget_gb:
+            logger.warning(f"Model {key} (~{est_gb:.1f} GB) exceeds pool budget of {self.budget_gb:.1f} GB.")
+
+        self._models[key] = (model, est_gb)
+        logger.info(f"Model pool now holds {len(self._models)} model(s), ~{self.used_gb:.1f}/{self.budget_gb:.1f} GB")
+
+    def evict(self, key):
+        """Drops a single model (e.g. after it crashed) so the next request reloads it."""
+        with self._lock:
+            if self._models.pop(key, None) is not None:
+                self.evictions += 1
+                logger.info(f"Model pool EVICT {key} (evictions={self.evictions})")
+
+    def holds(self, model_size, device, compute_type):
+        """True if any variant of the model (whatever its worker settings) is resident."""
+        with self._lock:
+            return any(k[:3] == (model_size, device, compute_type) for k in self._models)
+
+    def clear(self):
+        with self._lock:
+            self.evictions += len(self._models)
+            self._models.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "loaded": [list(k) for k in self._models],
+                "used_gb": round(self.used_gb, 2),
+                "budget_gb": round(self.budget_gb, 2)
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_model_pool():
+    """Returns the shared pool; module state survives Streamlit reruns and is shared by all sessions."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ModelPool()
+    return _pool
@@ -1,36 +1,157 @@
+import os
+import threading
+import time
+from collections import deque
 import psutil
-import torch
-import platform
+from src.backend.hardware import get_hardware_info
+from src.utils.diagnostics import get_logger
 
-class ResourceMonitor:
-    def get_system_usage(self):
-        """
-        Returns a dictionary of current system resources.
-        """
+logger = get_logger()
+
+SAMPLE_INTERVAL_S = float(os.environ.get("COACH_SAMPLE_INTERVAL", "1.0"))
+HISTORY_SECONDS = 300  # Ring buffer length for the sidebar sparkline
+
+# Memory-pressure levels, by share of RAM (or VRAM) in use
+PRESSURE_HIGH = 85
+PRESSURE_CRITICAL = 95
+
+
+class SystemSampler:
+    """
+    One background thread per process samples CPU, RAM, VRAM and this process'
+    RSS/thread count at a fixed rate into a ring buffer. Sessions read the
+    latest snapshot instead of polling psutil/torch themselves.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL_S, history_seconds=HISTORY_SECONDS):
+        self.interval = interval
+        self._history = deque(maxlen=max(1, int(history_seconds / interval)))
+        self._process = psutil.Process()
+        self._gpu = None  # (name, total bytes), read once
+        self._stop = threading.Event()
+        self._thread = None
+        self._latest = self.sample()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._latest = self.sample()
+            except Exception as e:
+                logger.warning(f"System sampler tick failed: {e}")
+
+    def sample(self):
+        """Takes one snapshot (one virtual_memory() call) and appends it to the history."""
+        mem = psutil.virtual_memory()
+        proc = self._process.memory_info()
         stats = {
+            "timestamp": time.time(),
             "cpu_percent": psutil.cpu_percent(interval=None),
-            "ram_percent": psutil.virtual_memory().percent,
-            "ram_used_gb": round(psutil.virtual_memory().used / (1024**3), 1),
-            "ram_total_gb": round(psutil.virtual_memory().total / (1024**3), 1),
+            "ram_percent": mem.percent,
+            "ram_used_gb": round(mem.used / (1024**3), 1),
+            "ram_total_gb": round(mem.total / (1024**3), 1),
+            "ram_available_gb": round(mem.available / (1024**3), 2),
+            "process_rss_mb": round(proc.rss / (1024**2), 1),
+            "process_threads": self._process.num_threads(),
             "gpu_name": None,
             "vram_used_gb": 0,
             "vram_total_gb": 0,
             "vram_percent": 0
         }
+        stats.update(self._sample_gpu())
+        self._history.append(stats)
+        return stats
 
-        # Check for NVIDIA GPU
-        if torch.cuda.is_available():
-            try:
-                stats["gpu_name"] = torch.cuda.get_device_name(0)
-                # VRAM calculations (in bytes -> GB)
-                total_mem = torch.cuda.get_device_properties(0).total_memory
-                allocated = torch.cuda.memory_allocated(0)
-                reserved = torch.cuda.memory_reserved(0)
-                
-                stats["vram_total_gb"] = round(total_mem / (1024**3), 1)
-                stats["vram_used_gb"] = round(reserved / (1024**3), 1)
-                stats["vram_percent"] = int((reserved / total_mem) * 100)
-            except:
-                pass # Fail silently if driver issues
-        
-        return stats
\ No newline at end of file
+    def _sample_gpu(self):
+        # torch is only imported on machines that have an NVIDIA GPU
+        if not get_hardware_info().has_nvidia:
+            return {}
+        try:
+            import torch
+            if self._gpu is None:
+                self._gpu = (torch.cuda.get_device_name(0), torch.cuda.get_device_properties(0).total_memory)
+            name, total_mem = self._gpu
+            reserved = torch.cuda.memory_reserved(0)
+            return {
+                "gpu_name": name,
+                "vram_total_gb": round(total_mem / (1024**3), 1),
+                "vram_used_gb": round(reserved / (1024**3), 1),
+                "vram_percent": int((reserved / total_mem) * 100)
+            }
+        except Exception:
+            return {}  # Fail silently if driver issues
+
+    # --- Readers (no sampling, safe from any thread) ---
+    def latest(self):
+        return dict(self._latest)
+
+    def history(self, fields=("cpu_percent", "ram_percent"), seconds=None):
+        """{field: [values]} oldest first, optionally limited to the last `seconds`."""
+        samples = list(self._history)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            samples = [s for s in samples if s["timestamp"] >= cutoff]
+        return {field: [s[field] for s in samples] for field in fields}
+
+    def available_ram_gb(self):
+        return self._latest["ram_available_gb"]
+
+    def memory_pressure(self):
+        """'ok', 'high' or 'critical', from the worse of RAM and VRAM usage."""
+        usage = max(self._latest["ram_percent"], self._latest["vram_percent"])
+        if usage >= PRESSURE_CRITICAL:
+            return "critical"
+        if usage >= PRESSURE_HIGH:
+            return "high"
+        return "ok"
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+def get_system_sampler():
+    """Starts the process-wide sampler on first use."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = SystemSampler().start()
+    return _sampler
+
+
+class ResourceMonitor:
+    def get_system_usage(self):
+        """
+        Returns a dictionary of current system resources.
+        Reads the shared sampler's latest snapshot, so it costs nothing per session.
+        """
+        return get_system_sampler().latest()
+
+
+def start_metrics_endpoint():
+    """
+    Registers the service gauges (computed at scrape time, so the sidebar and
+    the scraper never race) and starts the local /metrics endpoint once per process.
+    """
+    from src.backend.jobs import get_job_manager
+    from src.backend.model_pool import get_model_pool
+    from src.utils.metrics import registry, start_metrics_server
+
+    sampler = get_system_sampler()
+    registry.gauge("coach_loaded_models", "Whisper models resident in the pool.", collect=lambda: len(get_model_pool().stats()["loaded"]))
+    registry.gauge("coach_model_pool_gb", "Estimated RAM held by pooled models.", collect=lambda: get_model_pool().stats()["used_gb"])
+    registry.gauge("coach_job_queue_depth", "Analyses waiting for a worker.", collect=lambda: get_job_manager().stats()["queue_depth"])
+    registry.gauge("coach_jobs_running", "Analyses currently running.", collect=lambda: get_job_manager().stats()["running"])
+    registry.gauge("coach_jobs_waiting", "Analyses waiting for admission (free memory).", collect=lambda: get_job_manager().stats()["waiting"])
+    registry.gauge("coach_process_rss_bytes", "Resident memory of this process.", collect=lambda: int(sampler.latest()["process_rss_mb"] * 1024**2))
+    registry.gauge("coach_process_threads", "Threads in this process.", collect=lambda: sampler.latest()["process_threads"])
+    registry.gauge("coach_system_ram_percent", "System RAM in use.", collect=lambda: sampler.latest()["ram_percent"])
+    registry.gauge("coach_vram_used_gb", "Reserved GPU memory (0 without an NVIDIA GPU).", collect=lambda: sampler.latest()["vram_used_gb"])
+    return start_metrics_server()
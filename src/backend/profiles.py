@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+# Per-machine overrides (written by the auto-tuner); any field left out keeps the built-in value.
+# Machine settings, not user data: kept out of temp_data so "Delete All Data" doesn't discard a tuning run.
+PROFILE_FILE = os.environ.get("COACH_PROFILE_FILE", os.path.join("config", "decoding_profiles.json"))
+
+# Silero VAD settings tuned for interview answers: keep short thinking pauses inside segments.
+INTERVIEW_VAD = {"threshold": 0.5, "min_silence_duration_ms": 700, "speech_pad_ms": 300}
+
+
+class DecodingProfile:
+    """
+    Everything a tier decides about transcription, not just the model size.
+    compute_type only applies on CPU and only when set (tuned profiles set it);
+    None keeps the hardware default (int8, float32 on Apple Silicon, float16 on GPU).
+    cpu_threads / num_workers of 0 leave CTranslate2's own defaults.
+    word_timestamps lets the text analytics place fillers and blunders in time;
+    it costs an alignment pass, so the speed tier leaves it off.
+    """
+    FIELDS = ("model_size", "compute_type", "beam_size", "best_of", "vad_filter", "vad_parameters",
+              "cpu_threads", "num_workers", "condition_on_previous_text", "word_timestamps")
+
+    def __init__(self, name, model_size="small.en", compute_type=None, beam_size=5, best_of=5, vad_filter=False,
+                 vad_parameters=None, cpu_threads=0, num_workers=1, condition_on_previous_text=True, word_timestamps=False):
+        self.name = name
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.best_of = best_of
+        self.vad_filter = vad_filter
+        self.vad_parameters = dict(vad_parameters or {})
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.condition_on_previous_text = condition_on_previous_text
+        self.word_timestamps = word_timestamps
+
+    def model_kwargs(self):
+        """Extra WhisperModel constructor arguments (part of the model pool key)."""
+        kwargs = {"num_workers": self.num_workers}
+        if self.cpu_threads:
+            kwargs["cpu_threads"] = self.cpu_threads
+        return kwargs
+
+    def transcribe_kwargs(self):
+        """Decoding options for model.transcribe()."""
+        kwargs = {
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "vad_filter": self.vad_filter,
+            "condition_on_previous_text": self.condition_on_previous_text,
+            "word_timestamps": self.word_timestamps
+        }
+        if self.vad_filter and self.vad_parameters:
+            kwargs["vad_parameters"] = dict(self.vad_parameters)
+        return kwargs
+
+    def signature(self):
+        """Stable string of the options that change transcripts, for result-cache keys."""
+        return json.dumps(self.transcribe_kwargs(), sort_keys=True)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, name, data, base=None):
+        values = base.to_dict() if base else {}
+        values.update({k: v for k, v in data.items() if k in cls.FIELDS})
+        return cls(name, **values)
+
+    def __repr__(self):
+        return f"DecodingProfile({self.name!r}, " + ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items()) + ")"
+
+
+DEFAULT_PROFILES = {
+    "Eco (Low Spec)": DecodingProfile(
+        "Eco (Low Spec)", model_size="tiny.en", beam_size=1, best_of=1,
+        vad_filter=True, vad_parameters=INTERVIEW_VAD, condition_on_previous_text=False
+    ),
+    "Balanced (Mid Spec)": DecodingProfile(
+        "Balanced (Mid Spec)", model_size="small.en", beam_size=3, best_of=3,
+        vad_filter=True, vad_parameters=INTERVIEW_VAD, condition_on_previous_text=False, word_timestamps=True
+    ),
+    "Pro (High Spec)": DecodingProfile(
+        "Pro (High Spec)", model_size="medium.en", beam_size=5, best_of=5,
+        vad_filter=True, vad_parameters=INTERVIEW_VAD, condition_on_previous_text=True, word_timestamps=True
+    )
+}
+
+
+def load_profiles(path=PROFILE_FILE):
+    """Built-in profiles overlaid with the JSON file ({tier: {field: value}}), if one exists."""
+    profiles = dict(DEFAULT_PROFILES)
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                overrides = json.load(f)
+            for tier, data in overrides.items():
+                profiles[tier] = DecodingProfile.from_dict(tier, data, base=profiles.get(tier))
+            logger.info(f"Decoding profiles loaded from {path}: {', '.join(overrides)}")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable profile file {path}: {e}")
+    return profiles
+
+
+def save_profile(profile, path=PROFILE_FILE):
+    """Writes one tier's profile into the override file, keeping the other tiers."""
+    overrides = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                overrides = json.load(f)
+        except (OSError, ValueError):
+            pass
+    overrides[profile.name] = profile.to_dict()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(overrides, f, indent=2)
+    reload_profiles()
+
+
+_profiles = None
+_profiles_lock = threading.Lock()
+
+def get_profile(tier):
+    """The active profile for a tier (unknown tiers get Balanced), loaded once per process."""
+    global _profiles
+    if _profiles is None:
+        with _profiles_lock:
+            if _profiles is None:
+                _profiles = load_profiles()
+    return _profiles.get(tier) or _profiles["Balanced (Mid Spec)"]
+
+
+def reload_profiles():
+    global _profiles
+    with _profiles_lock:
+        _profiles = None
@@ -0,0 +1,341 @@
+"""
+Question bank for the setup wizard.
+Generated interview rounds and questions are stored on disk under a
+normalized (industry, job title, seniority, round) key. Filling in the
+role starts a background prefetch of every round, and concurrent requests
+for the same key share one generation, so steps 2 -> 3 are instant once warm.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from src.utils.diagnostics import get_logger
+from src.utils.metrics import registry
+
+logger = get_logger()
+
+STORE_DIR = os.path.join("temp_data", "question_bank")
+# "template" (default) or "llm". The LLM generator is opt-in: it shares the STAR grader's Ollama slots,
+# and prefetching every round for every session would crowd out grading (or time out without Ollama).
+GENERATOR = os.environ.get("COACH_QUESTION_GENERATOR", "template")
+QUESTIONS_PER_ROUND = 5
+WAIT_TIMEOUT_S = 90
+
+ROUNDS_KEY = "__rounds__"
+CUSTOM_QUESTION = "-- Custom Question --"
+
+LOOKUPS = registry.counter("coach_question_bank_lookups_total", "Question bank lookups.", ("kind", "outcome"))
+
+DEFAULT_ROUNDS = [
+    "Recruiter/Phone Screening (15–30 min)",
+    "First-Round/Hiring Manager (30–60 min)",
+    "Technical/In-depth Interview (60–90 min)",
+    "Panel/Group Interviews (60–90+ min)",
+    "Final Interview (30–60+ min)"
+]
+
+
+def normalize(value):
+    """Case, spacing and punctuation-insensitive form of a key field ('  Back-end Developer ' -> 'back end developer')."""
+    return " ".join(re.sub(r"[^\w+#]+", " ", (value or "").lower()).split())
+
+
+def make_key(industry, job_title, seniority, round_name=ROUNDS_KEY):
+    """Normalized key tuple. Rounds are keyed by their type (the text before the duration)."""
+    round_type = round_name if round_name == ROUNDS_KEY else round_name.split("(")[0]
+    return (normalize(industry), normalize(job_title), normalize(seniority), normalize(round_type) or round_name)
+
+
+FRIENDLY_PERSONA = "🤝 Friendly HR Recruiter (Focuses on soft skills & culture fit)"
+TECHNICAL_PERSONA = "💼 Strict Technical Lead (Focuses purely on accuracy & efficiency)"
+STRESS_PERSONA = "🔥 Stress Interviewer (Highly critical, looks for flaws & hesitations)"
+
+# Keywords looked up anywhere in the (normalized) stage name, first match wins.
+# Generated stage names are free-form ("Coding Challenge", "Onsite Technical Loop").
+ROUND_KEYWORDS = [
+    ("technical", {"technical", "coding", "code", "programming", "system", "design", "case", "assessment",
+                   "assignment", "take", "whiteboard", "skills", "in depth"}),
+    ("panel", {"panel", "group", "onsite", "on site", "loop", "stakeholder", "presentation"}),
+    ("final", {"final", "executive", "leadership", "director", "vp", "ceo", "offer"}),
+    ("screening", {"recruiter", "phone", "screen", "screening", "hr", "first round", "hiring manager",
+                   "introductory", "intro", "culture", "behavioral", "behavioural"}),
+]
+
+
+def round_type(round_name):
+    """'technical', 'panel', 'final', 'screening' or 'general' from keywords anywhere in the stage name."""
+    words = normalize(round_name)
+    tokens = set(words.split())
+    for kind, keywords in ROUND_KEYWORDS:
+        if any((kw in words) if " " in kw else (kw in tokens) for kw in keywords):
+            return kind
+    return "general"
+
+
+def round_profile(round_name, seniority):
+    """Stage context plus the recommended analysis mode and interviewer persona for a round."""
+    kind = round_type(round_name)
+    if kind == "screening":
+        return {
+            "meaning": "A standard, efficient first-round interview. Focus on high-level experience and culture fit.",
+            "recommended_mode": "Standard Interview",
+            "recommended_persona": FRIENDLY_PERSONA
+        }
+    if kind == "technical":
+        return {
+            "meaning": "Common for technical assessments. Expect in-depth scrutiny and follow-ups.",
+            "recommended_mode": "Technical / Complex",
+            "recommended_persona": TECHNICAL_PERSONA
+        }
+    if kind == "panel":
+        return {
+            "meaning": "Panel interviews involve multiple stakeholders. High pressure, varied question types.",
+            "recommended_mode": "Technical / Complex",
+            "recommended_persona": STRESS_PERSONA
+        }
+    if kind == "final":
+        return {
+            "meaning": "Final interviews evaluate ultimate culture fit, long-term alignment, and leadership.",
+            "recommended_mode": "Presentation" if seniority == "Executive" else "Standard Interview",
+            "recommended_persona": STRESS_PERSONA
+        }
+    return {  # Unrecognised stage: neutral defaults rather than the high-pressure final-round persona
+        "meaning": "A general interview stage. Expect a mix of experience, motivation and role-specific questions.",
+        "recommended_mode": "Standard Interview",
+        "recommended_persona": FRIENDLY_PERSONA
+    }
+
+
+# --- 1. Generators ---
+class TemplateGenerator:
+    """Instant, offline generator (the LLM fallback, and the stub for checks)."""
+    name = "template"
+
+    def rounds(self, industry, job_title, seniority):
+        return list(DEFAULT_ROUNDS)
+
+    def questions(self, industry, job_title, seniority, round_name):
+        round_type = round_name.split(" ")[0]
+        return [
+            f"Tell me about your experience as a {seniority} {job_title}.",
+            f"What is your approach to handling {industry} challenges in a {round_type.lower()} setting?"
+        ]
+
+
+ROUNDS_PROMPT = """List the interview stages a {seniority} {job_title} candidate in {industry} usually goes through.
+Reply with 3 to 6 lines, one stage per line, formatted as: Stage name (typical duration)
+No numbering and no other text."""
+
+QUESTIONS_PROMPT = """You are the interviewer in the "{round_name}" stage for a {seniority} {job_title} role in {industry}.
+Write {count} questions you would ask in this stage, one per line.
+No numbering and no other text."""
+
+_LIST_PREFIX = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def _lines(text, limit):
+    items = [_LIST_PREFIX.sub("", line).strip().strip('"') for line in text.splitlines()]
+    return [item for item in items if len(item) > 3][:limit]
+
+
+class LLMGenerator:
+    """Generates through the local Ollama model, sharing the STAR evaluator's client and concurrency slots (opt-in, see GENERATOR)."""
+    name = "llm"
+
+    def __init__(self, count=QUESTIONS_PER_ROUND):
+        self.count = count
+
+    def rounds(self, industry, job_title, seniority):
+        from src.backend.llm_client import get_star_evaluator
+        reply = get_star_evaluator().complete(ROUNDS_PROMPT.format(industry=industry, job_title=job_title, seniority=seniority))
+        rounds = _lines(reply, 6)
+        if not rounds:
+            raise ValueError("The model returned no interview stages.")
+        return rounds
+
+    def questions(self, industry, job_title, seniority, round_name):
+        from src.backend.llm_client import get_star_evaluator
+        reply = get_star_evaluator().complete(QUESTIONS_PROMPT.format(
+            industry=industry, job_title=job_title, seniority=seniority, round_name=round_name, count=self.count
+        ))
+        questions = [q for q in _lines(reply, self.count) if q.endswith("?")] or _lines(reply, self.count)
+        if not questions:
+            raise ValueError("The model returned no questions.")
+        return questions
+
+
+# --- 2. Store + Prefetch ---
+class QuestionBank:
+    """
+    Persistent store (one JSON file per key, plus an in-memory copy) in front of a
+    generator. Misses are generated on a small worker pool; callers asking for a
+    key that is already being generated wait on the same future. Prefetch runs
+    on its own single worker, so explicit requests never queue behind it and
+    take over (cancel and re-run) prefetch jobs for their key that haven't started.
+    """
+    def __init__(self, generator=None, fallback=None, store_dir=STORE_DIR, workers=1):
+        self.generator = generator or (LLMGenerator() if GENERATOR == "llm" else TemplateGenerator())
+        self.fallback = fallback or TemplateGenerator()
+        self.store_dir = store_dir
+        self._memory = {}
+        self._inflight = {}  # key -> (future, speculative)
+        self._lock = threading.RLock()  # Re-entered when cancelling a prefetch job runs its done-callback inline
+        # One worker each by default: explicit requests and prefetch together never use more than the LLM's two slots
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-bank")
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-prefetch")
+
+    # --- Store ---
+    def _path(self, key):
+        digest = hashlib.sha256("|".join(key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.store_dir, f"{digest}.json")
+
+    def _load(self, key):
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                items = json.load(f)["items"]
+        except (OSError, ValueError, KeyError):
+            return None
+        with self._lock:
+            self._memory[key] = items
+        return items
+
+    def _save(self, key, items, source):
+        with self._lock:
+            self._memory[key] = items
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                json.dump({"key": list(key), "items": items, "generator": source, "created": time.time()}, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not persist question bank entry: {e}")
+
+    # --- Generation ---
+    def _generate(self, key, kind, args):
+        """Worker body: generator first, template fallback on failure (not persisted, so a later run can retry)."""
+        start = time.time()
+        try:
+            items = getattr(self.generator, kind)(*args)
+            self._save(key, items, self.generator.name)
+            logger.info(f"Question bank: generated {kind} for {key} in {time.time() - start:.2f}s ({self.generator.name})")
+        except Exception as e:
+            logger.warning(f"Question bank: {self.generator.name} generator failed for {key}: {e}. Using templates.")
+            items = getattr(self.fallback, kind)(*args)
+            with self._lock:
+                self._memory[key] = items
+        return items
+
+    def _submit(self, key, kind, args, speculative=False):
+        """Returns (future, outcome) where outcome is 'hit', 'shared', 'promoted' or 'miss'."""
+        items = self._load(key)
+        if items is not None:
+            return None, "hit"
+        with self._lock:
+            if key in self._memory:  # Finished between the load and taking the lock
+                return None, "hit"
+            outcome = "miss"
+            entry = self._inflight.get(key)
+            if entry is not None:
+                future, queued_as_prefetch = entry
+                # A running job is shared; a prefetch job still waiting in the queue is cancelled and re-run now
+                if speculative or not queued_as_prefetch or not future.cancel():
+                    return future, "shared"
+                outcome = "promoted"
+            executor = self._prefetch_executor if speculative else self._executor
+            future = executor.submit(self._generate, key, kind, args)
+            self._inflight[key] = (future, speculative)
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future, outcome
+
+    def _forget(self, key, future):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None and entry[0] is future:  # Not a newer job that promoted this one
+                del self._inflight[key]
+
+    def _get(self, key, kind, args, timeout):
+        future, outcome = self._submit(key, kind, args)
+        LOOKUPS.inc(kind=kind, outcome=outcome)
+        if future is None:
+            return self._load(key)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            # Same as a generator failure: templates now, the running job still stores its result for next time
+            logger.warning(f"Question bank: {kind} for {key} not ready after {timeout}s. Using templates.")
+            LOOKUPS.inc(kind=kind, outcome="timeout")
+            return getattr(self.fallback, kind)(*args)
+
+    # --- Public API ---
+    def get_rounds(self, industry, job_title, seniority, timeout=WAIT_TIMEOUT_S):
+        return self._get(make_key(industry, job_title, seniority), "rounds", (industry, job_title, seniority), timeout)
+
+    def get_questions(self, industry, job_title, seniority, round_name, timeout=WAIT_TIMEOUT_S):
+        key = make_key(industry, job_title, seniority, round_name)
+        return self._get(key, "questions", (industry, job_title, seniority, round_name), timeout)
+
+    def is_ready(self, industry, job_title, seniority, round_name=ROUNDS_KEY):
+        """True when the entry is already stored (the next get is instant)."""
+        return self._load(make_key(industry, job_title, seniority, round_name)) is not None
+
+    def prefetch(self, industry, job_title, seniority):
+        """
+        Starts generating the rounds and then every round's questions in the background.
+        Returns the prefetch thread at once (it finishes when every round is stored).
+        """
+        if not (normalize(industry) and normalize(job_title)):
+            return None
+
+        def wait(future):
+            try:
+                return future.result() if future is not None else None
+            except CancelledError:  # Taken over by an explicit request, which stores the result
+                return None
+
+        def warm():
+            role = (industry, job_title, seniority)
+            future, _ = self._submit(make_key(*role), "rounds", role, speculative=True)
+            rounds = wait(future) or self.get_rounds(*role)
+            pending = []
+            for round_name in rounds:
+                future, _ = self._submit(make_key(*role, round_name), "questions", (*role, round_name), speculative=True)
+                pending.append(future)
+            for future in pending:
+                wait(future)
+
+        # Runs on its own thread: waiting for the rounds inside the worker pool could starve it
+        thread = threading.Thread(target=warm, name="question-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def purge(self):
+        """Deletes stored entries (Privacy Feature). Returns the number of files removed."""
+        with self._lock:
+            self._memory.clear()
+        deleted = 0
+        if os.path.exists(self.store_dir):
+            for name in os.listdir(self.store_dir):
+                try:
+                    os.remove(os.path.join(self.store_dir, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+def get_question_bank():
+    """Process-wide bank, so sessions preparing for the same role share the store and in-flight work."""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
@@ -1,15 +1,14 @@
-import librosa  # pyright: ignore[reportMissingImports]
 import numpy as np  # pyright: ignore[reportMissingImports]
-import re
+from src.backend.decoded_audio import DecodedAudio
+from src.backend.features import FeatureBank
+from src.backend.text_analytics import get_text_analyzer
+from src.utils.tracing import span
+
+# Bump whenever scoring logic changes so cached results are recomputed.
+SCORER_VERSION = "1.4"
 
 class AcousticScorer:
     def __init__(self):
-        # Regex patterns
-        self.filler_pattern = re.compile(r'\b(um+?|uh+?|ah+?|hmm+|like|you know|sort of|kind of|i mean|basically|actually)\b', re.IGNORECASE)
-        self.stutter_pattern = re.compile(r'\b(\w+)-\1\b', re.IGNORECASE)
-        self.repetition_pattern = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
-        self.blunder_pattern = re.compile(r'(\.\.\.|scratch that|sorry i mean)', re.IGNORECASE)
-
         self.THRESHOLDS = {
             "Practice Mode": { "wpm_min": 100, "wpm_max": 200, "max_pauses": 5, "max_fillers": 5, "max_blunders": 3 },
             "Technical / Complex": { "wpm_min": 100, "wpm_max": 120, "max_pauses": 4, "max_fillers": 2, "max_blunders": 1 },
@@ -17,6 +16,13 @@ class AcousticScorer:
             "Presentation": { "wpm_min": 130, "wpm_max": 150, "max_pauses": 1, "max_fillers": 0, "max_blunders": 0 }
         }
 
+        # Pitch estimator per hardware tier ("yin" is band-limited to voice range and much cheaper)
+        self.PITCH_METHODS = {
+            "Eco (Low Spec)": "yin",
+            "Balanced (Mid Spec)": "piptrack",
+            "Pro (High Spec)": "piptrack"
+        }
+
     def _assess_content_density(self, duration, word_count):
         """Soft Logic tip generator."""
         tip = None
@@ -28,22 +34,52 @@ class AcousticScorer:
             elif word_count > 260: tip = "You exceeded the typical 250-word target."
         return tip
 
-    def analyze_audio(self, audio_path, transcript, difficulty="Standard Interview"):
-        metrics = {
+    def extract_pitch(self, y, sr, method="piptrack"):
+        """Returns voiced F0 values (Hz) inside the 50-300 Hz band."""
+        return FeatureBank(y, sr).pitch(method)
+
+    @staticmethod
+    def analyze_text(transcript, words=None, duration=0.0, language="en"):
+        """Single-pass filler/stutter/repetition/blunder analysis with offsets (see text_analytics)."""
+        return get_text_analyzer(language).analyze(transcript, words=words, duration=duration)
+
+    def count_disfluencies(self, transcript, language="en"):
+        """Returns (fillers incl. stutters & repetitions, blunders) for a transcript."""
+        counts = self.analyze_text(transcript, language=language)["counts"]
+        return counts["filler"] + counts["stutter"] + counts["repetition"], counts["blunder"]
+
+    @staticmethod
+    def _empty_metrics():
+        return {
             "wpm": 0, "pause_count": 0, "filler_count": 0, "blunder_count": 0,
             "duration": 0, "pitch_avg": 0, "pitch_var": 0, "energy_avg": 0,
             "tone_label": "Neutral", "error": None, "feedback": {}
         }
-        
-        limits = self.THRESHOLDS.get(difficulty, self.THRESHOLDS["Standard Interview"])
+
+    def analyze_audio(self, audio, transcript, difficulty="Standard Interview", pitch_method="piptrack", words=None, language="en"):
+        """
+        Scores delivery from a DecodedAudio buffer (preferred, no disk read)
+        or from a file path, which is loaded at its native sample rate.
+        words are optional Whisper word timestamps used to time the transcript events.
+        """
+        import librosa  # pyright: ignore[reportMissingImports]
+
+        metrics = self._empty_metrics()
 
         try:
             # --- 1. Signal Extraction ---
-            y, sr = librosa.load(audio_path, sr=None)
+            # Framing, RMS and the STFT are shared through the recording's feature bank
+            if isinstance(audio, DecodedAudio):
+                y, sr = audio.samples, audio.sample_rate
+                bank = audio.features
+            else:
+                y, sr = librosa.load(audio, sr=None)
+                bank = FeatureBank(y, sr)
             total_duration = librosa.get_duration(y=y, sr=sr)
             metrics["duration"] = round(total_duration, 2)
 
-            non_silent_intervals = librosa.effects.split(y, top_db=25, ref=np.max)
+            with span("score.split"):
+                non_silent_intervals = bank.split(top_db=25)
             active_time = sum([end - start for start, end in non_silent_intervals]) / sr
             
             if active_time < 0.5:
@@ -53,126 +89,154 @@ class AcousticScorer:
             # --- 2. Advanced Signal Metrics ---
             
             # PITCH (F0)
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = [pitches[index, t] for t in range(pitches.shape[1]) if (index := magnitudes[:, t].argmax()) and 50 < pitches[index, t] < 300]
-            if pitch_values:
-                metrics["pitch_avg"] = int(np.mean(pitch_values))
-                metrics["pitch_var"] = int(np.std(pitch_values)) # Shakiness/Variation
+            with span("score.pitch", method=pitch_method):
+                pitch_values = bank.pitch(pitch_method)
             
             # VOLUME (Energy) - Normalized roughly 0.0 to 0.1+
-            rms = librosa.feature.rms(y=y)[0]
-            metrics["energy_avg"] = round(float(np.mean(rms)), 3)
+            with span("score.rms"):
+                rms = bank.rms
 
-            # SPEED (WPM)
-            word_count = len(transcript.split())
-            minutes = total_duration / 60.0
-            metrics["wpm"] = int(word_count / minutes) if minutes > 0 else 0
+            with span("score.features"):
+                return self.score_features(
+                    transcript, total_duration, non_silent_intervals / sr,
+                    pitch_values, float(np.mean(rms)), difficulty=difficulty, words=words, language=language
+                )
 
-            # --- 3. EMOTIONAL CLASSIFICATION LOGIC ---
-            # Based on your "Common Vocal Indicators Summary" Matrix
-            
-            # Define Boolean Flags for cleaner logic
-            is_fast = metrics["wpm"] > 160
-            is_slow = metrics["wpm"] < 110
-            is_loud = metrics["energy_avg"] > 0.06  # Thresholds calibrated for typical mic
-            is_quiet = metrics["energy_avg"] < 0.02
-            is_high_pitch = metrics["pitch_avg"] > 160 # Approx threshold for "strained"
-            is_shaky = metrics["pitch_var"] > 40
-            is_monotone = metrics["pitch_var"] < 15
-
-            # Priority 1: High Activation (Intense Emotions)
-            if is_fast and is_shaky:
-                if is_loud:
-                    metrics["tone_label"] = "😠 Angry/Intense"
-                    metrics["feedback"]["tone"] = "Volume & Pitch high. Too aggressive?"
-                    metrics["feedback"]["tone_status"] = "off"
-                else:
-                    metrics["tone_label"] = "😰 Nervous"
-                    metrics["feedback"]["tone"] = "Fast & Shaky. Deep breaths needed."
-                    metrics["feedback"]["tone_status"] = "off"
-            
-            # Priority 2: Positive Activation
-            elif is_fast and is_loud and not is_shaky:
-                 metrics["tone_label"] = "🤩 Energetic"
-                 metrics["feedback"]["tone"] = "Great energy! Passionate delivery."
-                 metrics["feedback"]["tone_status"] = "normal"
-
-            # Priority 3: Low Activation / Formal
-            elif is_monotone:
-                if is_loud:
-                    metrics["tone_label"] = "👔 Formal/Stiff"
-                    metrics["feedback"]["tone"] = "Authoritative but slightly robotic."
-                    metrics["feedback"]["tone_status"] = "normal"
-                elif is_quiet:
-                    metrics["tone_label"] = "😴 Bored/Sad"
-                    metrics["feedback"]["tone"] = "Low energy. Project more voice."
-                    metrics["feedback"]["tone_status"] = "off"
-                else:
-                    metrics["tone_label"] = "🤖 Monotone"
-                    metrics["feedback"]["tone"] = "Vary your pitch to engage listeners."
-                    metrics["feedback"]["tone_status"] = "off"
-
-            # Priority 4: The Ideal State
-            elif not is_fast and not is_slow and not is_quiet:
-                 metrics["tone_label"] = "🧘 Calm/Confident"
-                 metrics["feedback"]["tone"] = "Steady, resonant, and controlled."
-                 metrics["feedback"]["tone_status"] = "normal"
-
-            # Fallback
-            else:
-                 metrics["tone_label"] = "😐 Casual/Conversational"
-                 metrics["feedback"]["tone"] = "Relaxed pace and volume."
-                 metrics["feedback"]["tone_status"] = "normal"
-
-
-            # --- 4. Count Metrics (Fillers/Pauses) ---
-            fillers = len(self.filler_pattern.findall(transcript))
-            stutters = len(self.stutter_pattern.findall(transcript))
-            repetitions = len(self.repetition_pattern.findall(transcript))
-            metrics["filler_count"] = fillers + stutters + repetitions
-            metrics["blunder_count"] = len(self.blunder_pattern.findall(transcript))
-
-            pause_count = 0
-            for i in range(len(non_silent_intervals) - 1):
-                gap = (non_silent_intervals[i+1][0] - non_silent_intervals[i][1]) / sr
-                if gap > 1.5: pause_count += 1
-            metrics["pause_count"] = pause_count
-
-            # --- 5. Final Feedback Compilation ---
-            # Soft Logic Tip
-            density_tip = self._assess_content_density(total_duration, word_count)
-            if density_tip: metrics["feedback"]["density_tip"] = density_tip
-
-            # WPM Feedback
-            if metrics["wpm"] < limits["wpm_min"]:
-                metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = f"Too Slow (<{limits['wpm_min']})", "off"
-            elif metrics["wpm"] > limits["wpm_max"]:
-                metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = f"Too Fast (>{limits['wpm_max']})", "off"
-            else:
-                metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = "Ideal Pace", "normal"
-
-            # Check for Nervous Rushed State specifically
-            if metrics["wpm"] > 160 and metrics["pitch_var"] > 50:
-                 metrics["tone_label"] = "😰 Nervous!" # Override
-
-            # Count Feedback
-            if metrics["pause_count"] <= limits["max_pauses"]:
-                metrics["feedback"]["pause"], metrics["feedback"]["pause_status"] = "Good Flow", "normal"
-            else:
-                metrics["feedback"]["pause"], metrics["feedback"]["pause_status"] = "Too Many Pauses", "off"
+        except Exception as e:
+            metrics["error"] = f"Analysis Failed: {str(e)}"
+            return metrics
 
-            if metrics["filler_count"] <= limits["max_fillers"]:
-                metrics["feedback"]["filler"], metrics["feedback"]["filler_status"] = "Clean", "normal"
+    def score_features(self, transcript, total_duration, speech_intervals, pitch_values, energy_avg, difficulty="Standard Interview",
+                       pitch_stats=None, words=None, language="en"):
+        """
+        Turns extracted signal features into the final metrics and feedback.
+        speech_intervals are (start, end) pairs in seconds.
+        pitch_stats (count/mean/std, from the block scorer) replaces pitch_values when given.
+        Shared by the in-memory scorer and the streaming pipeline.
+        """
+        metrics = self._empty_metrics()
+        limits = self.THRESHOLDS.get(difficulty, self.THRESHOLDS["Standard Interview"])
+        metrics["duration"] = round(total_duration, 2)
+
+        if pitch_stats is not None:
+            if pitch_stats.count:
+                metrics["pitch_avg"] = int(pitch_stats.mean)
+                metrics["pitch_var"] = int(pitch_stats.std)
+        elif pitch_values is not None and len(pitch_values):
+            metrics["pitch_avg"] = int(np.mean(pitch_values))
+            metrics["pitch_var"] = int(np.std(pitch_values)) # Shakiness/Variation
+
+        metrics["energy_avg"] = round(float(energy_avg), 3)
+
+        # One pass over the transcript: counts, offsets and per-minute rates
+        with span("score.text"):
+            text = self.analyze_text(transcript, words=words, duration=total_duration, language=language)
+        metrics["text"] = text
+
+        # SPEED (WPM)
+        word_count = text["word_count"]
+        minutes = total_duration / 60.0
+        metrics["wpm"] = int(word_count / minutes) if minutes > 0 else 0
+
+        # --- 3. EMOTIONAL CLASSIFICATION LOGIC ---
+        # Based on your "Common Vocal Indicators Summary" Matrix
+        
+        # Define Boolean Flags for cleaner logic
+        is_fast = metrics["wpm"] > 160
+        is_slow = metrics["wpm"] < 110
+        is_loud = metrics["energy_avg"] > 0.06  # Thresholds calibrated for typical mic
+        is_quiet = metrics["energy_avg"] < 0.02
+        is_high_pitch = metrics["pitch_avg"] > 160 # Approx threshold for "strained"
+        is_shaky = metrics["pitch_var"] > 40
+        is_monotone = metrics["pitch_var"] < 15
+
+        # Priority 1: High Activation (Intense Emotions)
+        if is_fast and is_shaky:
+            if is_loud:
+                metrics["tone_label"] = "😠 Angry/Intense"
+                metrics["feedback"]["tone"] = "Volume & Pitch high. Too aggressive?"
+                metrics["feedback"]["tone_status"] = "off"
             else:
-                metrics["feedback"]["filler"], metrics["feedback"]["filler_status"] = "Avoid Fillers", "off"
-
-            if metrics["blunder_count"] <= limits["max_blunders"]:
-                metrics["feedback"]["blunder"], metrics["feedback"]["blunder_status"] = "Clear Logic", "normal"
+                metrics["tone_label"] = "😰 Nervous"
+                metrics["feedback"]["tone"] = "Fast & Shaky. Deep breaths needed."
+                metrics["feedback"]["tone_status"] = "off"
+        
+        # Priority 2: Positive Activation
+        elif is_fast and is_loud and not is_shaky:
+             metrics["tone_label"] = "🤩 Energetic"
+             metrics["feedback"]["tone"] = "Great energy! Passionate delivery."
+             metrics["feedback"]["tone_status"] = "normal"
+
+        # Priority 3: Low Activation / Formal
+        elif is_monotone:
+            if is_loud:
+                metrics["tone_label"] = "👔 Formal/Stiff"
+                metrics["feedback"]["tone"] = "Authoritative but slightly robotic."
+                metrics["feedback"]["tone_status"] = "normal"
+            elif is_quiet:
+                metrics["tone_label"] = "😴 Bored/Sad"
+                metrics["feedback"]["tone"] = "Low energy. Project more voice."
+                metrics["feedback"]["tone_status"] = "off"
             else:
-                metrics["feedback"]["blunder"], metrics["feedback"]["blunder_status"] = "Broken Sentences", "off"
-
-            return metrics
-
-        except Exception as e:
-            metrics["error"] = f"Analysis Failed: {str(e)}"
-            return metrics
\ No newline at end of file
+                metrics["tone_label"] = "🤖 Monotone"
+                metrics["feedback"]["tone"] = "Vary your pitch to engage listeners."
+                metrics["feedback"]["tone_status"] = "off"
+
+        # Priority 4: The Ideal State
+        elif not is_fast and not is_slow and not is_quiet:
+             metrics["tone_label"] = "🧘 Calm/Confident"
+             metrics["feedback"]["tone"] = "Steady, resonant, and controlled."
+             metrics["feedback"]["tone_status"] = "normal"
+
+        # Fallback
+        else:
+             metrics["tone_label"] = "😐 Casual/Conversational"
+             metrics["feedback"]["tone"] = "Relaxed pace and volume."
+             metrics["feedback"]["tone_status"] = "normal"
+
+
+        # --- 4. Count Metrics (Fillers/Pauses) ---
+        counts = text["counts"]
+        metrics["filler_count"] = counts["filler"] + counts["stutter"] + counts["repetition"]
+        metrics["blunder_count"] = counts["blunder"]
+
+        pause_count = 0
+        for i in range(len(speech_intervals) - 1):
+            gap = speech_intervals[i+1][0] - speech_intervals[i][1]
+            if gap > 1.5: pause_count += 1
+        metrics["pause_count"] = pause_count
+
+        # --- 5. Final Feedback Compilation ---
+        # Soft Logic Tip
+        density_tip = self._assess_content_density(total_duration, word_count)
+        if density_tip: metrics["feedback"]["density_tip"] = density_tip
+
+        # WPM Feedback
+        if metrics["wpm"] < limits["wpm_min"]:
+            metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = f"Too Slow (<{limits['wpm_min']})", "off"
+        elif metrics["wpm"] > limits["wpm_max"]:
+            metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = f"Too Fast (>{limits['wpm_max']})", "off"
+        else:
+            metrics["feedback"]["wpm"], metrics["feedback"]["wpm_status"] = "Ideal Pace", "normal"
+
+        # Check for Nervous Rushed State specifically
+        if metrics["wpm"] > 160 and metrics["pitch_var"] > 50:
+             metrics["tone_label"] = "😰 Nervous!" # Override
+
+        # Count Feedback
+        if metrics["pause_count"] <= limits["max_pauses"]:
+            metrics["feedback"]["pause"], metrics["feedback"]["pause_status"] = "Good Flow", "normal"
+        else:
+            metrics["feedback"]["pause"], metrics["feedback"]["pause_status"] = "Too Many Pauses", "off"
+
+        if metrics["filler_count"] <= limits["max_fillers"]:
+            metrics["feedback"]["filler"], metrics["feedback"]["filler_status"] = "Clean", "normal"
+        else:
+            metrics["feedback"]["filler"], metrics["feedback"]["filler_status"] = "Avoid Fillers", "off"
+
+        if metrics["blunder_count"] <= limits["max_blunders"]:
+            metrics["feedback"]["blunder"], metrics["feedback"]["blunder_status"] = "Clear Logic", "normal"
+        else:
+            metrics["feedback"]["blunder"], metrics["feedback"]["blunder_status"] = "Broken Sentences", "off"
+
+        return metrics
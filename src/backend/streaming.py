@@ -0,0 +1,247 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np  # pyright: ignore[reportMissingImports]
+from src.backend.scorer import AcousticScorer
+from src.backend.decoded_audio import TARGET_SR, decode_audio
+from src.backend.features import FeatureBank
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+# --- VAD / Segmentation Settings ---
+VAD_FRAME = 512          # 32 ms at 16 kHz
+VAD_TOP_DB = 25          # Same threshold the batch scorer uses for librosa.effects.split
+VAD_FLOOR_RMS = 1e-4     # Ignore near-digital-silence before the first word sets a reference
+MIN_SILENCE_S = 0.6      # Silence that closes a segment
+MIN_SEGMENT_S = 3.0      # Don't send Whisper tiny fragments
+MAX_SEGMENT_S = 20.0     # Force a cut during long monologues...
+OVERLAP_S = 1.0          # ...and re-transcribe this much context across the cut
+
+
+def _drop_overlap(previous_text, new_text, max_words=12):
+    """Removes words at the start of new_text that repeat the end of previous_text."""
+    def norm(w): return w.strip(".,!?;:").lower()
+    prev = [norm(w) for w in previous_text.split()[-max_words:]]
+    new = new_text.split()
+    for k in range(min(len(prev), len(new)), 0, -1):
+        if prev[-k:] == [norm(w) for w in new[:k]]:
+            return " ".join(new[k:])
+    return new_text
+
+
+class StreamingAnalyzer:
+    """
+    Rolling analysis of a recording that is still in progress.
+    Chunks go in through feed(); an energy VAD cuts them into segments at
+    natural pauses, and a single background worker transcribes and scores
+    each segment as soon as it closes. finalize() only has the tail segment
+    left to process, so the report is ready almost immediately after "stop".
+    """
+    def __init__(self, model, scorer=None, difficulty="Standard Interview", pitch_method="piptrack",
+                 sample_rate=TARGET_SR, transcribe_options=None):
+        self.model = model
+        self.scorer = scorer or AcousticScorer()
+        self.difficulty = difficulty
+        self.pitch_method = pitch_method
+        self.sr = sample_rate
+        self.transcribe_options = transcribe_options or {"beam_size": 5}
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-asr")
+        self._futures = []
+
+        # Audio not yet handed to the worker (may start with overlap from the previous cut)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_start = 0
+        self._pending_has_speech = False
+        self._scored_upto = 0
+        self._total = 0
+
+        # VAD state
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._frame_idx = 0
+        self._ref_rms = 0.0
+        self._speech_start = None
+        self._speech_end = 0
+        self._silence_run = 0
+        self._intervals = []
+
+        # Running results (written by the worker)
+        self._texts = []
+        self._pitch_values = []
+        self._rms_sum = 0.0
+        self._rms_frames = 0
+        self._transcribed_upto = 0
+        self._stop_time = None
+        self.finished = False
+
+    # --- 1. Ingest ---
+    def feed(self, chunk):
+        """Adds a chunk of mono float samples at self.sr and returns the running snapshot."""
+        if self.finished:
+            raise RuntimeError("Stream already finalized.")
+
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.ndim > 1:
+            chunk = chunk.mean(axis=1)
+
+        self._pending = np.concatenate([self._pending, chunk])
+        self._total += len(chunk)
+        self._update_vad(chunk)
+
+        pending_s = (self._total - self._pending_start) / self.sr
+        min_silence = int(MIN_SILENCE_S * self.sr)
+
+        if self._pending_has_speech and self._silence_run >= min_silence and pending_s >= MIN_SEGMENT_S:
+            # Natural pause: cut in the middle of the silence, no overlap needed
+            self._emit(self._total - self._silence_run // 2, overlap=0)
+        elif pending_s >= MAX_SEGMENT_S:
+            self._emit(self._total, overlap=int(OVERLAP_S * self.sr))
+
+        return self.snapshot()
+
+    def _update_vad(self, chunk):
+        frames = np.concatenate([self._carry, chunk])
+        n = len(frames) // VAD_FRAME
+        self._carry = frames[n * VAD_FRAME:]
+        if n == 0:
+            return
+
+        rms = np.sqrt(np.mean(frames[:n * VAD_FRAME].reshape(n, VAD_FRAME) ** 2, axis=1))
+        ratio = 10 ** (-VAD_TOP_DB / 20)
+        for r in rms:
+            self._ref_rms = max(self._ref_rms, r)
+            pos = self._frame_idx * VAD_FRAME
+            if r > VAD_FLOOR_RMS and r > self._ref_rms * ratio:
+                if self._speech_start is None:
+                    self._speech_start = pos
+                self._speech_end = pos + VAD_FRAME
+                self._pending_has_speech = True
+                self._silence_run = 0
+            else:
+                self._silence_run += VAD_FRAME
+                self._close_interval()
+            self._frame_idx += 1
+
+    def _close_interval(self):
+        if self._speech_start is not None:
+            self._intervals.append((self._speech_start / self.sr, self._speech_end / self.sr))
+            self._speech_start = None
+
+    # --- 2. Segment Processing (background worker) ---
+    def _emit(self, cut, overlap):
+        rel = cut - self._pending_start
+        segment = self._pending[:rel]
+        fresh_from = self._scored_upto - self._pending_start
+
+        self._futures.append(self._executor.submit(
+            self._process_segment, segment, fresh_from, self._pending_has_speech, cut, self._pending_start < self._scored_upto
+        ))
+
+        keep = min(overlap, rel)
+        self._pending = self._pending[rel - keep:]
+        self._pending_start = cut - keep
+        self._scored_upto = cut
+        self._pending_has_speech = False
+
+    def _process_segment(self, segment, fresh_from, has_speech, end_sample, overlapped):
+        # Acoustic stats only over samples not already counted by the previous segment
+        fresh = segment[fresh_from:]
+        if len(fresh) >= 2048:
+            bank = FeatureBank(fresh, self.sr)
+            rms = bank.rms
+            pitch = bank.pitch(self.pitch_method) if has_speech else []
+            with self._lock:
+                self._rms_sum += float(np.sum(rms))
+                self._rms_frames += len(rms)
+                self._pitch_values.extend(np.asarray(pitch).tolist())
+
+        text = ""
+        if has_speech:
+            with self._lock:
+                previous = " ".join(t for t in self._texts if t)
+            from src.backend.audio_processor import INITIAL_PROMPT  # Deferred: audio_processor imports this module
+            prompt = previous[-200:] if previous else INITIAL_PROMPT
+            segments, _ = self.model.transcribe(segment, initial_prompt=prompt, **self.transcribe_options)
+            text = " ".join(seg.text for seg in segments).strip()
+            if overlapped and previous:
+                text = _drop_overlap(previous, text)
+
+        with self._lock:
+            self._texts.append(text)
+            self._transcribed_upto = end_sample
+
+    # --- 3. Results ---
+    def transcript(self):
+        with self._lock:
+            return " ".join(t for t in self._texts if t)
+
+    def _count_pauses(self, intervals):
+        return sum(1 for a, b in zip(intervals, intervals[1:]) if b[0] - a[1] > 1.5)
+
+    def snapshot(self):
+        """Running metrics over everything transcribed so far."""
+        transcript = self.transcript()
+        with self._lock:
+            transcribed_s = self._transcribed_upto / self.sr
+        text = self.scorer.analyze_text(transcript, duration=transcribed_s)
+        words = text["word_count"]
+        counts = text["counts"]
+        return {
+            "elapsed": round(self._total / self.sr, 2),
+            "transcribed": round(transcribed_s, 2),
+            "words": words,
+            "wpm": int(words / (transcribed_s / 60.0)) if transcribed_s > 0 else 0,
+            "pause_count": self._count_pauses(self._intervals),
+            "filler_count": counts["filler"] + counts["stutter"] + counts["repetition"],
+            "blunder_count": counts["blunder"],
+            "segments_in_flight": sum(1 for f in self._futures if not f.done()),
+            "transcript": transcript
+        }
+
+    def finalize(self):
+        """
+        Flushes the tail segment and assembles the final report.
+        Returns (transcript, metrics, seconds_since_stop, error), like process_interview.
+        """
+        self._stop_time = time.time()
+        self.finished = True
+        self._close_interval()
+
+        try:
+            if self._total > self._scored_upto:
+                self._emit(self._total, overlap=0)
+            for future in self._futures:
+                future.result()
+        except Exception as e:
+            logger.error(f"Streaming Pipeline Error: {str(e)}")
+            return None, None, 0, f"Processing Failed: {str(e)}"
+        finally:
+            self._executor.shutdown(wait=False)
+
+        transcript = self.transcript()
+        active_time = sum(end - start for start, end in self._intervals)
+        if active_time < 0.5:
+            return transcript, None, 0, "Audio too short."
+
+        energy_avg = self._rms_sum / self._rms_frames if self._rms_frames else 0.0
+        metrics = self.scorer.score_features(
+            transcript, self._total / self.sr, self._intervals,
+            np.asarray(self._pitch_values), energy_avg, difficulty=self.difficulty
+        )
+
+        tail_time = time.time() - self._stop_time
+        logger.info(f"Streaming analysis finalized {len(self._futures)} segments; tail took {tail_time:.2f}s")
+        return transcript, metrics, tail_time, None
+
+
+def replay_wav(analyzer, audio_path, chunk_seconds=0.5, realtime=False):
+    """Feeds a recording through an analyzer chunk by chunk, as a live microphone would."""
+    audio = decode_audio(audio_path, sr=analyzer.sr)
+    step = max(1, int(chunk_seconds * analyzer.sr))
+    for start in range(0, len(audio.samples), step):
+        analyzer.feed(audio.samples[start:start + step])
+        if realtime:
+            time.sleep(chunk_seconds)
+    return analyzer.finalize()
@@ -0,0 +1,261 @@
+"""
+Single-pass transcript analytics.
+One tokenizer pass finds fillers, blunders, stutters and repetitions with
+their character offsets (and times, when Whisper word timestamps are given).
+Filler/blunder lexicons are per language and compiled into an Aho-Corasick
+automaton over word tokens, so a bigger lexicon adds no work per word.
+Phrases never match across punctuation ("kind, of" is not "kind of").
+"""
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import deque
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+# {language: {kind: [phrase, ...]}}; a kind listed in the file replaces the built-in list.
+LEXICON_FILE = os.environ.get("COACH_LEXICON_FILE", os.path.join("config", "lexicons.json"))
+
+LEXICONS = {
+    "en": {
+        "filler": ["um", "uh", "ah", "hmm", "like", "you know", "sort of", "kind of", "i mean", "basically", "actually"],
+        "blunder": ["...", "scratch that", "sorry i mean"]
+    },
+    "es": {
+        "filler": ["eh", "em", "este", "pues", "bueno", "o sea", "digamos", "en plan", "tipo"],
+        "blunder": ["...", "perdón quiero decir", "mejor dicho"]
+    },
+    "fr": {
+        "filler": ["euh", "hum", "ben", "bah", "genre", "du coup", "en fait", "tu vois", "voilà"],
+        "blunder": ["...", "pardon je veux dire", "enfin bref"]
+    },
+    "de": {
+        "filler": ["äh", "ähm", "hm", "also", "halt", "sozusagen", "irgendwie", "quasi", "weißt du"],
+        "blunder": ["...", "sorry ich meine", "vergiss das"]
+    }
+}
+
+KINDS = ("filler", "stutter", "repetition", "blunder")
+
+# Words (keeping contractions and hyphenated stutters like "I-I" whole) and trailing-off ellipses
+TOKEN_RE = re.compile(r"\w+(?:['’-]\w+)*|\.{3,}|…")
+_ELONGATED = re.compile(r"(\w)\1+$")
+_CLAUSE_BREAK = re.compile(r"[^\s]")  # Anything but whitespace between two tokens ends a phrase
+
+
+def _normalize(token):
+    """Lower-case; ellipses become '...'."""
+    token = token.lower()
+    return "..." if token[0] in ".…" else token
+
+
+def _stem(token):
+    return _ELONGATED.sub(r"\1", token)
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over normalized word tokens; reports every phrase ending at each token.
+    A single-word entry also matches when its last letter is drawn out (um -> umm, hmm -> hmmm),
+    never when shortened (hm is not hmm).
+    """
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._elongations = {}  # stem -> single-word entries it can be drawn out from
+        for phrase, kind in phrases:
+            tokens = [_normalize(t) for t in TOKEN_RE.findall(phrase)]
+            if not tokens:
+                continue
+            if len(tokens) == 1 and tokens[0] != "...":
+                self._elongations.setdefault(_stem(tokens[0]), []).append(tokens[0])
+            node = 0
+            for token in tokens:
+                node = self._goto[node].get(token) or self._add_child(node, token)
+            self._out[node].append((len(tokens), kind))
+
+        # Breadth-first failure links; each node also inherits the outputs of its failure node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0) if node else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _add_child(self, node, token):
+        self._goto.append({})
+        self._fail.append(0)
+        self._out.append([])
+        self._goto[node][token] = len(self._goto) - 1
+        return self._goto[node][token]
+
+    def canonical(self, token):
+        """The lexicon form of a normalized token ('ummm' -> 'um'), or the token itself."""
+        if token in self._goto[0]:
+            return token
+        for word in self._elongations.get(_stem(token), ()):
+            if token.startswith(word):
+                return word
+        return token
+
+    def step(self, node, token):
+        while node and token not in self._goto[node]:
+            node = self._fail[node]
+        return self._goto[node].get(token, 0)
+
+    def matches(self, node):
+        """(phrase length in tokens, kind) for every phrase ending at this state."""
+        return self._out[node]
+
+
+def _align_words(transcript, words):
+    """Character span -> time for each Whisper word: ([char starts], [(char end, start s, end s)])."""
+    starts, spans = [], []
+    cursor = 0
+    for word in words or ():
+        text = word["word"].strip()
+        index = transcript.find(text, cursor) if text else -1
+        if index < 0:
+            continue
+        starts.append(index)
+        spans.append((index + len(text), word["start"], word["end"]))
+        cursor = index + len(text)
+    return starts, spans
+
+
+def _time_at(starts, spans, char):
+    """(start, end) seconds of the word covering a character offset, or None."""
+    i = bisect_right(starts, char) - 1
+    if i < 0 or char >= spans[i][0]:
+        return None
+    return spans[i][1], spans[i][2]
+
+
+class TextAnalyzer:
+    """Lexicon automaton for one language plus the stutter/repetition rules."""
+    def __init__(self, language="en", lexicon=None):
+        self.language = language
+        self.lexicon = lexicon or LEXICONS["en"]
+        self.automaton = PhraseAutomaton(
+            (phrase, kind) for kind, phrases in self.lexicon.items() for phrase in phrases
+        )
+
+    def analyze(self, transcript, words=None, duration=0.0):
+        """
+        Counts, offsets and per-minute rates in one pass over the tokens.
+        words: optional Whisper word timestamps [{"word", "start", "end"}] for time alignment.
+        Returns {"language", "word_count", "counts", "rates", "events"}; events are
+        {kind, text, start_char, end_char, start, end} ordered by position.
+        """
+        transcript = transcript or ""
+        counts = dict.fromkeys(KINDS, 0)
+        events = []
+        tokens = []  # (start_char, end_char) of every token seen so far, for multi-word matches
+        word_count = 0
+        node = 0
+        previous = None       # (lower-cased word, end_char) of the last word, for repetitions
+        repeat_open = True    # A repetition can't reuse the second word of the previous one
+
+        for match in TOKEN_RE.finditer(transcript):
+            raw = match.group()
+            start, end = match.span()
+            if tokens and _CLAUSE_BREAK.search(transcript, tokens[-1][1], start):
+                node = 0  # Punctuation between the words: no phrase spans it
+            tokens.append((start, end))
+            word = raw.lower()
+            is_word = raw[0] not in ".…"
+
+            if is_word:
+                word_count += 1
+                # Stutter: adjacent identical parts of a hyphenated token ("I-I", "th-th")
+                parts = word.split("-")
+                i = 0
+                while i < len(parts) - 1:
+                    if parts[i] and parts[i] == parts[i + 1]:
+                        counts["stutter"] += 1
+                        events.append((start, end, "stutter"))
+                        i += 2
+                    else:
+                        i += 1
+                # Repetition: the same word twice, separated only by whitespace
+                if previous and repeat_open and previous[0] == word and not transcript[previous[1]:start].strip():
+                    counts["repetition"] += 1
+                    events.append((tokens[-2][0], end, "repetition"))
+                    repeat_open = False
+                else:
+                    repeat_open = True
+                previous = (word, end)
+            else:
+                previous = None
+
+            node = self.automaton.step(node, self.automaton.canonical(_normalize(raw)))
+            for length, kind in self.automaton.matches(node):
+                counts[kind] += 1
+                events.append((tokens[-length][0], end, kind))
+
+        events.sort()
+        starts, spans = _align_words(transcript, words)
+        timed_events = []
+        for start, end, kind in events:
+            first = _time_at(starts, spans, start) if starts else None
+            last = _time_at(starts, spans, end - 1) if starts else None
+            timed_events.append({
+                "kind": kind, "text": transcript[start:end], "start_char": start, "end_char": end,
+                "start": first[0] if first else None, "end": last[1] if last else None
+            })
+
+        minutes = duration / 60.0 if duration else 0.0
+        rates = {kind: round(counts[kind] / minutes, 2) if minutes else 0.0 for kind in KINDS}
+        rates["words"] = round(word_count / minutes, 1) if minutes else 0.0
+        return {"language": self.language, "word_count": word_count, "counts": counts, "rates": rates, "events": timed_events}
+
+
+def load_lexicons(path=LEXICON_FILE):
+    """Built-in lexicons overlaid with the JSON file, if one exists."""
+    lexicons = {lang: dict(kinds) for lang, kinds in LEXICONS.items()}
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            for lang, kinds in overrides.items():
+                lexicons.setdefault(lang, {}).update({k: list(v) for k, v in kinds.items() if k in ("filler", "blunder")})
+            logger.info(f"Lexicons loaded from {path}: {', '.join(overrides)}")
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable lexicon file {path}: {e}")
+    return lexicons
+
+
+_analyzers = {}
+_lexicons = None
+_analyzers_lock = threading.Lock()
+
+def get_text_analyzer(language="en"):
+    """One compiled analyzer per language (unknown languages use English), built on first use."""
+    global _lexicons
+    language = (language or "en").lower()
+    analyzer = _analyzers.get(language)
+    if analyzer is None:
+        with _analyzers_lock:
+            if _lexicons is None:
+                _lexicons = load_lexicons()
+            analyzer = _analyzers.get(language)
+            if analyzer is None:
+                lang = language if language in _lexicons else "en"
+                analyzer = TextAnalyzer(lang, _lexicons[lang])
+                _analyzers[language] = analyzer
+    return analyzer
+
+
+def reload_lexicons():
+    global _lexicons
+    with _analyzers_lock:
+        _lexicons = None
+        _analyzers.clear()
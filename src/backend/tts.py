@@ -0,0 +1,178 @@
+"""
+Text-to-speech for the interviewer's questions.
+One pyttsx3 engine lives on a dedicated worker thread (the engines are not
+thread-safe and slow to start). Each (text, voice, rate) is rendered to an
+audio file once and served with st.audio, so the script thread never blocks
+on speech. A question the user asks for jumps ahead of queued prefetch renders.
+"""
+import hashlib
+import itertools
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+
+TTS_DIR = os.path.join("temp_data", "tts")
+MAX_CACHE_MB = float(os.environ.get("COACH_TTS_CACHE_MB", "50"))
+DEFAULT_VOICE = os.environ.get("COACH_TTS_VOICE") or None  # pyttsx3 voice id; None keeps the system default
+DEFAULT_RATE = int(os.environ.get("COACH_TTS_RATE", "175"))  # Words per minute
+
+# Queue order: lower first, FIFO within a level
+ASK_PRIORITY = 0
+PREFETCH_PRIORITY = 1
+
+# macOS' NSSpeechSynthesizer writes AIFF; SAPI5 and eSpeak write WAV
+EXTENSION = ".aiff" if sys.platform == "darwin" else ".wav"
+
+
+def audio_format(path):
+    """MIME type for st.audio."""
+    return "audio/aiff" if path.endswith(".aiff") else "audio/wav"
+
+
+class TTSService:
+    """
+    Renders speech on one worker thread. synthesize() returns a Future for the
+    file path: already resolved on a cache hit, shared when the same request is
+    in flight. The cache directory is capped at max_cache_mb (oldest use evicted).
+    """
+    def __init__(self, cache_dir=TTS_DIR, max_cache_mb=MAX_CACHE_MB):
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = int(max_cache_mb * 1024**2)
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()  # Tie-breaker keeps FIFO within a priority
+        self._inflight = {}  # path -> (future, priority it is queued at)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="tts-engine", daemon=True)
+        self._thread.start()
+
+    def _path(self, text, voice, rate):
+        digest = hashlib.sha256("|".join([text, voice or "", str(rate)]).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, digest + EXTENSION)
+
+    # --- Public API ---
+    def cached_path(self, text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+        """Path of the rendered file if it exists (touched so eviction keeps it), else None."""
+        path = self._path(text, voice, rate)
+        try:
+            os.utime(path)
+            return path
+        except OSError:
+            return None
+
+    def synthesize(self, text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE, priority=ASK_PRIORITY):
+        """Future resolving to the audio file for this text, rendering it in the background if needed."""
+        path = self.cached_path(text, voice, rate)
+        if path:
+            future = Future()
+            future.set_result(path)
+            return future
+
+        path = self._path(text, voice, rate)
+        with self._lock:
+            entry = self._inflight.get(path)
+            if entry is not None and entry[1] <= priority:
+                return entry[0]
+            # New, or a queued prefetch the user now asks for: (re)queue at this priority.
+            # Both copies share the future; the worker skips whichever comes second.
+            future = entry[0] if entry is not None else Future()
+            self._inflight[path] = (future, priority)
+            self._queue.put((priority, next(self._order), path, text, voice, rate, future))
+        return future
+
+    def prefetch(self, texts, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+        """Queues every text that isn't rendered yet behind any explicit request; returns immediately."""
+        for text in texts:
+            if text:
+                self.synthesize(text, voice, rate, priority=PREFETCH_PRIORITY)
+
+    # --- Worker ---
+    def _run(self):
+        engine = None
+        while True:
+            _, _, path, text, voice, rate, future = self._queue.get()
+            if future.done():
+                continue  # Already rendered from its promoted copy
+            try:
+                if not os.path.exists(path):
+                    if engine is None:
+                        engine = self._init_engine()
+                    self._render(engine, path, text, voice, rate)
+                    self._enforce_cap(keep=path)
+                future.set_result(path)
+            except Exception as e:
+                logger.error(f"TTS failed for {text[:40]!r}: {e}")
+                future.set_exception(e)
+                engine = None  # Start a fresh engine for the next request
+            finally:
+                with self._lock:
+                    self._inflight.pop(path, None)
+
+    @staticmethod
+    def _init_engine():
+        if sys.platform == "win32":
+            import comtypes  # pyright: ignore[reportMissingImports]
+            comtypes.CoInitialize()  # SAPI5 is COM; this worker thread needs its own apartment
+        import pyttsx3  # pyright: ignore[reportMissingImports]
+        return pyttsx3.init()
+
+    def _render(self, engine, path, text, voice, rate):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".part" + EXTENSION  # Keeps the extension: some drivers pick the format from it
+        engine.setProperty("rate", rate)
+        if voice:
+            engine.setProperty("voice", voice)
+        engine.save_to_file(text, tmp_path)
+        engine.runAndWait()
+        if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
+            raise RuntimeError("The speech engine produced no audio.")
+        os.replace(tmp_path, path)  # Readers never see a half-written file
+
+    def _enforce_cap(self, keep=None):
+        """Deletes the least recently used files until the cache fits the size cap."""
+        try:
+            entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+            files = sorted((os.path.getmtime(p), os.path.getsize(p), p) for p in entries if os.path.isfile(p))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_cache_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    @staticmethod
+    def purge_cache(cache_dir=TTS_DIR):
+        """Deletes rendered speech (Privacy Feature). Returns the number of files removed."""
+        deleted = 0
+        if os.path.exists(cache_dir):
+            for name in os.listdir(cache_dir):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_tts_service():
+    """Process-wide service: one engine and one worker thread for every session."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = TTSService()
+    return _service
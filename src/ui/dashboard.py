@@ -1,23 +1,125 @@
+import html
+import json
 import streamlit as st
 from datetime import datetime
+from src.backend.llm_client import STAR_KEYS, get_star_evaluator
+from src.utils.tracing import chrome_trace
+
+def _render_star_cards(result):
+    """Four STAR cards coloured by score, plus the coach's summary."""
+    columns = st.columns(4)
+    for col, key in zip(columns, STAR_KEYS):
+        part = result.get(key)
+        if not part:
+            col.error(f"{key.title()}: Missing")
+            continue
+        text = f"**{key.title()}: {part['score']}/5**\n\n{part['feedback']}"
+        if part["score"] >= 4: col.success(text)
+        elif part["score"] >= 2: col.warning(text)
+        else: col.error(text)
+    if result.get("summary"):
+        st.info(f"🧑‍🏫 {result['summary']}")
+
+def _render_waterfall(waterfall):
+    """Per-stage waterfall of one analysis' trace spans, plus a Chrome-trace download."""
+    rows = [
+        {"span": s["name"], "start": s["start"], "end": s["start"] + s["duration"],
+         "ms": round(s["duration"] * 1000, 1), "cpu_ms": round(s["cpu"] * 1000, 1), "rss_mb": s["rss_delta_mb"]}
+        for s in waterfall
+    ]
+    st.vega_lite_chart(rows, {
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "y": {"field": "span", "type": "nominal", "sort": None, "title": None},
+            "x": {"field": "start", "type": "quantitative", "title": "seconds"},
+            "x2": {"field": "end"},
+            "color": {"field": "span", "type": "nominal", "legend": None}
+        }
+    }, use_container_width=True)
+    st.download_button(
+        label="⏱️ Download Trace (Perfetto)",
+        data=json.dumps(chrome_trace(waterfall)),
+        file_name=f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json",
+        use_container_width=True
+    )
+
+HIGHLIGHT_COLORS = {"filler": "#ffe08a", "stutter": "#ffc3a0", "repetition": "#d9c2ff", "blunder": "#ff9e9e"}
+
+def _highlighted_html(transcript, events):
+    """Transcript as HTML with each event marked; overlapping events keep the earliest/longest one."""
+    parts, cursor = [], 0
+    for event in sorted(events, key=lambda e: (e["start_char"], -e["end_char"])):
+        if event["start_char"] < cursor:
+            continue
+        tooltip = event["kind"] + (f" at {int(event['start'] // 60)}:{int(event['start'] % 60):02d}" if event["start"] is not None else "")
+        parts.append(html.escape(transcript[cursor:event["start_char"]]))
+        parts.append(
+            f'<mark style="background:{HIGHLIGHT_COLORS.get(event["kind"], "#eee")};border-radius:3px;padding:0 2px" '
+            f'title="{html.escape(tooltip)}">{html.escape(event["text"])}</mark>'
+        )
+        cursor = event["end_char"]
+    parts.append(html.escape(transcript[cursor:]))
+    return "".join(parts)
+
+def _render_transcript(transcript, text):
+    """Transcript with fillers, stutters, repetitions and blunders highlighted, plus per-minute rates."""
+    if not transcript or not text or not text.get("events"):
+        st.write(transcript)
+        return
+    st.markdown(_highlighted_html(transcript, text["events"]), unsafe_allow_html=True)
+    legend = " ".join(
+        f'<mark style="background:{color};border-radius:3px;padding:0 4px">{kind} {text["counts"][kind]} '
+        f'({text["rates"][kind]}/min)</mark>'
+        for kind, color in HIGHLIGHT_COLORS.items()
+    )
+    st.caption(legend, unsafe_allow_html=True)
+
+def render_star_evaluation(transcript, target_question, persona, precomputed=None):
+    """
+    Shows the evaluation graded alongside acoustic scoring (or a cached one) instantly,
+    otherwise streams the local LLM's reply as it is written. When grading already
+    failed in the job, the stored error is shown with a Re-grade button instead of
+    calling the model again on every rerun.
+    """
+    if not transcript:
+        st.caption("No transcript to evaluate.")
+        return None
+    try:
+        evaluator = get_star_evaluator()
+        failed = bool(precomputed and precomputed.get("error"))
+        result = precomputed if precomputed and not failed else evaluator.cached(transcript, target_question, persona)
+        if result is None and failed:
+            st.caption(f"⚠️ {precomputed['error']} Acoustic feedback is still shown below.")
+            regrade_key = "regrade_" + evaluator.cache_key(transcript, target_question, persona)[:16]
+            if not st.button("🔁 Re-grade answer", key=regrade_key):
+                return None
+        if result is None:
+            stream = evaluator.stream(transcript, target_question, persona)
+            with st.expander("AI coach is writing...", expanded=True):
+                st.write_stream(stream)
+            result = stream.result
+    except Exception as e:
+        result = {"error": f"AI coach unavailable: {e}"}
+
+    if not result or result.get("error"):
+        st.caption(f"⚠️ {result.get('error') if result else 'No evaluation returned.'} Acoustic feedback is still shown below.")
+        return None
+
+    _render_star_cards(result)
+    return result
 
 def render_dashboard(transcript, metrics, duration, selected_mode, tier, target_question, persona):
-    """Renders the Analysis Results column with Phase 4 placeholders and Export tools."""
+    """Renders the Analysis Results column with the STAR evaluation and Export tools."""
     
     st.subheader("2. Analysis Results")
     
     # --- CONTEXT DISPLAY ---
     st.info(f"**Target Question:** {target_question}\n\n**Interviewer Persona:** {persona}")
     
-    # --- PHASE 4 PLACEHOLDER (STAR METHOD) ---
+    # --- AI COACH EVALUATION (STAR METHOD) ---
     st.markdown("### 🌟 AI Coach Evaluation (STAR Framework)")
-    st.caption("LLM Evaluation will appear here in Phase 4. Currently gathering acoustic data.")
-    
-    c1, c2, c3, c4 = st.columns(4)
-    c1.success("Situation: Pending")
-    c2.success("Task: Pending")
-    c3.warning("Action: Pending")
-    c4.error("Result: Pending")
+    star = render_star_evaluation(transcript, target_question, persona, precomputed=metrics.get("star"))
     st.divider()
 
     # --- ACOUSTIC METRICS ---
@@ -36,12 +138,19 @@ def render_dashboard(transcript, metrics, duration, selected_mode, tier, target_
 
     # --- TRANSCRIPT ---
     st.markdown("### 📝 Transcript")
-    st.write(transcript)
+    _render_transcript(transcript, metrics.get("text"))
 
     # --- REPORT GENERATOR (NEW) ---
     st.divider()
     
     # Generate a clean Markdown string for the download file
+    star_md = ""
+    if star:
+        star_md = "## STAR Evaluation\n" + "".join(
+            f"* **{key.title()}:** {star[key]['score']}/5 - {star[key]['feedback']}\n" for key in STAR_KEYS if star.get(key)
+        )
+        if star.get("summary"): star_md += f"\n> {star['summary']}\n"
+        star_md += "\n"
     report_md = f"""# AI Interview Coach - Session Report
 **Date:** {datetime.now().strftime("%Y-%m-%d %H:%M")}
 **Mode:** {selected_mode}
@@ -50,11 +159,11 @@ def render_dashboard(transcript, metrics, duration, selected_mode, tier, target_
 ## Target Question
 > {target_question}
 
-## Fluency & Delivery Metrics
+{star_md}## Fluency & Delivery Metrics
 * **Pace:** {metrics['wpm']} WPM
 * **Tone:** {metrics['tone_label']}
 * **Pauses (>1.5s):** {metrics['pause_count']}
-* **Filler Words:** {metrics['filler_count']}
+* **Filler Words:** {metrics['filler_count']}{f" ({metrics['text']['rates']['filler']}/min)" if metrics.get('text') else ""}
 * **Blunders:** {metrics['blunder_count']}
 
 ## Transcript
@@ -69,7 +178,9 @@ def render_dashboard(transcript, metrics, duration, selected_mode, tier, target_
     
     with col_retry:
         if st.button("🔄 Retry", type="primary", use_container_width=True):
-            del st.session_state['results']
+            # The dashboard also renders each answer of a round, whose results live under another key
+            st.session_state.pop('results', None)
+            st.session_state.pop('round_results', None)
             st.rerun()
             
     with col_download:
@@ -84,4 +195,9 @@ def render_dashboard(transcript, metrics, duration, selected_mode, tier, target_
     with col_debug:
         with st.expander("System Stats"):
             st.write(f"**Hardware Tier:** {tier}")
-            st.write(f"**Processing Time:** {duration:.2f}s")
\ No newline at end of file
+            st.write(f"**Processing Time:** {duration:.2f}s")
+            for stage, seconds in metrics.get("timings", {}).items():
+                if stage != "total":
+                    st.caption(f"{stage.replace('_', ' ').title()}: {seconds:.2f}s")
+            if metrics.get("trace"):
+                _render_waterfall(metrics["trace"])
\ No newline at end of file
@@ -1,11 +1,10 @@
 import streamlit as st
-import time
-import os
+from src.backend.ingest import KEEP_AUDIO, AudioBlob
 
 def record_audio():
     """
-    Renders the audio recorder widget and saves the file locally.
-    Returns: Path to the saved file (or None if no recording).
+    Renders the audio recorder widget.
+    Returns: AudioBlob with the recording (or None if no recording).
     """
     try:
         # Custom CSS for styling
@@ -19,33 +18,14 @@ def record_audio():
         audio_value = st.audio_input("Record your answer")
 
         if audio_value:
-            # Create a timestamped filename
-            timestamp = int(time.time())
-            
-            # Safe Directory Creation
-            try:
-                os.makedirs("temp_data", exist_ok=True)
-            except OSError as e:
-                st.error(f"Failed to create directory: {e}")
-                return None
-
-            save_path = f"temp_data/recording_{timestamp}.wav"
-            
-            # Safe File Writing
-            try:
-                with open(save_path, "wb") as f:
-                    f.write(audio_value.read())
-                
-                # Verify file size (prevent processing empty files)
-                if os.path.getsize(save_path) == 0:
-                    st.error("Error: Recorded file is empty.")
-                    return None
-                    
-                return save_path
-                
-            except IOError as e:
-                st.error(f"Failed to save audio file: {e}")
+            # Kept in memory: the pipeline decodes straight from the widget's buffer
+            blob = AudioBlob.from_upload(audio_value)
+            if blob is None:
+                st.error("Error: Recorded file is empty.")
                 return None
+            if KEEP_AUDIO:
+                blob.persist()  # Background write under a content-hash name
+            return blob
         
         return None
 
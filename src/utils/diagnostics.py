@@ -1,19 +1,188 @@
+import atexit
+import contextvars
+import json
 import os
 import sys
+import queue
 import psutil
 import logging
+import logging.handlers
 import platform
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 
 # Configure Logging
+# Log calls only enqueue the record; one listener thread formats and writes
+# them, so the analysis threads never wait on file I/O.
 log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-logging.basicConfig(
-    filename=os.path.join(log_dir, "app_debug.log"),
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filemode="w" # Overwrite log on each restart
-)
+LOG_FILE = os.path.join(log_dir, "app_debug.log")
+JSON_LOG_FILE = os.path.join(log_dir, "app_events.jsonl")
+LOG_LEVEL = os.environ.get("COACH_LOG_LEVEL", "INFO").upper()
+ROTATION = os.environ.get("COACH_LOG_ROTATION", "size")  # "size" or "daily"
+MAX_LOG_MB = float(os.environ.get("COACH_LOG_MAX_MB", "5"))
+BACKUP_COUNT = int(os.environ.get("COACH_LOG_BACKUPS", "5"))
+JSON_LOGS = os.environ.get("COACH_LOG_JSON", "0") == "1"  # Adds a JSON-lines file for tooling
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(job_tag)s%(message)s"
+# Structured extras copied into JSON lines when a log call passes them (extra={...})
+EXTRA_FIELDS = ("job_id", "stage", "timings", "duration_s", "tier")
+
+_job_id = contextvars.ContextVar("coach_job_id", default=None)
+
+
+@contextmanager
+def job_context(job_id):
+    """Tags every record logged inside the block (and in contexts copied from it) with the job ID."""
+    token = _job_id.set(job_id)
+    try:
+        yield
+    finally:
+        _job_id.reset(token)
+
+
+class JobContextFilter(logging.Filter):
+    """Runs in the emitting thread, so the job ID is captured before the record is queued."""
+    def filter(self, record):
+        if getattr(record, "job_id", None) is None:
+            record.job_id = _job_id.get()
+        record.job_tag = f"[{record.job_id}] " if record.job_id else ""
+        return True
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, thread, message plus any EXTRA_FIELDS."""
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        for field in EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _file_handler(path, max_mb, backups):
+    if ROTATION == "daily":
+        return logging.handlers.TimedRotatingFileHandler(path, when="midnight", backupCount=backups,
+                                                         encoding="utf-8", delay=True)
+    return logging.handlers.RotatingFileHandler(path, maxBytes=int(max_mb * 1024**2), backupCount=backups,
+                                                encoding="utf-8", delay=True)
+
+
+class LogPipeline:
+    """
+    Root QueueHandler feeding a QueueListener that owns the rotating file
+    handlers. The QueueHandler stays installed for the life of the process;
+    pause/purge only stop the listener and close its files, and records
+    logged meanwhile wait in the queue.
+    """
+    def __init__(self, directory=log_dir, json_lines=JSON_LOGS, level=LOG_LEVEL, max_mb=MAX_LOG_MB, backups=BACKUP_COUNT):
+        self.directory = directory
+        self.json_lines = json_lines
+        self.max_mb = max_mb
+        self.backups = backups
+        self.queue = queue.Queue(-1)
+        self.handler = logging.handlers.QueueHandler(self.queue)
+        self.handler.addFilter(JobContextFilter())
+        self.level = level
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def _handlers(self):
+        os.makedirs(self.directory, exist_ok=True)
+        text = _file_handler(os.path.join(self.directory, os.path.basename(LOG_FILE)), self.max_mb, self.backups)
+        text.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers = [text]
+        if self.json_lines:
+            structured = _file_handler(os.path.join(self.directory, os.path.basename(JSON_LOG_FILE)), self.max_mb, self.backups)
+            structured.setFormatter(JSONLinesFormatter())
+            handlers.append(structured)
+        return handlers
+
+    def install(self, logger=None):
+        """Attaches the queue handler (to the root logger by default) and starts writing."""
+        logger = logger or logging.getLogger()
+        logger.setLevel(self.level)
+        if self.handler not in logger.handlers:
+            logger.addHandler(self.handler)
+        self.resume()
+        return self
+
+    @property
+    def paused(self):
+        return self._listener is None
+
+    def resume(self):
+        """(Re)opens the log files and starts writing, including anything queued while paused."""
+        with self._lock:
+            if self._listener is None:
+                self._listener = logging.handlers.QueueListener(self.queue, *self._handlers(), respect_handler_level=True)
+                self._listener.start()
+
+    def pause(self):
+        """Writes out what is queued, then stops the listener and closes the files (new records are held)."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()  # Drains the queue before returning
+            for handler in listener.handlers:
+                handler.close()  # Releases the file (Windows keeps it locked otherwise)
+
+    def flush(self, timeout=2.0):
+        """Blocks until the queued records are written (or timeout). Returns True when fully flushed."""
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and not self.paused and time.time() < deadline:
+            time.sleep(0.01)
+        listener = self._listener
+        if listener is not None:
+            for handler in listener.handlers:
+                handler.flush()
+        return not self.queue.unfinished_tasks
+
+    def purge(self):
+        """Deletes every log file, rotated backups included (Privacy Feature). Returns the number removed."""
+        self.pause()
+        deleted = 0
+        try:
+            if os.path.exists(self.directory):
+                for name in os.listdir(self.directory):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                        deleted += 1
+                    except OSError as e:
+                        logging.getLogger().warning(f"Could not delete log {name}: {e}")
+        finally:
+            self.resume()
+        return deleted
+
+
+_pipeline = LogPipeline().install()
+atexit.register(_pipeline.pause)
+
+
+def pause_logging():
+    _pipeline.pause()
+
+
+def resume_logging():
+    _pipeline.resume()
+
+
+def flush_logs(timeout=2.0):
+    return _pipeline.flush(timeout)
+
+
+def purge_logs():
+    return _pipeline.purge()
+
 
 def log_system_info():
     """Logs critical system stats on startup."""
@@ -23,15 +192,15 @@ def log_system_info():
         logging.info(f"Python: {sys.version}")
         logging.info(f"Total RAM: {mem.total / (1024**3):.2f} GB")
         logging.info(f"Available RAM: {mem.available / (1024**3):.2f} GB")
-        
+
         # Check for FFmpeg (Critical for some audio formats)
         if shutil.which("ffmpeg"):
             logging.info("FFmpeg: Detected ✅")
         else:
             logging.warning("FFmpeg: NOT DETECTED ❌ (Some audio formats may fail)")
-            
+
     except Exception as e:
         logging.error(f"Failed to log system info: {e}")
 
 def get_logger():
-    return logging.getLogger()
\ No newline at end of file
+    return logging.getLogger()
@@ -1,45 +1,176 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 import traceback
 from src.utils.diagnostics import get_logger
+from src.utils.tracing import traced
 
 logger = get_logger()
-HISTORY_FILE = os.path.join("temp_data", "session_history.json")
+HISTORY_DB = os.path.join("temp_data", "session_history.db")
+LEGACY_HISTORY_FILE = os.path.join("temp_data", "session_history.json")
+
+# Column order used for inserts and for the dicts returned to the UI
+COLUMNS = ["timestamp", "wpm", "fillers", "tone", "mode", "pauses", "blunders",
+           "pitch_avg", "pitch_var", "energy_avg", "duration", "tier"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    wpm INTEGER,
+    fillers INTEGER,
+    tone TEXT,
+    mode TEXT,
+    pauses INTEGER,
+    blunders INTEGER,
+    pitch_avg INTEGER,
+    pitch_var INTEGER,
+    energy_avg REAL,
+    duration REAL,
+    tier TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_mode ON sessions(mode);
+"""
+
+_migration_lock = threading.Lock()
+
 
 class HistoryManager:
+    """
+    Session history backed by SQLite in WAL mode.
+    Appends are O(1), concurrent Streamlit sessions can write safely, and
+    aggregates are computed by the database instead of pandas.
+    """
     @staticmethod
-    def save_session(wpm, fillers, tone, mode):
-        """Saves core metrics to a local JSON file for progression tracking."""
+    def _connect():
+        os.makedirs(os.path.dirname(HISTORY_DB), exist_ok=True)
+        conn = sqlite3.connect(HISTORY_DB, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Cheap when the table exists; also recreates it after a privacy purge
+        conn.executescript(SCHEMA)
+        HistoryManager._migrate_legacy(conn)
+        return conn
+
+    @staticmethod
+    def _migrate_legacy(conn):
+        """Imports the old whole-file JSON history once, then renames it out of the way."""
+        if not os.path.exists(LEGACY_HISTORY_FILE):
+            return
+        with _migration_lock:
+            if not os.path.exists(LEGACY_HISTORY_FILE):
+                return
+            try:
+                with open(LEGACY_HISTORY_FILE, "r") as f:
+                    legacy = json.load(f)
+                rows = [tuple(entry.get(col) for col in COLUMNS) for entry in legacy if isinstance(entry, dict)]
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows
+                    )
+                os.replace(LEGACY_HISTORY_FILE, LEGACY_HISTORY_FILE + ".migrated")
+                logger.info(f"Migrated {len(rows)} sessions from {LEGACY_HISTORY_FILE}")
+            except json.JSONDecodeError:
+                logger.warning("Legacy history file corrupted. Skipping migration.")
+                os.replace(LEGACY_HISTORY_FILE, LEGACY_HISTORY_FILE + ".corrupt")
+            except Exception as e:
+                logger.error(f"History migration failed: {e}\n{traceback.format_exc()}")
+
+    @staticmethod
+    @traced("history.save")
+    def save_session(wpm, fillers, tone, mode, pauses=None, blunders=None, pitch_avg=None,
+                     pitch_var=None, energy_avg=None, duration=None, tier=None):
+        """Appends one session's metrics for progression tracking."""
         try:
-            os.makedirs("temp_data", exist_ok=True)
             entry = {
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
                 "wpm": wpm,
                 "fillers": fillers,
                 "tone": tone,
-                "mode": mode
+                "mode": mode,
+                "pauses": pauses,
+                "blunders": blunders,
+                "pitch_avg": pitch_avg,
+                "pitch_var": pitch_var,
+                "energy_avg": energy_avg,
+                "duration": duration,
+                "tier": tier
             }
-            
-            history = HistoryManager.load_history()
-            history.append(entry)
-            
-            with open(HISTORY_FILE, "w") as f:
-                json.dump(history, f, indent=4)
+            conn = HistoryManager._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                        [entry[col] for col in COLUMNS]
+                    )
+            finally:
+                conn.close()
         except Exception as e:
             logger.error(f"Failed to save history: {e}\n{traceback.format_exc()}")
 
     @staticmethod
-    def load_history():
-        """Loads the session history, handling missing or corrupted files."""
-        if os.path.exists(HISTORY_FILE):
+    def load_history(limit=None, offset=0, mode=None, newest_first=False):
+        """
+        Returns sessions as a list of dicts (oldest first by default).
+        limit/offset give paginated access without reading the whole table.
+        """
+        try:
+            query = f"SELECT {', '.join(COLUMNS)} FROM sessions"
+            params = []
+            if mode:
+                query += " WHERE mode = ?"
+                params.append(mode)
+            query += " ORDER BY timestamp DESC, id DESC" if newest_first else " ORDER BY timestamp, id"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params += [limit, offset]
+
+            conn = HistoryManager._connect()
             try:
-                with open(HISTORY_FILE, "r") as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.warning("History file corrupted. Creating fresh history.")
-                return []
-            except Exception as e:
-                logger.error(f"Error loading history: {e}")
-                return []
-        return []
\ No newline at end of file
+                return [dict(row) for row in conn.execute(query, params)]
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error loading history: {e}")
+            return []
+
+    @staticmethod
+    def load_recent(limit=100, mode=None):
+        """The latest `limit` sessions in chronological order, for charts."""
+        return list(reversed(HistoryManager.load_history(limit=limit, mode=mode, newest_first=True)))
+
+    @staticmethod
+    def summarize(mode=None):
+        """Aggregates computed in the store: session count, averages and totals."""
+        empty = {"sessions": 0, "avg_wpm": 0, "total_fillers": 0, "avg_pauses": 0,
+                 "total_blunders": 0, "avg_pitch": 0, "avg_energy": 0, "total_duration": 0}
+        try:
+            query = """
+                SELECT COUNT(*) AS sessions,
+                       AVG(wpm) AS avg_wpm,
+                       SUM(fillers) AS total_fillers,
+                       AVG(pauses) AS avg_pauses,
+                       SUM(blunders) AS total_blunders,
+                       AVG(pitch_avg) AS avg_pitch,
+                       AVG(energy_avg) AS avg_energy,
+                       SUM(duration) AS total_duration
+                FROM sessions
+            """
+            params = []
+            if mode:
+                query += " WHERE mode = ?"
+                params.append(mode)
+
+            conn = HistoryManager._connect()
+            try:
+                row = conn.execute(query, params).fetchone()
+            finally:
+                conn.close()
+            return {key: (row[key] if row[key] is not None else empty[key]) for key in empty}
+        except Exception as e:
+            logger.error(f"Error summarizing history: {e}")
+            return empty
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import traceback
+from src.utils.diagnostics import get_logger
+
+logger = get_logger()
+CACHE_DIR = os.path.join("temp_data", "result_cache")
+MAX_CACHE_MB = 50
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of finished analyses.
+    Identical audio analyzed with identical settings is served from here
+    instead of re-running the silence check, Whisper and the scorer.
+    """
+    @staticmethod
+    def hash_audio(audio_path, block_size=1 << 20):
+        """SHA-256 of the raw audio bytes, so renamed re-uploads still hit. In-memory AudioBlobs carry it already."""
+        if hasattr(audio_path, "digest"):
+            return audio_path.digest
+        digest = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(audio_hash, model_size, compute_type, difficulty, scorer_version, options=""):
+        raw = "|".join([audio_hash, model_size, compute_type, difficulty, str(scorer_version), options])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _path(key):
+        return os.path.join(CACHE_DIR, f"{key}.json")
+
+    @staticmethod
+    def get(key):
+        """Returns the cached payload (transcript, segments, metrics) or None."""
+        path = ResultCache._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                payload = json.load(f)
+            os.utime(path)  # Bump recency for LRU eviction
+            return payload
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key[:12]}: {e}")
+            try: os.remove(path)
+            except OSError: pass
+            return None
+
+    @staticmethod
+    def put(key, transcript, segments, metrics):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            payload = {"transcript": transcript, "segments": segments, "metrics": metrics}
+            tmp_path = ResultCache._path(key) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, ResultCache._path(key))
+            ResultCache._evict()
+        except Exception as e:
+            logger.error(f"Failed to write result cache: {e}\n{traceback.format_exc()}")
+
+    @staticmethod
+    def _evict(max_bytes=MAX_CACHE_MB * 1024 * 1024):
+        """Deletes least-recently-used entries until the cache fits its size cap."""
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                logger.info(f"Result cache evicted {os.path.basename(path)}")
+            except OSError:
+                pass
+
+    @staticmethod
+    def purge():
+        """Deletes every cached transcript (Privacy Feature). Returns the number of files removed."""
+        deleted = 0
+        if os.path.exists(CACHE_DIR):
+            for name in os.listdir(CACHE_DIR):
+                try:
+                    os.remove(os.path.join(CACHE_DIR, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
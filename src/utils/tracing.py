@@ -0,0 +1,190 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import psutil
+
+# COACH_TRACING=0 turns every span into a no-op (one flag check per call).
+ENABLED = os.environ.get("COACH_TRACING", "1") != "0"
+
+TRACE_DIR = os.path.join("temp_data", "traces")
+MAX_SAMPLES_PER_SPAN = 1000  # Durations kept per span name for percentiles
+
+_process = psutil.Process()
+_current = contextvars.ContextVar("coach_trace", default=None)
+
+
+class Trace:
+    """Spans recorded for one analysis, in Chrome-trace order."""
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_start = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def waterfall(self):
+        """Spans as {name, start, duration, cpu, rss_delta_mb, thread} dicts relative to the trace start (seconds)."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+        return [dict(s, start=round(s["start"] - self.started, 4)) for s in spans]
+
+    def to_chrome(self):
+        return chrome_trace(self.waterfall(), self.name, self.wall_start)
+
+
+def chrome_trace(waterfall, name="analysis", wall_start=0.0):
+    """Chrome trace / Perfetto JSON ('complete' events, microseconds) from a waterfall list."""
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"coach: {name}"}}]
+    for s in waterfall:
+        events.append({
+            "name": s["name"], "ph": "X", "pid": pid, "tid": s["thread"],
+            "ts": int((wall_start + s["start"]) * 1e6), "dur": int(s["duration"] * 1e6),
+            "args": {"cpu_ms": round(s["cpu"] * 1000, 2), "rss_delta_mb": s["rss_delta_mb"], **s["args"]}
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+class TraceRecorder:
+    """Process-wide durations per span name, for percentiles, plus the last few full traces."""
+    def __init__(self, keep_traces=50):
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._traces = deque(maxlen=keep_traces)
+
+    def record(self, name, duration):
+        with self._lock:
+            self._durations.setdefault(name, deque(maxlen=MAX_SAMPLES_PER_SPAN)).append(duration)
+
+    def keep(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def percentiles(self, points=(50, 90, 99)):
+        """{span name: {"count": n, "p50": s, ...}} over the recent samples."""
+        with self._lock:
+            samples = {name: sorted(d) for name, d in self._durations.items()}
+        summary = {}
+        for name, values in samples.items():
+            stats = {"count": len(values)}
+            for p in points:
+                stats[f"p{p}"] = round(values[min(len(values) - 1, int(len(values) * p / 100))], 4)
+            summary[name] = stats
+        return summary
+
+    def export_chrome(self, path=None):
+        """Writes every kept trace into one Chrome-trace JSON file and returns its path."""
+        with self._lock:
+            traces = list(self._traces)
+        events = [e for t in traces for e in t.to_chrome()["traceEvents"]]
+        path = path or os.path.join(TRACE_DIR, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+def purge_traces(trace_dir=TRACE_DIR):
+    """Deletes exported Chrome traces (Privacy Feature). Returns the number of files removed."""
+    deleted = 0
+    if os.path.exists(trace_dir):
+        for name in os.listdir(trace_dir):
+            try:
+                os.remove(os.path.join(trace_dir, name))
+                deleted += 1
+            except OSError:
+                pass
+    return deleted
+
+
+recorder = TraceRecorder()
+
+
+@contextmanager
+def start_trace(name):
+    """Makes a new Trace current for this context (threads started with copy_context() inherit it)."""
+    if not ENABLED:
+        yield None
+        return
+    trace = Trace(name)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        recorder.keep(trace)
+
+
+def current_trace():
+    return _current.get()
+
+
+def _mark():
+    return _process.memory_info().rss, time.thread_time(), time.perf_counter()
+
+
+def _record(name, mark, args):
+    rss_before, cpu_before, start = mark
+    duration = time.perf_counter() - start
+    recorder.record(name, duration)
+    trace = _current.get()
+    if trace is not None:
+        trace.add({
+            "name": name, "start": start, "duration": round(duration, 4),
+            "cpu": round(time.thread_time() - cpu_before, 4),
+            "rss_delta_mb": round((_process.memory_info().rss - rss_before) / (1024**2), 2),
+            "thread": threading.get_ident(), "args": args
+        })
+
+
+@contextmanager
+def span(name, **args):
+    """Times a block: wall, thread CPU and RSS delta. Recorded into the current trace, if any."""
+    if not ENABLED:
+        yield
+        return
+    mark = _mark()
+    try:
+        yield
+    finally:
+        _record(name, mark, args)
+
+
+def traced(name):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_iter(iterable, name):
+    """Yields from a lazy iterable, recording the production of each item as its own span."""
+    if not ENABLED:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    index = 0
+    while True:
+        mark = _mark()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        index += 1
+        _record(name, mark, {"index": index})
+        yield item
@@ -0,0 +1,11 @@
+"""Command-line entry point for the decoding-profile auto-tuner (see src/backend/autotune.py)."""
+import os
+import platform
+
+if platform.system() == "Windows":
+    os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+from src.backend.autotune import main
+
+if __name__ == "__main__":
+    main()